@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Application, StatusHistory, Department, Position, Activity
+from .models import (
+    Application, StatusHistory, Department, Position, Activity, Skill, StatusCounter,
+    DailyApplicationRollup, ResumeBlob
+)
 
 
 @admin.register(Department)
@@ -39,3 +42,30 @@ class ActivityAdmin(admin.ModelAdmin):
     readonly_fields = ['timestamp']
     date_hierarchy = 'timestamp'
 
+
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name']
+    search_fields = ['name']
+
+
+@admin.register(StatusCounter)
+class StatusCounterAdmin(admin.ModelAdmin):
+    list_display = ['scope', 'department', 'status', 'count']
+    list_filter = ['status', 'department']
+    search_fields = ['scope']
+
+
+@admin.register(DailyApplicationRollup)
+class DailyApplicationRollupAdmin(admin.ModelAdmin):
+    list_display = ['day', 'department', 'position', 'status', 'count']
+    list_filter = ['status', 'department']
+    date_hierarchy = 'day'
+
+
+@admin.register(ResumeBlob)
+class ResumeBlobAdmin(admin.ModelAdmin):
+    list_display = ['sha256', 'file', 'size', 'refcount', 'created_at']
+    search_fields = ['sha256']
+    readonly_fields = ['sha256', 'file', 'size', 'refcount', 'created_at']
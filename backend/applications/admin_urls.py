@@ -4,6 +4,8 @@ from . import views
 urlpatterns = [
     path('dashboard/stats/', views.admin_dashboard_stats, name='admin-dashboard-stats'),
     path('applications/', views.ApplicationViewSet.as_view({'get': 'list', 'post': 'create'}), name='admin-applications-list'),
+    path('applications/export/', views.ApplicationViewSet.as_view({'get': 'export'}), name='admin-applications-export'),
+    path('applications/bulk-status/', views.ApplicationViewSet.as_view({'post': 'bulk_update_status'}), name='admin-applications-bulk-status'),
     path('applications/<int:pk>/', views.ApplicationViewSet.as_view({
         'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'
     }), name='admin-application-detail'),
@@ -0,0 +1,76 @@
+"""
+Versioned response cache for the public catalog endpoints (departments, positions).
+
+Serialized payloads are cached under the current catalog version, which is
+bumped after any committed change to a Department or Position. The ETag is
+derived from the version, so conditional requests are answered from the
+cache alone.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a lost version key never reuses an old number
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate_catalog():
+    """Bump the catalog version once the current transaction commits."""
+    transaction.on_commit(bump_catalog_version)
+
+
+def etag_matches(etag, if_none_match):
+    """
+    Weak comparison of ``etag`` with an ``If-None-Match`` list, as the header
+    requires: a proxy that compresses the response turns the tag into ``W/"..."``.
+    """
+    if not if_none_match:
+        return False
+    tags = parse_etags(if_none_match)
+    return tags == ['*'] or any(tag.removeprefix('W/') == etag for tag in tags)
+
+
+def catalog_response(request, name, build_data):
+    """
+    Return the cached payload for catalog ``name``, calling ``build_data()`` on a miss.
+
+    Answers ``If-None-Match`` with a 304 when the client already has the
+    current version.
+    """
+    version = get_catalog_version()
+    etag = quote_etag(f'{name}-{version}')
+
+    if etag_matches(etag, request.headers.get('If-None-Match')):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        key = f'catalog:{name}:{version}'
+        data = cache.get(key)
+        if data is None:
+            data = build_data()
+            cache.set(key, data, settings.CATALOG_CACHE_TIMEOUT)
+        response = Response(data)
+
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.CATALOG_CACHE_MAX_AGE)
+    return response
@@ -0,0 +1,280 @@
+"""
+Incrementally maintained application aggregates.
+
+``StatusCounter`` backs the dashboard stats and ``DailyApplicationRollup``
+backs ``admin_analytics``. They are adjusted inside the transaction that
+changes the application, so they commit or roll back with it:
+``Application.save()`` and ``Application.objects...update()`` move the
+application when one of ``COUNTED_FIELDS`` changes, and the ``post_delete``
+signal removes it, for single, bulk and cascading deletes alike. The
+``users`` scope counts users per ``user_type``, kept by the ``User`` signals.
+
+Writes that bypass those paths (``bulk_create``, raw SQL, fixtures loaded
+with ``loaddata``) must call ``applications_added`` / ``users_added``, or be
+reconciled afterwards with ``rebuild_counters`` and ``replace_rollups``
+(the ``rebuild_counters`` and ``rebuild_rollups`` management commands).
+"""
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, IntegerField, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import COUNTED_FIELDS, DailyApplicationRollup, StatusCounter
+
+GLOBAL_SCOPE = 'global'
+# Users per user_type, in the status column (see StatusCounter)
+USERS_SCOPE = 'users'
+# Keys per bulk_create batch and per CASE UPDATE
+INCREMENT_CHUNK_SIZE = 1000
+
+KEY_FIELDS = {
+    StatusCounter: ('scope', 'department', 'status'),
+    DailyApplicationRollup: ('day', 'department', 'position', 'status'),
+}
+
+
+def applicant_scope(applicant_id):
+    return f'applicant:{applicant_id}'
+
+
+def _keys(applicant_id, day, department, position, status):
+    return [
+        (StatusCounter, (GLOBAL_SCOPE, department, status)),
+        (StatusCounter, (applicant_scope(applicant_id), '', status)),
+        (DailyApplicationRollup, (day, department, position, status)),
+    ]
+
+
+def _user_key(user_type):
+    return (StatusCounter, (USERS_SCOPE, '', user_type))
+
+
+def _values_keys(values):
+    """Keys of an application given the values of its ``COUNTED_FIELDS``."""
+    applicant_id, applied_date, department, position, status = values
+    return _keys(applicant_id, timezone.localdate(applied_date), department, position, status)
+
+
+def _application_keys(application):
+    return _values_keys(tuple(getattr(application, name) for name in COUNTED_FIELDS))
+
+
+def _adjust(deltas):
+    for (model, values), delta in deltas.items():
+        if not delta:
+            continue
+        lookup = dict(zip(KEY_FIELDS[model], values))
+        if model.objects.filter(**lookup).update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                model.objects.create(count=delta, **lookup)
+        except IntegrityError:
+            # Created concurrently by another transaction
+            model.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+def _increment(model, deltas_by_id):
+    """Add ``{pk: delta}`` to existing rows with one ``CASE`` UPDATE per chunk."""
+    ids = list(deltas_by_id)
+    for start in range(0, len(ids), INCREMENT_CHUNK_SIZE):
+        chunk = ids[start:start + INCREMENT_CHUNK_SIZE]
+        model.objects.filter(pk__in=chunk).update(count=F('count') + Case(
+            *[When(pk=pk, then=Value(deltas_by_id[pk])) for pk in chunk],
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+
+
+def _adjust_bulk(deltas):
+    """
+    Set-based ``_adjust`` for batches touching many keys (bulk loads, bulk
+    status updates). Per model it costs one SELECT of the existing keys, one
+    ``bulk_create`` of the missing ones and one ``CASE`` UPDATE of the rest,
+    each per chunk of 1000 keys, however many keys there are.
+    """
+    by_model = {}
+    for (model, values), delta in deltas.items():
+        if delta:
+            by_model.setdefault(model, {})[values] = delta
+    for model, model_deltas in by_model.items():
+        fields = KEY_FIELDS[model]
+        # Narrow on the first key field, then match whole keys in Python
+        existing = {
+            tuple(row[1:]): row[0]
+            for row in model.objects.filter(**{f'{fields[0]}__in': {values[0] for values in model_deltas}})
+            .values_list('pk', *fields)
+        }
+        missing = {values: delta for values, delta in model_deltas.items() if values not in existing}
+        if missing:
+            try:
+                with transaction.atomic():
+                    model.objects.bulk_create([
+                        model(count=delta, **dict(zip(fields, values))) for values, delta in missing.items()
+                    ], batch_size=INCREMENT_CHUNK_SIZE)
+            except IntegrityError:
+                # Some keys were created concurrently, fall back to one key at a time
+                _adjust({(model, values): delta for values, delta in missing.items()})
+        _increment(model, {
+            existing[values]: delta for values, delta in model_deltas.items() if values in existing
+        })
+
+
+def application_added(application):
+    _adjust(Counter(_application_keys(application)))
+
+
+def applications_added(applications):
+    """Batched ``application_added`` for bulk loads."""
+    deltas = Counter()
+    for application in applications:
+        deltas.update(_application_keys(application))
+    _adjust_bulk(deltas)
+
+
+def application_removed(application):
+    _adjust({key: -1 for key in _application_keys(application)})
+
+
+def users_added(users):
+    """Count users inserted with ``bulk_create``; saved and deleted users are counted by signals."""
+    _adjust(Counter(_user_key(user.user_type) for user in users))
+
+
+def user_changed(old_type, new_type):
+    if old_type != new_type:
+        _adjust({_user_key(old_type): -1, _user_key(new_type): 1})
+
+
+def user_removed(user):
+    _adjust({_user_key(user.user_type): -1})
+
+
+def _change_deltas(changes):
+    deltas = Counter()
+    for old, new in changes:
+        if old == new:
+            continue
+        for key in _values_keys(old):
+            deltas[key] -= 1
+        for key in _values_keys(new):
+            deltas[key] += 1
+    return deltas
+
+
+def application_changed(old, new):
+    """Move one application from the ``old`` to the ``new`` values of its ``COUNTED_FIELDS``."""
+    _adjust(_change_deltas([(old, new)]))
+
+
+def applications_changed(changes):
+    """
+    Batched ``application_changed``: ``changes`` is an iterable of
+    ``(old_values, new_values)`` pairs of ``COUNTED_FIELDS`` values.
+    Applied set-based by ``_adjust_bulk``, so the number of statements
+    doesn't grow with the batch (up to 1000 keys per model and statement).
+    """
+    _adjust_bulk(_change_deltas(changes))
+
+
+def compute_counters(application_model):
+    """Recompute every status counter from the applications table, returning ``{key: count}``."""
+    counts = {}
+    by_department = application_model.objects.order_by().values('department', 'status').annotate(n=Count('id'))
+    for row in by_department:
+        counts[(GLOBAL_SCOPE, row['department'], row['status'])] = row['n']
+    by_applicant = application_model.objects.order_by().values('applicant_id', 'status').annotate(n=Count('id'))
+    for row in by_applicant:
+        counts[(applicant_scope(row['applicant_id']), '', row['status'])] = row['n']
+    user_model = application_model._meta.get_field('applicant').related_model
+    by_user_type = user_model.objects.order_by().values('user_type').annotate(n=Count('id'))
+    for row in by_user_type:
+        counts[(USERS_SCOPE, '', row['user_type'])] = row['n']
+    return counts
+
+
+def rebuild_counters(application_model, counter_model):
+    """Replace all status counters with freshly computed values; returns the number of drifted keys."""
+    with transaction.atomic():
+        expected = compute_counters(application_model)
+        current = {
+            (c.scope, c.department, c.status): c.count
+            for c in counter_model.objects.select_for_update()
+        }
+        drifted = sum(
+            1 for key in expected.keys() | current.keys()
+            if expected.get(key, 0) != current.get(key, 0)
+        )
+        counter_model.objects.all().delete()
+        counter_model.objects.bulk_create([
+            counter_model(scope=scope, department=department, status=status, count=count)
+            for (scope, department, status), count in expected.items()
+        ], batch_size=1000)
+    return drifted
+
+
+def count_users(user_type):
+    return StatusCounter.objects.filter(scope=USERS_SCOPE, department='', status=user_type).values_list(
+        'count', flat=True
+    ).first() or 0
+
+
+def read_counters(scope):
+    """Return ``{(department, status): count}`` for a scope."""
+    return {
+        (department, status): count
+        for department, status, count in StatusCounter.objects.filter(scope=scope)
+        .values_list('department', 'status', 'count')
+    }
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def compute_rollups(application_model, start_day=None, end_day=None):
+    """
+    Recompute daily rollups for applications applied in ``[start_day, end_day)``
+    (unbounded when omitted), returning ``{(day, department, position, status): count}``.
+    """
+    applications = application_model.objects.order_by()
+    if start_day is not None:
+        applications = applications.filter(applied_date__gte=_day_start(start_day))
+    if end_day is not None:
+        applications = applications.filter(applied_date__lt=_day_start(end_day))
+    rows = applications.annotate(day=TruncDate('applied_date')).values(
+        'day', 'department', 'position', 'status'
+    ).annotate(n=Count('id'))
+    return {
+        (row['day'], row['department'], row['position'], row['status']): row['n']
+        for row in rows
+    }
+
+
+def replace_rollups(rollup_model, rollups, start_day=None, end_day=None):
+    """Atomically replace the rollups in ``[start_day, end_day)`` with ``rollups``."""
+    with transaction.atomic():
+        existing = rollup_model.objects.all()
+        if start_day is not None:
+            existing = existing.filter(day__gte=start_day)
+        if end_day is not None:
+            existing = existing.filter(day__lt=end_day)
+        existing.delete()
+        rollup_model.objects.bulk_create([
+            rollup_model(day=day, department=department, position=position, status=status, count=count)
+            for (day, department, position, status), count in rollups.items()
+        ], batch_size=1000)
+
+
+def rollup_ranges(first_day, last_day, days_per_range):
+    """Split ``[first_day, last_day]`` into consecutive ``(start, end)`` ranges with exclusive ends."""
+    ranges = []
+    start = first_day
+    while start <= last_day:
+        end = min(start + timedelta(days=days_per_range), last_day + timedelta(days=1))
+        ranges.append((start, end))
+        start = end
+    return ranges
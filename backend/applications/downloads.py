@@ -0,0 +1,173 @@
+"""
+Authorized resume downloads.
+
+Once the view has checked access, the transfer itself can be handed to the
+front proxy, so no Python worker is tied up streaming a PDF. The deployment
+opts in with ``RESUME_DOWNLOAD_OFFLOAD``: ``X-Accel-Redirect`` (nginx) answers
+with a redirect to the proxy's internal media location
+(``RESUME_DOWNLOAD_ACCEL_PREFIX``) instead of a body; ``X-Sendfile`` (Apache
+mod_xsendfile, lighttpd) answers with the file's absolute path. Unlike
+Rack::Sendfile this is never negotiated through a request header, which a
+client reaching the backend directly could send too. Without the setting,
+downloads are a ``FileResponse`` honouring ``Range`` and
+``If-Modified-Since``.
+
+A link opened in a new tab can't send the JWT, so the client first asks for
+a download link: a short-lived token signed for the application and the
+requesting user, whose access is checked again when the link is used.
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core import signing
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils.http import content_disposition_header, http_date
+from django.utils.text import slugify
+from django.views.static import was_modified_since
+
+OFFLOAD_MODES = ('X-Accel-Redirect', 'X-Sendfile')
+TOKEN_SALT = 'applications.resume-download'
+BYTE_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class UnsatisfiableRange(Exception):
+    pass
+
+
+class RangeFile:
+    """Read-only view of ``length`` bytes of ``file`` from ``start``."""
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def download_token(application, user):
+    return signing.dumps([application.pk, user.pk], salt=TOKEN_SALT)
+
+
+def read_download_token(token):
+    """Return the ``(application_id, user_id)`` signed into ``token``, or None if invalid or expired."""
+    try:
+        application_id, user_id = signing.loads(
+            token, salt=TOKEN_SALT, max_age=settings.RESUME_DOWNLOAD_URL_MAX_AGE
+        )
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    return application_id, user_id
+
+
+def parse_range(header, size):
+    """
+    Return the inclusive ``(first, last)`` byte range asked for by ``header``.
+
+    None means serve the whole file: no header, or several ranges, which are
+    rare for documents and allowed to be answered in full.
+    """
+    match = BYTE_RANGE.match(header or '')
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the last N bytes
+        first, last = max(size - int(last), 0), size - 1
+    else:
+        first, last = int(first), min(int(last), size - 1) if last else size - 1
+    if first >= size or last < first:
+        raise UnsatisfiableRange
+    return first, last
+
+
+def download_filename(application):
+    extension = os.path.splitext(application.resume.name)[1].lower()
+    name = slugify(application.applicant.full_name) or 'applicant'
+    return f'{name}-resume-{application.pk}{extension}'
+
+
+def _offload_mode():
+    mode = settings.RESUME_DOWNLOAD_OFFLOAD
+    return mode if mode in OFFLOAD_MODES else None
+
+
+def _offload_response(mode, field, filename):
+    if mode == 'X-Sendfile':
+        try:
+            target = field.path
+        except NotImplementedError:
+            # Storage without local paths can't be handed to the proxy
+            return None
+    else:
+        target = settings.RESUME_DOWNLOAD_ACCEL_PREFIX.rstrip('/') + '/' + quote(field.name)
+    # The proxy fills in the body and length, and handles ranges and conditional requests
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = HttpResponse(content_type=content_type)
+    response[mode] = target
+    response['Content-Disposition'] = content_disposition_header(False, filename)
+    response['Cache-Control'] = 'private'
+    return response
+
+
+def _file_response(request, field, filename):
+    storage = field.storage
+    try:
+        mtime = int(storage.get_modified_time(field.name).timestamp())
+    except FileNotFoundError:
+        raise Http404('Resume file not found')
+    last_modified = http_date(mtime)
+    if not was_modified_since(request.headers.get('If-Modified-Since'), mtime):
+        response = HttpResponseNotModified()
+        response['Last-Modified'] = last_modified
+        return response
+
+    size = storage.size(field.name)
+    byte_range = None
+    # A range only applies to the version the client already has part of
+    if request.headers.get('If-Range', last_modified) == last_modified:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except UnsatisfiableRange:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    file = storage.open(field.name, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, filename=filename)
+    else:
+        first, last = byte_range
+        length = last - first + 1
+        response = FileResponse(RangeFile(file, first, length), filename=filename, status=206)
+        response['Content-Length'] = length
+        response['Content-Range'] = f'bytes {first}-{last}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = last_modified
+    response['Cache-Control'] = 'private'
+    return response
+
+
+def resume_response(request, application):
+    """Return the response downloading ``application``'s resume; access must be checked already."""
+    field = application.resume
+    filename = download_filename(application)
+    mode = _offload_mode()
+    if mode:
+        response = _offload_response(mode, field, filename)
+        if response is not None:
+            return response
+    return _file_response(request, field, filename)
@@ -0,0 +1,124 @@
+"""
+Streaming export of applications as CSV or NDJSON.
+
+Rows are read with ``values_list().iterator()`` so only one chunk of plain
+tuples is in memory at a time (a server-side cursor on PostgreSQL), encoded
+in batches and yielded to a ``StreamingHttpResponse``, optionally through an
+incremental gzip compressor. CSV cells starting like a formula are
+prefixed with ``'`` so spreadsheets show them as text; NDJSON is unchanged.
+"""
+import csv
+import io
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+# (column name, queryset lookup)
+EXPORT_FIELDS = [
+    ('id', 'id'),
+    ('applicant_email', 'applicant__email'),
+    ('applicant_first_name', 'applicant__first_name'),
+    ('applicant_last_name', 'applicant__last_name'),
+    ('applicant_phone', 'applicant__phone'),
+    ('position', 'position'),
+    ('department', 'department'),
+    ('status', 'status'),
+    ('experience', 'experience'),
+    ('current_company', 'current_company'),
+    ('current_salary', 'current_salary'),
+    ('expected_salary', 'expected_salary'),
+    ('notice_period', 'notice_period'),
+    ('availability', 'availability'),
+    ('education', 'education'),
+    ('university', 'university'),
+    ('graduation_year', 'graduation_year'),
+    ('skills', 'skills'),
+    ('linkedin_url', 'linkedin_url'),
+    ('portfolio_url', 'portfolio_url'),
+    ('referral', 'referral'),
+    ('resume', 'resume'),
+    ('interview_date', 'interview_date'),
+    ('applied_date', 'applied_date'),
+    ('last_updated', 'last_updated'),
+]
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Rows fetched per database round trip and encoded per yielded chunk
+CHUNK_SIZE = 2000
+ROWS_PER_WRITE = 500
+
+
+def _batches(queryset, chunk_size):
+    lookups = [lookup for _, lookup in EXPORT_FIELDS]
+    batch = []
+    for row in queryset.values_list(*lookups).iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= ROWS_PER_WRITE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Leading characters that make spreadsheet apps evaluate a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Applicant-controlled text must open as text in Excel or Sheets, not run
+        return "'" + value
+    return value
+
+
+def csv_chunks(queryset, chunk_size=CHUNK_SIZE):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_FIELDS])
+    for batch in _batches(queryset, chunk_size):
+        writer.writerows([[_csv_value(value) for value in row] for row in batch])
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def ndjson_chunks(queryset, chunk_size=CHUNK_SIZE):
+    names = [name for name, _ in EXPORT_FIELDS]
+    encoder = DjangoJSONEncoder()
+    for batch in _batches(queryset, chunk_size):
+        yield ''.join(encoder.encode(dict(zip(names, row))) + '\n' for row in batch).encode('utf-8')
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(queryset, export_format, compress=False):
+    """Return a ``StreamingHttpResponse`` downloading ``queryset`` as ``export_format``."""
+    chunks = csv_chunks(queryset) if export_format == 'csv' else ndjson_chunks(queryset)
+    filename = f'applications-{timezone.localdate():%Y%m%d}.{export_format}'
+    if compress:
+        chunks = gzip_chunks(chunks)
+        content_type = 'application/gzip'
+        filename += '.gz'
+    else:
+        content_type = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
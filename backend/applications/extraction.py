@@ -0,0 +1,106 @@
+"""
+Plain-text extraction from resume files.
+
+Deliberately free of Django imports: ``extract_text`` runs in worker
+processes started with the ``spawn`` method, which import this module
+without setting Django up.
+"""
+import io
+import logging
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from pypdf import PdfReader
+
+MAX_PAGES = 50
+MAX_CHARS = 100_000
+# Uncompressed size above which a .docx is treated as a zip bomb
+MAX_DOCX_XML_SIZE = 20 * 1024 * 1024
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+WHITESPACE_RE = re.compile(r'[ \t\r\f\v]+')
+BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+# pypdf logs every recoverable oddity of malformed files; failures are recorded instead
+logging.getLogger('pypdf').setLevel(logging.ERROR)
+
+
+def _pdf_text(source):
+    reader = PdfReader(source)
+    if reader.is_encrypted:
+        reader.decrypt('')
+    parts = []
+    length = 0
+    for page in reader.pages[:MAX_PAGES]:
+        text = page.extract_text() or ''
+        parts.append(text)
+        length += len(text)
+        if length >= MAX_CHARS:
+            break
+    return '\n'.join(parts)
+
+
+def _docx_text(source):
+    with zipfile.ZipFile(source) as archive:
+        if archive.getinfo('word/document.xml').file_size > MAX_DOCX_XML_SIZE:
+            raise ValueError('word/document.xml is too large')
+        with archive.open('word/document.xml') as document:
+            parts = []
+            for _, element in ElementTree.iterparse(document):
+                if element.tag == f'{WORD_NAMESPACE}t' and element.text:
+                    parts.append(element.text)
+                elif element.tag in (f'{WORD_NAMESPACE}tab', f'{WORD_NAMESPACE}br'):
+                    parts.append(' ')
+                elif element.tag == f'{WORD_NAMESPACE}p':
+                    parts.append('\n')
+                    # Paragraphs are done with; keep memory flat on long documents
+                    element.clear()
+    return ''.join(parts)
+
+
+def _plain_text(source):
+    return source.read(MAX_CHARS * 4).decode('utf-8', errors='replace')
+
+
+EXTRACTORS = {
+    '.pdf': _pdf_text,
+    '.docx': _docx_text,
+    '.txt': _plain_text,
+}
+
+
+def supported(name):
+    return os.path.splitext(name)[1].lower() in EXTRACTORS
+
+
+def normalize(text):
+    # NUL can't be stored in PostgreSQL text columns
+    text = text.replace('\x00', '')
+    text = WHITESPACE_RE.sub(' ', text)
+    return BLANK_LINES_RE.sub('\n\n', text).strip()[:MAX_CHARS]
+
+
+def extract_text(name, source):
+    """
+    Return ``(name, status, text, error)`` for the resume stored as ``name``.
+
+    ``source`` is a local path or the file's bytes. Status is one of the
+    ``ResumeText`` statuses; errors never propagate, so one broken file
+    can't fail a batch.
+    """
+    extractor = EXTRACTORS.get(os.path.splitext(name)[1].lower())
+    if extractor is None:
+        return name, 'unsupported', '', None
+    try:
+        if isinstance(source, bytes):
+            text = extractor(io.BytesIO(source))
+        else:
+            with open(source, 'rb') as file:
+                text = extractor(file)
+    except Exception as e:
+        # Parsers raise all sorts of errors on malformed input
+        return name, 'failed', '', f'{type(e).__name__}: {e}'
+    text = normalize(text)
+    return name, 'extracted' if text else 'empty', text, None
@@ -0,0 +1,46 @@
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from .search import get_resume_index, get_search_backend, tokenize
+from .skills import filter_by_skills
+
+
+class ApplicationSkillFilter(BaseFilterBackend):
+    """Filter on ``?skills=python,kubernetes`` (all listed skills required) using the skill index."""
+    skills_param = 'skills'
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.skills_param, '')
+        names = [name for name in value.split(',') if name.strip()]
+        if not names:
+            return queryset
+        return filter_by_skills(queryset, names)
+
+
+class ApplicationResumeTextFilter(BaseFilterBackend):
+    """Filter on ``?resume_text=`` (all terms required) using the index of extracted resume text."""
+    resume_text_param = 'resume_text'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = tokenize(request.query_params.get(self.resume_text_param, ''))
+        if not terms:
+            return queryset
+        return get_resume_index().search(queryset, terms)
+
+
+class ApplicationSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search on ``?search=`` backed by the database's search index.
+
+    Results are ordered by relevance unless an explicit ``?ordering=`` is given,
+    so this backend must run after ``OrderingFilter``.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        terms = tokenize(request.query_params.get(self.search_param, ''))
+        if not terms:
+            return queryset
+        queryset = get_search_backend().search(queryset, terms)
+        if not request.query_params.get(OrderingFilter.ordering_param):
+            queryset = queryset.order_by('-search_rank', '-applied_date')
+        return queryset
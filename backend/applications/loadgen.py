@@ -0,0 +1,278 @@
+"""
+Deterministic synthetic data for scale and performance testing.
+
+``LoadDataGenerator`` draws everything from one seeded ``random.Random`` and
+dates relative to a fixed ``end_date``, so the same arguments always produce
+the same dataset. Department and position popularity follow a Zipf-like
+curve, applications grow towards ``end_date`` and move through a
+review -> interview -> offer funnel that leaves a status history and an
+activity per step. Rows are written in chunks with bulk inserts.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from django.db import connection, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from users.models import User
+from .importer import CSVImporter
+from .models import (
+    Activity, Application, ApplicationSkill, DailyApplicationRollup, Department, Position, StatusCounter,
+    StatusHistory,
+)
+from .skills import index_application_skills
+
+EMAIL_DOMAIN = 'load.test'
+
+DEPARTMENTS = [
+    'Engineering', 'Sales', 'Customer Support', 'Marketing', 'Operations', 'Product',
+    'Design', 'Data', 'Finance', 'Human Resources', 'Security', 'Legal',
+]
+SENIORITIES = ['Junior', '', 'Senior', 'Staff', 'Lead', 'Principal']
+ROLES = [
+    'Engineer', 'Analyst', 'Specialist', 'Manager', 'Coordinator', 'Consultant',
+    'Associate', 'Architect', 'Representative', 'Strategist',
+]
+SKILLS = [
+    'Python', 'JavaScript', 'SQL', 'Communication', 'Excel', 'Project Management', 'React',
+    'Java', 'AWS', 'Salesforce', 'Docker', 'Leadership', 'Figma', 'Negotiation', 'Go',
+    'Kubernetes', 'TypeScript', 'Tableau', 'Statistics', 'Machine Learning', 'Agile',
+    'Copywriting', 'SEO', 'Accounting', 'Recruiting', 'Linux', 'Terraform', 'Rust',
+    'Customer Success', 'Public Speaking',
+]
+FIRST_NAMES = [
+    'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda', 'David',
+    'Elizabeth', 'Wei', 'Priya', 'Carlos', 'Fatima', 'Yuki', 'Olga', 'Ahmed', 'Ana', 'Kwame', 'Sofia',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez',
+    'Martinez', 'Chen', 'Patel', 'Kim', 'Nguyen', 'Ivanova', 'Okafor', 'Silva', 'Tanaka', 'Khan', 'Rossi',
+]
+EDUCATION = [
+    ("High School", 1), ("Associate's Degree", 2), ("Bachelor's Degree", 10),
+    ("Master's Degree", 5), ('PhD', 1),
+]
+
+
+def zipf_weights(n, exponent=1.1):
+    """Cumulative weights where item ``k`` is ``(k + 1) ** exponent`` times rarer than the first."""
+    return list(accumulate(1 / (rank + 1) ** exponent for rank in range(n)))
+
+
+class LoadDataGenerator:
+    def __init__(self, seed=42, end_date=None, years=3, chunk_size=10000, log=None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        end_date = end_date or timezone.localdate()
+        self.end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+        self.span_seconds = years * 365 * 86400
+        self.chunk_size = chunk_size
+        self.log = log or (lambda message: None)
+        # Reuses the importer's bulk insert (COPY on PostgreSQL) and password hash
+        self.writer = CSVImporter(chunk_size=chunk_size)
+        self.counts = {}
+
+    def generate(self, departments=12, positions=150, applicants=20000, applications=60000, admins=3):
+        if User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').exists():
+            raise ValueError(f'Generated data (@{EMAIL_DOMAIN} users) already exists, clear it first')
+        self.admin_ids = self.create_admins(admins)
+        self.departments = self.create_departments(departments)
+        self.positions = self.create_positions(positions)
+        self.applicant_ids = self.create_applicants(applicants)
+        self.create_applications(applications)
+        return self.counts
+
+    def _weighted(self, population, cum_weights):
+        return self.rng.choices(population, cum_weights=cum_weights)[0]
+
+    def _timestamp(self):
+        # Volume grows towards ``end``: most applications are recent, the tail spans ``years``
+        return self.end - timedelta(seconds=self.span_seconds * (1 - self.rng.random() ** 0.5))
+
+    def _chunked(self, total, name, build, write):
+        written = 0
+        started = time.perf_counter()
+        for offset in range(0, total, self.chunk_size):
+            rows = [build(index) for index in range(offset, min(total, offset + self.chunk_size))]
+            with transaction.atomic():
+                write(rows)
+            written += len(rows)
+            elapsed = time.perf_counter() - started
+            self.log(f'  {name}: {written}/{total} ({written / elapsed:,.0f} rows/s)')
+        self.counts[name] = written
+
+    def create_admins(self, count):
+        admins = [
+            User(
+                email=f'admin{index}@{EMAIL_DOMAIN}', password=self.writer.password_hash,
+                first_name='Load', last_name=f'Admin {index}', phone='0000000000',
+                user_type='admin', is_verified=True, is_staff=True,
+            )
+            for index in range(count)
+        ]
+        User.objects.bulk_create(admins)
+        return list(
+            User.objects.filter(email__in=[admin.email for admin in admins]).order_by('id').values_list('id', flat=True)
+        )
+
+    def create_departments(self, count):
+        names = DEPARTMENTS[:count] + [f'Department {index}' for index in range(len(DEPARTMENTS), count)]
+        existing = set(Department.objects.filter(name__in=names).values_list('name', flat=True))
+        Department.objects.bulk_create([
+            Department(name=name, description=f'{name} department') for name in names if name not in existing
+        ])
+        ids = dict(Department.objects.filter(name__in=names).values_list('name', 'id'))
+        self.counts['departments'] = len(names) - len(existing)
+        return [(name, ids[name]) for name in names]
+
+    def create_positions(self, count):
+        department_weights = zipf_weights(len(self.departments))
+        positions = []
+        seen = set()
+        while len(positions) < count:
+            department, department_id = self._weighted(self.departments, department_weights)
+            title = ' '.join(filter(None, [
+                self.rng.choice(SENIORITIES), department.split()[0], self.rng.choice(ROLES)
+            ]))
+            if (title, department) in seen:
+                title = f'{title} {len(positions)}'
+            seen.add((title, department))
+            positions.append(Position(
+                title=title, department_id=department_id,
+                description=f'{title} in the {department} team.',
+                requirements=self.rng.sample(SKILLS, 4),
+                is_active=self.rng.random() < 0.8,
+                created_at=self._timestamp(),
+            ))
+        self.writer.insert(Position, positions)
+        self.counts['positions'] = len(positions)
+        names = {department_id: name for name, department_id in self.departments}
+        return [(position.title, names[position.department_id], position.requirements) for position in positions]
+
+    def create_applicants(self, count):
+        first_id = (User.objects.aggregate(last=Max('id'))['last'] or 0)
+
+        def build(index):
+            first_name = self.rng.choice(FIRST_NAMES)
+            last_name = self.rng.choice(LAST_NAMES)
+            return User(
+                email=f'{first_name}.{last_name}.{index}@{EMAIL_DOMAIN}'.lower(),
+                password=self.writer.password_hash,
+                first_name=first_name, last_name=last_name,
+                phone=f'555{self.rng.randrange(10 ** 7):07d}',
+                is_verified=self.rng.random() < 0.9,
+                date_joined=self._timestamp(),
+            )
+
+        self._chunked(count, 'applicants', build, lambda rows: self.writer.insert(User, rows))
+        # Generated applicants are the only users created since ``first_id``
+        return list(
+            User.objects.filter(id__gt=first_id, user_type='applicant', email__endswith=f'@{EMAIL_DOMAIN}')
+            .order_by('id').values_list('id', flat=True)
+        )
+
+    def _funnel(self, applied_date):
+        """Return the ``[(status, timestamp, changed_by_id), ...]`` chain of one application."""
+        chain = [('under-review', applied_date, None)]
+        at = applied_date
+        for step in ('review', 'interview'):
+            r = self.rng.random()
+            if step == 'review':
+                next_status = 'rejected' if r < 0.55 else 'interview-scheduled' if r < 0.85 else None
+            else:
+                next_status = 'accepted' if r < 0.3 else 'rejected' if r < 0.8 else None
+            if next_status is None:
+                break
+            at = at + timedelta(days=self.rng.uniform(1, 21))
+            if at >= self.end:
+                break
+            chain.append((next_status, at, self.rng.choice(self.admin_ids) if self.admin_ids else None))
+            if next_status != 'interview-scheduled':
+                break
+        return chain
+
+    def create_applications(self, count):
+        position_weights = zipf_weights(len(self.positions), exponent=0.9)
+        # Applicant activity is skewed too: a few applicants apply a lot
+        applicant_weights = zipf_weights(len(self.applicant_ids), exponent=0.6)
+        education, education_weights = zip(*EDUCATION)
+        education_weights = list(accumulate(education_weights))
+        self.counts['status_history'] = self.counts['activities'] = 0
+
+        def build(index):
+            title, department, requirements = self._weighted(self.positions, position_weights)
+            applied_date = self._timestamp()
+            chain = self._funnel(applied_date)
+            status, last_change, _ = chain[-1]
+            years = int(self.rng.expovariate(1 / 5))
+            skills = requirements[:self.rng.randint(1, 4)] + self.rng.sample(SKILLS, self.rng.randint(0, 3))
+            application = Application(
+                applicant_id=self._weighted(self.applicant_ids, applicant_weights),
+                position=title,
+                department=department,
+                experience=f'{years} years',
+                expected_salary=f'${40000 + years * 8000 + self.rng.randrange(0, 20000, 1000):,}',
+                education=self._weighted(education, education_weights),
+                skills=', '.join(dict.fromkeys(skills)),
+                cover_letter=f'I have {years} years of experience and would love to join {department} as {title}.',
+                resume=f'resumes/load_{index}.pdf',
+                status=status,
+                interview_date=last_change + timedelta(days=self.rng.randint(2, 14))
+                if status == 'interview-scheduled' else None,
+                applied_date=applied_date,
+                # Generated history, never announced in the HR digest
+                hr_digested_at=applied_date,
+            )
+            application.chain = chain
+            return application
+
+        def write(applications):
+            last_id = Application.objects.aggregate(last=Max('id'))['last'] or 0
+            Application.objects.bulk_create(applications)
+            if applications[0].pk is None:
+                # The backend didn't return primary keys, this is the only writer
+                ids = Application.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)
+                for application, pk in zip(applications, ids):
+                    application.pk = pk
+
+            history, activities = [], []
+            for application in applications:
+                for step, (status, at, changed_by) in enumerate(application.chain):
+                    history.append(StatusHistory(
+                        application_id=application.pk, status=status, changed_by_id=changed_by,
+                        changed_at=at, comment='Application submitted' if not step else '',
+                    ))
+                    activities.append(Activity(
+                        action='status_updated' if step else 'application_submitted',
+                        description=f'Application status changed to {status} for {application.position}'
+                        if step else f'New application received for {application.position}',
+                        applicant_id=application.applicant_id, application_id=application.pk,
+                        changed_by_id=changed_by, timestamp=at,
+                        metadata={'status': status} if step else {},
+                    ))
+            self.writer.insert(StatusHistory, history)
+            self.writer.insert(Activity, activities)
+            index_application_skills([(application.pk, application.skills) for application in applications])
+            self.counts['status_history'] += len(history)
+            self.counts['activities'] += len(activities)
+
+        self._chunked(count, 'applications', build, write)
+
+
+def _delete_all(model):
+    # A plain DELETE: the ORM would load every row to send delete signals
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+
+
+def clear_data():
+    """Delete all applications, positions, departments, applicants and generated users."""
+    with transaction.atomic():
+        for model in (Activity, StatusHistory, ApplicationSkill, Application, StatusCounter, DailyApplicationRollup):
+            _delete_all(model)
+        Position.objects.all().delete()
+        Department.objects.all().delete()
+        User.objects.filter(Q(user_type='applicant') | Q(email__endswith=f'@{EMAIL_DOMAIN}')).delete()
@@ -0,0 +1,88 @@
+import os
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from applications.models import ResumeText
+from applications.resume_text import extract_in_pool, store_results
+from veridia.processes import process_pool
+
+
+class Command(BaseCommand):
+    help = (
+        'Extract and index the text of stored resumes in parallel. Files already extracted are '
+        'skipped, so an interrupted run picks up where it stopped'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Parser processes (default: number of CPUs)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Files extracted and committed together (default: 200)',
+        )
+        parser.add_argument(
+            '--retry-failed',
+            action='store_true',
+            help='Also retry files whose extraction failed before',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Extract every file again, e.g. after improving the parsers',
+        )
+        parser.add_argument(
+            '--prefix',
+            default='resumes',
+            help='Storage directory to walk (default: resumes)',
+        )
+
+    def handle(self, *args, **options):
+        names = sorted(self.walk(options['prefix']))
+        if not options['force']:
+            done = ResumeText.objects.all()
+            if options['retry_failed']:
+                done = done.exclude(status='failed')
+            done = set(done.values_list('name', flat=True))
+            names = [name for name in names if name not in done]
+
+        total = len(names)
+        self.stdout.write(f'{total} files to extract with {options["workers"]} workers')
+        batch_size = options['batch_size']
+        started = time.perf_counter()
+        counts = {}
+        with process_pool(options['workers']) as pool:
+            for start in range(0, total, batch_size):
+                results = extract_in_pool(pool, names[start:start + batch_size])
+                # Committed per batch: an interrupted run loses at most one batch
+                store_results(results)
+                for _, status, _, _ in results:
+                    counts[status] = counts.get(status, 0) + 1
+
+                done = start + len(results)
+                elapsed = time.perf_counter() - started
+                rate = done / elapsed if elapsed else 0
+                remaining = (total - done) / rate if rate else 0
+                self.stdout.write(
+                    f'  {done}/{total} files ({rate:.1f}/s, about {remaining:.0f}s left)'
+                )
+
+        summary = ', '.join(f'{status}: {count}' for status, count in sorted(counts.items()))
+        self.stdout.write(self.style.SUCCESS(f'Resume text backfill complete ({summary or "nothing to do"})'))
+
+    def walk(self, path):
+        try:
+            directories, filenames = default_storage.listdir(path)
+        except FileNotFoundError:
+            return
+        for filename in filenames:
+            yield f'{path}/{filename}'
+        for directory in directories:
+            yield from self.walk(f'{path}/{directory}')
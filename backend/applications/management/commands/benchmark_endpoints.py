@@ -0,0 +1,243 @@
+import io
+import json
+import math
+import platform
+import subprocess
+import time
+import tracemalloc
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications.models import Activity, Application, StatusHistory
+from users.models import User
+from veridia.instrumentation import QueryTimer
+
+# (name, user, path); ``user`` is "admin" or "applicant"
+ENDPOINTS = [
+    ('admin-applications', 'admin', '/api/v1/admin/applications/'),
+    ('admin-applications-search', 'admin', '/api/v1/admin/applications/?search=python'),
+    ('admin-analytics', 'admin', '/api/v1/admin/analytics/'),
+    ('admin-dashboard-stats', 'admin', '/api/v1/admin/dashboard/stats/'),
+    ('applicant-dashboard-stats', 'applicant', '/api/v1/applicant/dashboard/stats/'),
+]
+
+# Fixed so that datasets generated on different days are identical
+DEFAULT_END_DATE = '2025-06-30'
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values``."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def git_revision():
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f'{revision}-dirty' if dirty else revision
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the dashboard and listing endpoints with the Django test client against a '
+        'generated dataset, reporting latency percentiles, SQL queries, SQL time, peak memory '
+        'and response size'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per endpoint (default: 50)')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per endpoint first (default: 5)')
+        parser.add_argument(
+            '--memory-iterations',
+            type=int,
+            default=5,
+            help='Requests per endpoint traced with tracemalloc, in a separate pass so tracing '
+                 'does not skew the latencies (default: 5)',
+        )
+        parser.add_argument(
+            '--endpoint',
+            action='append',
+            choices=[name for name, _, _ in ENDPOINTS],
+            help='Only benchmark this endpoint (repeatable)',
+        )
+        parser.add_argument('--applicants', type=int, default=5000, help='Generated applicants (default: 5000)')
+        parser.add_argument('--applications', type=int, default=20000, help='Generated applications (default: 20000)')
+        parser.add_argument('--seed', type=int, default=42, help='Dataset seed (default: 42)')
+        parser.add_argument(
+            '--end-date',
+            default=DEFAULT_END_DATE,
+            help=f'Last day of the generated history (default: {DEFAULT_END_DATE})',
+        )
+        parser.add_argument(
+            '--keepdb',
+            action='store_true',
+            help='Keep the test database and reuse its dataset on the next run',
+        )
+        parser.add_argument(
+            '--existing-db',
+            action='store_true',
+            help='Benchmark the configured database as is instead of a generated test database',
+        )
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare']) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Cannot read {options["compare"]}: {e}')
+
+        setup_test_environment()
+        old_name = None
+        try:
+            if not options['existing_db']:
+                old_name = connection.settings_dict['NAME']
+                connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+                self.prepare_dataset(options)
+            results = self.run_benchmarks(options)
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        self.report(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+    def prepare_dataset(self, options):
+        if Application.objects.exists():
+            self.stdout.write('Reusing the dataset of the kept test database')
+            return
+        self.stdout.write(
+            f'Generating {options["applicants"]} applicants and {options["applications"]} applications...'
+        )
+        started = time.perf_counter()
+        call_command(
+            'generate_load_data',
+            f'--end-date={options["end_date"]}',
+            seed=options['seed'],
+            applicants=options['applicants'],
+            applications=options['applications'],
+            stdout=self.stdout if options['verbosity'] > 1 else io.StringIO(),
+        )
+        self.stdout.write(f'Dataset generated in {time.perf_counter() - started:.1f}s')
+
+    def clients(self):
+        admin = User.objects.filter(user_type='admin', is_active=True).order_by('id').first()
+        # The busiest applicant is the worst case for the applicant dashboard
+        applicant = (
+            User.objects.filter(user_type='applicant').annotate(n=Count('applications'))
+            .order_by('-n', 'id').first()
+        )
+        if admin is None or applicant is None:
+            raise CommandError('The database needs at least one admin and one applicant')
+        return {
+            role: Client(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+            for role, user in (('admin', admin), ('applicant', applicant))
+        }
+
+    def run_benchmarks(self, options):
+        clients = self.clients()
+        endpoints = [e for e in ENDPOINTS if not options['endpoint'] or e[0] in options['endpoint']]
+        results = {
+            'meta': {
+                'revision': git_revision(),
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'iterations': options['iterations'],
+                'dataset': {
+                    'seed': None if options['existing_db'] else options['seed'],
+                    'end_date': None if options['existing_db'] else options['end_date'],
+                    'applications': Application.objects.count(),
+                    'status_history': StatusHistory.objects.count(),
+                    'activities': Activity.objects.count(),
+                },
+            },
+            'endpoints': {},
+        }
+
+        for name, role, path in endpoints:
+            client = clients[role]
+            for _ in range(options['warmup']):
+                client.get(path)
+
+            latencies, queries, sql_seconds = [], [], []
+            for _ in range(options['iterations']):
+                timer = QueryTimer()
+                with connection.execute_wrapper(timer):
+                    started = time.perf_counter()
+                    response = client.get(path)
+                    latencies.append(time.perf_counter() - started)
+                queries.append(timer.count)
+                sql_seconds.append(timer.seconds)
+                if response.status_code != 200:
+                    raise CommandError(f'{name}: {path} returned {response.status_code}')
+
+            peak = 0
+            tracemalloc.start()
+            try:
+                for _ in range(options['memory_iterations']):
+                    tracemalloc.reset_peak()
+                    client.get(path)
+                    peak = max(peak, tracemalloc.get_traced_memory()[1])
+            finally:
+                tracemalloc.stop()
+
+            results['endpoints'][name] = {
+                'path': path,
+                'p50_ms': percentile(latencies, 50) * 1000,
+                'p95_ms': percentile(latencies, 95) * 1000,
+                'p99_ms': percentile(latencies, 99) * 1000,
+                'mean_ms': sum(latencies) / len(latencies) * 1000,
+                'queries': max(queries),
+                'sql_ms': sum(sql_seconds) / len(sql_seconds) * 1000,
+                'peak_memory_kb': peak / 1024,
+                'response_bytes': len(response.content),
+            }
+        return results
+
+    def report(self, results, baseline=None):
+        meta = results['meta']
+        self.stdout.write(
+            f'\nRevision {meta["revision"]} on {meta["database"]}, '
+            f'{meta["dataset"]["applications"]} applications, {meta["iterations"]} iterations'
+        )
+        columns = ('p50_ms', 'p95_ms', 'p99_ms', 'queries', 'sql_ms', 'peak_memory_kb', 'response_bytes')
+        self.stdout.write(f'{"endpoint":<28}' + ''.join(f'{column:>16}' for column in columns))
+        for name, metrics in results['endpoints'].items():
+            self.stdout.write(f'{name:<28}' + ''.join(
+                f'{metrics[column]:>16,.1f}' if isinstance(metrics[column], float) else f'{metrics[column]:>16,}'
+                for column in columns
+            ))
+            previous = (baseline or {}).get('endpoints', {}).get(name)
+            if previous:
+                self.stdout.write(f'{"  vs " + str(baseline["meta"].get("revision")):<28}' + ''.join(
+                    f'{self.change(previous[column], metrics[column]):>16}' for column in columns
+                ))
+        if baseline and baseline['meta'].get('dataset') != meta['dataset']:
+            self.stdout.write(self.style.WARNING('The baseline was measured on a different dataset'))
+
+    def change(self, before, after):
+        if not before:
+            return '-'
+        return f'{(after - before) / before * 100:+.1f}%'
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from applications.models import Application, ApplicationSkill
+from applications.skills import index_application_skills
+
+
+class Command(BaseCommand):
+    help = 'Backfill the normalized skill index from Application.skills'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Number of applications indexed per transaction (default: 2000)',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Drop all existing postings before indexing',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+
+        if options['clear']:
+            self.stdout.write(self.style.WARNING('Clearing existing skill postings...'))
+            ApplicationSkill.objects.all().delete()
+
+        total = 0
+        chunk = []
+        rows = Application.objects.order_by('id').values_list('id', 'skills').iterator(chunk_size=chunk_size)
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                total += self.index_chunk(chunk)
+                chunk = []
+        if chunk:
+            total += self.index_chunk(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed skills for {total} applications'))
+
+    def index_chunk(self, chunk):
+        with transaction.atomic():
+            index_application_skills(chunk)
+        self.stdout.write(f'  ... indexed up to application {chunk[-1][0]}')
+        return len(chunk)
@@ -0,0 +1,171 @@
+import os
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from applications.models import Application, ResumeBlob, ResumeUpload
+from applications.resume_text import remove_texts
+from applications.resumes import BLOB_PREFIX, acquire_resume
+from applications.uploads import discard_upload
+
+DELETE_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired upload sessions, resume blobs nothing references, '
+        'and blob or partial upload files without a database row'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-minutes',
+            type=int,
+            default=60,
+            help='Only delete blobs and files older than this, so in-flight uploads are kept (default: 60)',
+        )
+        parser.add_argument(
+            '--adopt-legacy',
+            action='store_true',
+            help='First move resumes uploaded before content-addressed storage into shared blobs',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would be deleted without deleting anything',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['grace_minutes'])
+        dry_run = options['dry_run']
+
+        if options['adopt_legacy'] and not dry_run:
+            self.adopt_legacy()
+
+        sessions = self.delete_expired_uploads(dry_run)
+        self.stdout.write(f'Expired upload sessions deleted: {sessions}')
+
+        fixed = self.reconcile_refcounts(dry_run)
+        self.stdout.write(f'Refcounts corrected: {fixed}')
+
+        blobs, freed = self.delete_unreferenced(cutoff, dry_run)
+        self.stdout.write(f'Unreferenced blobs deleted: {blobs} ({freed / 1024 / 1024:.1f} MB)')
+
+        files = self.delete_orphan_files(cutoff, dry_run)
+        self.stdout.write(f'Orphaned blob files deleted: {files}')
+
+        partials = self.delete_orphan_partials(cutoff, dry_run)
+        self.stdout.write(f'Orphaned partial uploads deleted: {partials}')
+
+        message = 'Dry run, nothing deleted' if dry_run else 'Resume garbage collection complete'
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def delete_expired_uploads(self, dry_run):
+        expired = ResumeUpload.objects.filter(expires_at__lte=timezone.now())
+        if dry_run:
+            return expired.count()
+        deleted = 0
+        for upload in list(expired):
+            discard_upload(upload)
+            deleted += 1
+        return deleted
+
+    def reconcile_refcounts(self, dry_run):
+        """Reset refcounts that drifted, e.g. after raw bulk deletes of applications."""
+        blobs = ResumeBlob.objects.annotate(
+            applications_count=Count('applications', distinct=True),
+            uploads_count=Count('uploads', distinct=True),
+        )
+        drifted = [
+            (blob_id, applications_count + uploads_count)
+            for blob_id, refcount, applications_count, uploads_count
+            in blobs.values_list('id', 'refcount', 'applications_count', 'uploads_count').iterator()
+            if refcount != applications_count + uploads_count
+        ]
+        if not dry_run:
+            for blob_id, actual in drifted:
+                ResumeBlob.objects.filter(pk=blob_id).update(refcount=actual)
+        return len(drifted)
+
+    def delete_unreferenced(self, cutoff, dry_run):
+        deleted = freed = 0
+        while True:
+            # A dry run deletes nothing, so it has to page through the candidates
+            offset = deleted if dry_run else 0
+            with transaction.atomic():
+                # Locked so a concurrent upload of the same content waits, then stores it anew
+                blobs = list(
+                    ResumeBlob.objects.select_for_update()
+                    .filter(refcount=0, created_at__lt=cutoff, applications__isnull=True, uploads__isnull=True)
+                    .order_by('id')[offset:offset + DELETE_BATCH_SIZE]
+                )
+                if not blobs:
+                    break
+                if not dry_run:
+                    # Files go before the rows: a rollback leaves a row without a file, never the reverse
+                    for blob in blobs:
+                        default_storage.delete(blob.file.name)
+                    ResumeBlob.objects.filter(pk__in=[blob.pk for blob in blobs]).delete()
+                    remove_texts([blob.file.name for blob in blobs])
+            deleted += len(blobs)
+            freed += sum(blob.size for blob in blobs)
+        return deleted, freed
+
+    def delete_orphan_files(self, cutoff, dry_run):
+        deleted = 0
+        try:
+            directories, _ = default_storage.listdir(BLOB_PREFIX)
+        except FileNotFoundError:
+            return 0
+        for directory in directories:
+            path = f'{BLOB_PREFIX}/{directory}'
+            names = [f'{path}/{filename}' for filename in default_storage.listdir(path)[1]]
+            known = set(ResumeBlob.objects.filter(file__in=names).values_list('file', flat=True))
+            for name in names:
+                if name in known or default_storage.get_modified_time(name) >= cutoff:
+                    continue
+                if not dry_run:
+                    default_storage.delete(name)
+                deleted += 1
+        return deleted
+
+    def delete_orphan_partials(self, cutoff, dry_run):
+        try:
+            filenames = os.listdir(settings.RESUME_UPLOAD_DIR)
+        except FileNotFoundError:
+            return 0
+        known = {f'{pk}.part' for pk in ResumeUpload.objects.values_list('pk', flat=True)}
+        deleted = 0
+        for filename in filenames:
+            path = os.path.join(settings.RESUME_UPLOAD_DIR, filename)
+            modified = datetime.fromtimestamp(os.path.getmtime(path), dt_timezone.utc)
+            if filename in known or modified >= cutoff:
+                continue
+            if not dry_run:
+                os.remove(path)
+            deleted += 1
+        return deleted
+
+    def adopt_legacy(self):
+        adopted = missing = 0
+        legacy = (
+            Application.objects.filter(resume_blob__isnull=True).exclude(resume='')
+            .order_by('id').values_list('id', 'resume')
+        )
+        # Materialized: the loop rewrites the rows being read
+        for application_id, name in list(legacy):
+            if not default_storage.exists(name):
+                missing += 1
+                continue
+            with transaction.atomic(), default_storage.open(name) as file:
+                blob = acquire_resume(file)
+                Application.objects.filter(pk=application_id).update(resume=blob.file.name, resume_blob=blob)
+            if blob.file.name != name and not Application.objects.filter(resume=name).exists():
+                default_storage.delete(name)
+            adopted += 1
+        self.stdout.write(f'Legacy resumes adopted: {adopted} ({missing} missing from storage)')
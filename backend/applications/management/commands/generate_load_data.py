@@ -0,0 +1,79 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.catalog import invalidate_catalog
+from applications.counters import compute_rollups, rebuild_counters, replace_rollups
+from applications.loadgen import LoadDataGenerator, clear_data
+from applications.models import Application, DailyApplicationRollup, StatusCounter
+from applications.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible synthetic dataset for scale and performance testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument('--departments', type=int, default=12, help='Number of departments (default: 12)')
+        parser.add_argument('--positions', type=int, default=150, help='Number of positions (default: 150)')
+        parser.add_argument('--applicants', type=int, default=20000, help='Number of applicants (default: 20000)')
+        parser.add_argument(
+            '--applications',
+            type=int,
+            default=60000,
+            help='Number of applications (default: 60000). Each one produces 1-3 status history '
+                 'rows and activities, about 1.8 on average',
+        )
+        parser.add_argument('--admins', type=int, default=3, help='Number of admins changing statuses (default: 3)')
+        parser.add_argument('--years', type=int, default=3, help='Years of history to spread over (default: 3)')
+        parser.add_argument(
+            '--end-date',
+            type=date.fromisoformat,
+            help='Last day of generated history, YYYY-MM-DD (default: today). Fix it to get identical data across days',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Rows generated, inserted and committed together (default: 10000)',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete all departments, positions, applicants and applications first',
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            self.stdout.write(self.style.WARNING('Clearing existing data...'))
+            clear_data()
+
+        generator = LoadDataGenerator(
+            seed=options['seed'],
+            end_date=options['end_date'],
+            years=options['years'],
+            chunk_size=options['chunk_size'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(f'Generating data with seed {options["seed"]}...')
+        try:
+            counts = generator.generate(
+                departments=options['departments'],
+                positions=options['positions'],
+                applicants=options['applicants'],
+                applications=options['applications'],
+                admins=options['admins'],
+            )
+        except ValueError as e:
+            raise CommandError(f'{e} (use --clear)')
+
+        # Rows were bulk inserted without signals, rebuild the derived tables once
+        self.stdout.write('Rebuilding counters, rollups and search index...')
+        rebuild_counters(Application, StatusCounter)
+        replace_rollups(DailyApplicationRollup, compute_rollups(Application))
+        get_search_backend().rebuild()
+        invalidate_catalog()
+
+        self.stdout.write(self.style.SUCCESS('Load data generated:'))
+        for name, count in counts.items():
+            self.stdout.write(f'  - {name}: {count}')
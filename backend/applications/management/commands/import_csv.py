@@ -0,0 +1,65 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.importer import CSVImporter
+
+FILES = ('departments', 'positions', 'applicants', 'applications')
+
+
+class Command(BaseCommand):
+    help = 'Stream departments, positions, applicants and applications from CSV files into the database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir',
+            help='Directory containing departments.csv, positions.csv, applicants.csv and applications.csv',
+        )
+        for name in FILES:
+            parser.add_argument(f'--{name}', help=f'Path to the {name} CSV file (overrides --dir)')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Rows read, inserted and committed together (default: 5000)',
+        )
+        parser.add_argument(
+            '--password',
+            default='password123',
+            help='Password given to every imported user (default: password123)',
+        )
+        parser.add_argument(
+            '--no-history',
+            action='store_true',
+            help='Skip the "Application submitted" status history and activity rows',
+        )
+
+    def handle(self, *args, **options):
+        paths = {}
+        for name in FILES:
+            path = options[name]
+            if path is None and options['dir']:
+                path = os.path.join(options['dir'], f'{name}.csv')
+                if not os.path.exists(path):
+                    continue
+            if path is not None:
+                if not os.path.exists(path):
+                    raise CommandError(f'CSV file not found: {path}')
+                paths[name] = path
+        if not paths:
+            raise CommandError('Nothing to import, pass --dir or at least one CSV file')
+
+        importer = CSVImporter(
+            chunk_size=options['chunk_size'],
+            default_password=options['password'],
+            with_history=not options['no_history'],
+            log=self.stdout.write,
+        )
+        for name in FILES:
+            if name in paths:
+                self.stdout.write(f'Importing {name} from {paths[name]}...')
+                result = getattr(importer, f'import_{name}')(paths[name])
+                self.stdout.write(self.style.SUCCESS(
+                    f'{name}: {result["created"]} created, {result["skipped"]} skipped '
+                    f'in {result["seconds"]:.2f}s ({result["rows_per_second"]:,.0f} rows/s)'
+                ))
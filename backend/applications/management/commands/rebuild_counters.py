@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from applications.counters import rebuild_counters
+from applications.models import Application, StatusCounter
+
+
+class Command(BaseCommand):
+    help = 'Recompute the dashboard status counters from the applications table'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Rebuilding status counters...')
+        drifted = rebuild_counters(Application, StatusCounter)
+        if drifted:
+            self.stdout.write(self.style.WARNING(f'Corrected {drifted} drifted counter(s)'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Status counters rebuilt ({StatusCounter.objects.count()} rows)'
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from applications.models import Application
+from applications.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for applications'
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Rebuilding search index ({connection.vendor})...')
+        with transaction.atomic():
+            get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {Application.objects.count()} applications'
+        ))
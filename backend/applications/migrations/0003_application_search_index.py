@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from applications.search import get_search_backend
+
+    backend = get_search_backend(schema_editor.connection.vendor)
+    backend.install(schema_editor)
+    backend.rebuild()
+
+
+def uninstall_search_index(apps, schema_editor):
+    from applications.search import get_search_backend
+
+    get_search_backend(schema_editor.connection.vendor).uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_applied_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0003_application_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'db_table': 'skills',
+            },
+        ),
+        migrations.CreateModel(
+            name='ApplicationSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_postings', to='applications.application')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='applications.skill')),
+            ],
+            options={
+                'db_table': 'application_skills',
+                'constraints': [models.UniqueConstraint(fields=('skill', 'application'), name='application_skills_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:20
+
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    from applications.counters import rebuild_counters
+
+    rebuild_counters(
+        apps.get_model('applications', 'Application'),
+        apps.get_model('applications', 'StatusCounter'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_skill_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50)),
+                ('department', models.CharField(blank=True, default='', max_length=100)),
+                ('status', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'status_counters',
+                'constraints': [models.UniqueConstraint(fields=('scope', 'department', 'status'), name='status_counters_unique')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
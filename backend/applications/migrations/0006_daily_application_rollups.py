@@ -0,0 +1,38 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:21
+
+from django.db import migrations, models
+
+
+def populate_rollups(apps, schema_editor):
+    from applications.counters import compute_rollups, replace_rollups
+
+    replace_rollups(
+        apps.get_model('applications', 'DailyApplicationRollup'),
+        compute_rollups(apps.get_model('applications', 'Application')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_status_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyApplicationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('department', models.CharField(max_length=100)),
+                ('position', models.CharField(max_length=200)),
+                ('status', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'daily_application_rollups',
+                'constraints': [models.UniqueConstraint(fields=('day', 'department', 'position', 'status'), name='daily_application_rollups_unique')],
+            },
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:51
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def install_resume_index(apps, schema_editor):
+    from applications.search import get_resume_index
+
+    get_resume_index(schema_editor.connection.vendor).install(schema_editor)
+
+
+def uninstall_resume_index(apps, schema_editor):
+    from applications.search import get_resume_index
+
+    get_resume_index(schema_editor.connection.vendor).uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_resume_uploads'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('text', models.TextField(blank=True, default='')),
+                ('status', models.CharField(choices=[('extracted', 'Extracted'), ('empty', 'Empty'), ('unsupported', 'Unsupported'), ('failed', 'Failed')], max_length=20)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('extracted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'resume_texts',
+            },
+        ),
+        migrations.RunPython(install_resume_index, uninstall_resume_index),
+    ]
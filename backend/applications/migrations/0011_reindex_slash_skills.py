@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-18 01:02
+
+from django.db import migrations
+
+
+def reindex_slash_skills(apps, schema_editor):
+    # "/" no longer separates skills; re-parse the applications it split
+    from applications.skills import index_application_skills
+
+    Application = apps.get_model('applications', 'Application')
+    rows = list(Application.objects.filter(skills__contains='/').values_list('id', 'skills'))
+    for start in range(0, len(rows), 2000):
+        index_application_skills(rows[start:start + 2000])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0010_application_hr_digested_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex_slash_skills, migrations.RunPython.noop),
+    ]
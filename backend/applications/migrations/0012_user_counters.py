@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-18 01:20
+
+from django.db import migrations
+
+
+def populate_counters(apps, schema_editor):
+    # Adds the users scope next to the application scopes
+    from applications.counters import rebuild_counters
+
+    rebuild_counters(
+        apps.get_model('applications', 'Application'),
+        apps.get_model('applications', 'StatusCounter'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0011_reindex_slash_skills'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
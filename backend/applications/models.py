@@ -1,4 +1,6 @@
-from django.db import models
+import uuid
+
+from django.db import models, router, transaction
 from django.utils import timezone
 from users.models import User
 
@@ -31,6 +33,111 @@ class Position(models.Model):
         db_table = 'positions'
 
 
+class ResumeBlob(models.Model):
+    """
+    A resume file stored once per distinct content, named by its SHA-256.
+
+    ``refcount`` is the number of applications and finalized uploads pointing
+    at the blob; blobs that drop to zero are deleted by ``gc_resumes``.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(max_length=255)
+    size = models.BigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.refcount} refs)"
+
+    class Meta:
+        db_table = 'resume_blobs'
+
+
+class ResumeText(models.Model):
+    """
+    Text extracted from a resume file, keyed by the file's storage name.
+
+    Blob names are content hashes, so each distinct resume is parsed once.
+    The full-text index over ``text`` is maintained by ``search.get_resume_index``.
+    """
+    STATUS_CHOICES = [
+        ('extracted', 'Extracted'),
+        ('empty', 'Empty'),
+        ('unsupported', 'Unsupported'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=255, unique=True)
+    text = models.TextField(blank=True, default='')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    error = models.TextField(null=True, blank=True)
+    extracted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+    class Meta:
+        db_table = 'resume_texts'
+
+
+class ResumeUpload(models.Model):
+    """
+    A chunked, resumable resume upload session.
+
+    Chunks are appended to a partial file until ``received`` reaches
+    ``size``; finalizing stores the file as a ``ResumeBlob``, which an
+    application then takes over by referencing the session.
+    """
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resume_uploads')
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    blob = models.ForeignKey(
+        ResumeBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='uploads'
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+    class Meta:
+        db_table = 'resume_uploads'
+
+
+# Application fields the status counters and daily rollups are keyed on
+COUNTED_FIELDS = ('applicant_id', 'applied_date', 'department', 'position', 'status')
+COUNTED_FIELD_NAMES = set(COUNTED_FIELDS) | {'applicant'}
+
+
+class ApplicationQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        Update the rows and, when a counted field changes, move them between
+        the status counters and daily rollups in the same transaction.
+        """
+        from . import counters
+
+        if not COUNTED_FIELD_NAMES.intersection(kwargs):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            old = {
+                pk: tuple(values)
+                for pk, *values in self.select_for_update().values_list('pk', *COUNTED_FIELDS)
+            }
+            rows = super().update(**kwargs)
+            new = self.model._base_manager.using(self.db).filter(pk__in=old).values_list('pk', *COUNTED_FIELDS)
+            counters.applications_changed([(old[pk], tuple(values)) for pk, *values in new])
+        return rows
+
+
 class Application(models.Model):
     STATUS_CHOICES = [
         ('under-review', 'Under Review'),
@@ -57,18 +164,90 @@ class Application(models.Model):
     cover_letter = models.TextField(null=True, blank=True)
     referral = models.CharField(max_length=100, null=True, blank=True)
     resume = models.FileField(upload_to='resumes/')
+    # Set for resumes stored by content; ``resume`` then names the blob's file
+    resume_blob = models.ForeignKey(
+        ResumeBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='applications'
+    )
     status = models.CharField(max_length=50, choices=STATUS_CHOICES, default='under-review')
     interview_date = models.DateTimeField(null=True, blank=True)
     notes = models.TextField(null=True, blank=True)
     applied_date = models.DateTimeField(default=timezone.now)
     last_updated = models.DateTimeField(auto_now=True)
+    # When the HR digest claimed the application; null until it has been announced
+    hr_digested_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = ApplicationQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.applicant.full_name} - {self.position}"
 
+    def save(self, *args, **kwargs):
+        """
+        Save the application and, when a counted field may have changed, move it
+        between the status counters and daily rollups in the same transaction.
+        """
+        from . import counters
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not COUNTED_FIELD_NAMES.intersection(update_fields):
+            return super().save(*args, **kwargs)
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            old = None
+            if self.pk is not None:
+                old = (
+                    type(self)._base_manager.using(using).select_for_update()
+                    .filter(pk=self.pk).values_list(*COUNTED_FIELDS).first()
+                )
+            super().save(*args, **kwargs)
+            if old is None:
+                counters.application_added(self)
+                return
+            saved = set(COUNTED_FIELDS if update_fields is None else update_fields)
+            if 'applicant' in saved:
+                saved.add('applicant_id')
+            new = tuple(
+                getattr(self, name) if name in saved else value
+                for name, value in zip(COUNTED_FIELDS, old)
+            )
+            counters.application_changed(old, new)
+
     class Meta:
         db_table = 'applications'
         ordering = ['-applied_date']
+        indexes = [
+            # Keyset pagination on (applied_date, id), see ApplicationPagination
+            models.Index(fields=['-applied_date', '-id'], name='applications_applied_id_idx'),
+            # The few applications still waiting for the HR digest
+            models.Index(
+                fields=['id'], condition=models.Q(hr_digested_at__isnull=True), name='applications_undigested_idx'
+            ),
+        ]
+
+
+class Skill(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        db_table = 'skills'
+
+
+class ApplicationSkill(models.Model):
+    """Posting in the skill index: one row per (skill, application) pair."""
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='postings')
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='skill_postings')
+
+    def __str__(self):
+        return f"{self.skill} - {self.application_id}"
+
+    class Meta:
+        db_table = 'application_skills'
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'application'], name='application_skills_unique'),
+        ]
 
 
 class StatusHistory(models.Model):
@@ -86,6 +265,54 @@ class StatusHistory(models.Model):
         ordering = ['-changed_at']
 
 
+class StatusCounter(models.Model):
+    """
+    Number of applications per (scope, department, status).
+
+    The ``global`` scope is broken down by department; per-applicant scopes
+    (``applicant:<id>``) use an empty department. The ``users`` scope counts
+    users instead, with the ``user_type`` as status. Maintained incrementally
+    by ``applications.counters`` and reconciled by ``rebuild_counters``.
+    """
+    scope = models.CharField(max_length=50)
+    department = models.CharField(max_length=100, blank=True, default='')
+    status = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.scope} / {self.department or '-'} / {self.status}: {self.count}"
+
+    class Meta:
+        db_table = 'status_counters'
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'department', 'status'], name='status_counters_unique'),
+        ]
+
+
+class DailyApplicationRollup(models.Model):
+    """
+    Number of applications per (applied day, department, position, status).
+
+    Backs ``admin_analytics``; maintained together with ``StatusCounter`` and
+    rebuilt by ``rebuild_rollups``.
+    """
+    day = models.DateField()
+    department = models.CharField(max_length=100)
+    position = models.CharField(max_length=200)
+    status = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day} / {self.department} / {self.position} / {self.status}: {self.count}"
+
+    class Meta:
+        db_table = 'daily_application_rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'department', 'position', 'status'],
+                                    name='daily_application_rollups_unique'),
+        ]
+
+
 class Activity(models.Model):
     action = models.CharField(max_length=100)
     description = models.TextField()
@@ -0,0 +1,127 @@
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class ApplicationPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    Passing ``?cursor=`` (empty for the first page) switches to keyset
+    pagination on ``(applied_date, id)``, which is backed by the composite
+    index on ``applications`` and costs the same at any depth. In cursor
+    mode the total is only counted when ``?include_count=true`` is given.
+
+    Cursor pages are always newest first: ``?ordering=`` is rejected with a
+    400, and ``?search=`` still filters but its results aren't ranked by
+    relevance. Use page numbers for either.
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'include_count'
+    invalid_cursor_message = 'Invalid cursor'
+    cursor_ordering_message = 'Cursor pagination is always ordered by applied_date; use ?page= to change the ordering'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        if request.query_params.get(OrderingFilter.ordering_param):
+            raise ValidationError({OrderingFilter.ordering_param: [self.cursor_ordering_message]})
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() in ('1', 'true'):
+            self.count = queryset.order_by().count()
+
+        if reverse:
+            queryset = queryset.order_by('applied_date', 'id')
+            if position:
+                applied_date, pk = position
+                queryset = queryset.filter(
+                    Q(applied_date__gt=applied_date) | Q(applied_date=applied_date, id__gt=pk)
+                )
+        else:
+            queryset = queryset.order_by('-applied_date', '-id')
+            if position:
+                applied_date, pk = position
+                queryset = queryset.filter(
+                    Q(applied_date__lt=applied_date) | Q(applied_date=applied_date, id__lt=pk)
+                )
+
+        # Fetch one extra row to find out whether there is another page
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        self.next_position = self._position(results[-1]) if has_next and results else None
+        self.previous_position = self._position(results[0]) if has_previous and results else None
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def decode_cursor(self, request):
+        """Return ``((applied_date, id), reverse)`` or ``(None, False)`` for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            querystring = b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            applied_date = parse_datetime(tokens['d'][0])
+            pk = int(tokens['i'][0])
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if applied_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (applied_date, pk), reverse
+
+    def encode_cursor(self, position, reverse):
+        applied_date, pk = position
+        tokens = {'d': applied_date.isoformat(), 'i': pk}
+        if reverse:
+            tokens['r'] = 1
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode('ascii')).decode('ascii')
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def _position(self, obj):
+        return obj.applied_date, obj.pk
@@ -0,0 +1,63 @@
+"""
+Resume text extraction pipeline.
+
+Each new resume blob queues ``tasks.extract_resume_texts`` through the
+outbox, so parsing runs on the Celery workers (a prefork process pool) and
+never in a web worker. Without a broker, when tasks run eagerly inside the
+request, the task does nothing and the files wait for the backfill.
+``backfill_resume_text`` runs existing files through
+a ``ProcessPoolExecutor``. Results are stored as ``ResumeText`` rows and
+fed to the resume index, which ``?resume_text=`` searches.
+"""
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .extraction import extract_text
+from .models import ResumeText
+from .search import get_resume_index
+
+# Files handed to a pool process at a time
+POOL_CHUNK_SIZE = 4
+
+
+def extraction_source(name):
+    """Local path of stored file ``name``, or its bytes when the storage has no paths."""
+    try:
+        return default_storage.path(name)
+    except NotImplementedError:
+        with default_storage.open(name, 'rb') as file:
+            return file.read()
+
+
+def extract_in_pool(pool, names):
+    """Extract ``names`` on ``pool``; returns ``extract_text`` results in order."""
+    sources = [extraction_source(name) for name in names]
+    return list(pool.map(extract_text, names, sources, chunksize=POOL_CHUNK_SIZE))
+
+
+def store_results(results):
+    """Save ``extract_text`` results and (re)index them; returns the number stored."""
+    now = timezone.now()
+    rows = [
+        ResumeText(name=name, status=status, text=text, error=error, extracted_at=now)
+        for name, status, text, error in results
+    ]
+    if not rows:
+        return 0
+    with transaction.atomic():
+        ResumeText.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=['name'],
+            update_fields=['text', 'status', 'error', 'extracted_at'],
+        )
+        text_ids = ResumeText.objects.filter(name__in=[row.name for row in rows]).values_list('id', flat=True)
+        get_resume_index().index(text_ids)
+    return len(rows)
+
+
+def remove_texts(names):
+    """Drop the extracted text of files that were deleted."""
+    text_ids = list(ResumeText.objects.filter(name__in=names).values_list('id', flat=True))
+    if text_ids:
+        ResumeText.objects.filter(id__in=text_ids).delete()
+        get_resume_index().index(text_ids)
@@ -0,0 +1,114 @@
+"""
+Content-addressed resume storage.
+
+Uploads are hashed (SHA-256) chunk by chunk as they stream in, by the upload
+handlers below, which ``FILE_UPLOAD_HANDLERS`` installs in place of Django's
+defaults. ``acquire_resume`` stores each distinct content once under
+``resumes/sha256/<2 hex>/<hash><ext>`` and counts the applications that
+point at it; ``release_resume`` drops a reference. Both must run inside the
+transaction that changes the application. Unreferenced blobs, and files
+left behind by rolled back uploads, are removed by ``gc_resumes``.
+"""
+import hashlib
+import os
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from notifications import outbox
+
+from .models import ResumeBlob
+from .tasks import extract_resume_texts
+
+BLOB_PREFIX = 'resumes/sha256'
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+class HashingUploadMixin:
+    """Computes ``sha256`` of an uploaded file while its chunks are received."""
+
+    def new_file(self, *args, **kwargs):
+        self.sha256 = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.sha256 = self.sha256.hexdigest()
+        return uploaded
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    pass
+
+
+def file_sha256(file):
+    """Return the SHA-256 of ``file``, computed during upload when possible."""
+    digest = getattr(file, 'sha256', None)
+    if digest:
+        return digest
+    sha256 = hashlib.sha256()
+    for chunk in file.chunks(HASH_CHUNK_SIZE):
+        sha256.update(chunk)
+    file.seek(0)
+    return sha256.hexdigest()
+
+
+def blob_name(digest, filename):
+    extension = os.path.splitext(filename or '')[1].lower()[:10]
+    return f'{BLOB_PREFIX}/{digest[:2]}/{digest}{extension}'
+
+
+def _write_blob_file(name, file):
+    if default_storage.exists(name):
+        if default_storage.size(name) == file.size:
+            # Same content already on disk (e.g. from a rolled back upload)
+            return name
+        default_storage.delete(name)
+    return default_storage.save(name, file)
+
+
+def acquire_resume(file):
+    """Return the ``ResumeBlob`` holding ``file``'s content, storing it if new, with one more reference."""
+    digest = file_sha256(file)
+    if ResumeBlob.objects.filter(sha256=digest).update(refcount=F('refcount') + 1):
+        return ResumeBlob.objects.get(sha256=digest)
+    name = _write_blob_file(blob_name(digest, file.name), file)
+    try:
+        with transaction.atomic():
+            blob = ResumeBlob.objects.create(sha256=digest, file=name, size=file.size, refcount=1)
+            # New content: parse it for resume search on a Celery worker
+            outbox.enqueue(extract_resume_texts, [name])
+            return blob
+    except IntegrityError:
+        # Stored concurrently by another upload of the same content
+        ResumeBlob.objects.filter(sha256=digest).update(refcount=F('refcount') + 1)
+        return ResumeBlob.objects.get(sha256=digest)
+
+
+def release_resume(blob_id):
+    """Drop one reference to blob ``blob_id``; the file itself is removed by ``gc_resumes``."""
+    if blob_id is not None:
+        ResumeBlob.objects.filter(pk=blob_id, refcount__gt=0).update(refcount=F('refcount') - 1)
+
+
+def attach_resume(validated_data, instance=None):
+    """Replace an uploaded ``resume`` in serializer ``validated_data`` by a shared blob."""
+    file = validated_data.get('resume')
+    if not file or not hasattr(file, 'chunks'):
+        return
+    blob = acquire_resume(file)
+    validated_data['resume'] = blob.file.name
+    validated_data['resume_blob'] = blob
+    if instance is not None:
+        release_resume(instance.resume_blob_id)
@@ -0,0 +1,298 @@
+"""
+Full-text search over applications.
+
+PostgreSQL keeps a weighted ``tsvector`` in ``applications.search_vector``
+(GIN indexed). SQLite keeps an FTS5 shadow table ``applications_fts`` keyed
+by application id. Both are refreshed from signals whenever an application
+or its applicant is saved. Other databases fall back to ``icontains``.
+
+Text extracted from resumes has an index of its own, in the same two
+flavours (``resume_texts.search_vector`` / ``resume_texts_fts``), written by
+``resume_text.store_results`` and matched through ``applications.resume``.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TERMS = 8
+
+# SQLite limits the number of bound parameters per statement
+INDEX_CHUNK_SIZE = 500
+
+
+def tokenize(term):
+    """Split a free-text query into lowercase search terms."""
+    return TOKEN_RE.findall((term or '').lower())[:MAX_TERMS]
+
+
+class FallbackSearchBackend:
+    """Unindexed search used on databases without a native full-text engine."""
+    search_fields = ['applicant__first_name', 'applicant__last_name', 'applicant__email',
+                     'position', 'skills', 'cover_letter']
+
+    def install(self, schema_editor):
+        pass
+
+    def uninstall(self, schema_editor):
+        pass
+
+    def index(self, application_ids):
+        pass
+
+    def remove(self, application_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, terms):
+        for term in terms:
+            condition = Q()
+            for field in self.search_fields:
+                condition |= Q(**{f'{field}__icontains': term})
+            queryset = queryset.filter(condition)
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class PostgresSearchBackend:
+    document_sql = """
+        setweight(to_tsvector('simple', coalesce(u.first_name, '') || ' ' ||
+                  coalesce(u.last_name, '') || ' ' || coalesce(u.email, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(a.position, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(a.skills, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(a.cover_letter, '')), 'D')
+    """
+
+    def install(self, schema_editor):
+        schema_editor.execute('ALTER TABLE applications ADD COLUMN search_vector tsvector')
+        schema_editor.execute(
+            'CREATE INDEX applications_search_vector_idx ON applications USING gin (search_vector)'
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute('DROP INDEX IF EXISTS applications_search_vector_idx')
+        schema_editor.execute('ALTER TABLE applications DROP COLUMN IF EXISTS search_vector')
+
+    def index(self, application_ids):
+        application_ids = list(application_ids)
+        if not application_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE applications a SET search_vector = {self.document_sql} '
+                'FROM users u WHERE u.id = a.applicant_id AND a.id = ANY(%s)',
+                [application_ids]
+            )
+
+    def remove(self, application_ids):
+        # The vector lives on the application row and goes away with it
+        pass
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE applications a SET search_vector = {self.document_sql} '
+                'FROM users u WHERE u.id = a.applicant_id'
+            )
+
+    def search(self, queryset, terms):
+        query = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.filter(
+            RawSQL(
+                "\"applications\".\"search_vector\" @@ to_tsquery('simple', %s)",
+                [query], output_field=BooleanField()
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                "ts_rank_cd(\"applications\".\"search_vector\", to_tsquery('simple', %s))",
+                [query], output_field=FloatField()
+            )
+        )
+
+
+class SQLiteSearchBackend:
+    # Relative bm25 weights of the applicant, position, skills and cover_letter columns
+    column_weights = '10.0, 10.0, 5.0, 1.0'
+
+    def install(self, schema_editor):
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE applications_fts USING fts5('
+            'applicant, position, skills, cover_letter)'
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute('DROP TABLE IF EXISTS applications_fts')
+
+    def index(self, application_ids):
+        application_ids = list(application_ids)
+        with connection.cursor() as cursor:
+            for start in range(0, len(application_ids), INDEX_CHUNK_SIZE):
+                chunk = application_ids[start:start + INDEX_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f'DELETE FROM applications_fts WHERE rowid IN ({placeholders})', chunk
+                )
+                cursor.execute(
+                    self._insert_sql(f'WHERE a.id IN ({placeholders})'), chunk
+                )
+
+    def remove(self, application_ids):
+        application_ids = list(application_ids)
+        with connection.cursor() as cursor:
+            for start in range(0, len(application_ids), INDEX_CHUNK_SIZE):
+                chunk = application_ids[start:start + INDEX_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f'DELETE FROM applications_fts WHERE rowid IN ({placeholders})', chunk
+                )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM applications_fts')
+            cursor.execute(self._insert_sql(''))
+
+    def search(self, queryset, terms):
+        query = ' '.join(f'"{term}"*' for term in terms)
+        # Join the index instead of looking the rank up per row: the MATCH runs
+        # once and each hit is fetched from applications by primary key
+        return queryset.extra(
+            tables=['applications_fts'],
+            where=['applications_fts.rowid = "applications"."id"', 'applications_fts MATCH %s'],
+            params=[query],
+            # bm25() is lower-is-better; negate it so both engines rank descending
+            select={'search_rank': f'-bm25(applications_fts, {self.column_weights})'},
+        )
+
+    def _insert_sql(self, where):
+        return (
+            'INSERT INTO applications_fts (rowid, applicant, position, skills, cover_letter) '
+            "SELECT a.id, u.first_name || ' ' || u.last_name || ' ' || u.email, "
+            "coalesce(a.position, ''), coalesce(a.skills, ''), coalesce(a.cover_letter, '') "
+            f'FROM applications a JOIN users u ON u.id = a.applicant_id {where}'
+        )
+
+
+SEARCH_BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend(vendor=None):
+    """Return the search backend for the default (or given) database vendor."""
+    vendor = vendor or connection.vendor
+    return SEARCH_BACKENDS.get(vendor, FallbackSearchBackend)()
+
+
+class FallbackResumeIndex:
+    """Unindexed resume text search used on databases without a native full-text engine."""
+
+    def install(self, schema_editor):
+        pass
+
+    def uninstall(self, schema_editor):
+        pass
+
+    def index(self, text_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, terms):
+        from .models import ResumeText
+
+        for term in terms:
+            queryset = queryset.filter(
+                resume__in=ResumeText.objects.filter(text__icontains=term).values('name')
+            )
+        return queryset
+
+
+class PostgresResumeIndex:
+    def install(self, schema_editor):
+        schema_editor.execute('ALTER TABLE resume_texts ADD COLUMN search_vector tsvector')
+        schema_editor.execute(
+            'CREATE INDEX resume_texts_search_vector_idx ON resume_texts USING gin (search_vector)'
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute('DROP INDEX IF EXISTS resume_texts_search_vector_idx')
+        schema_editor.execute('ALTER TABLE resume_texts DROP COLUMN IF EXISTS search_vector')
+
+    def index(self, text_ids):
+        text_ids = list(text_ids)
+        if not text_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE resume_texts SET search_vector = to_tsvector('simple', text) WHERE id = ANY(%s)",
+                [text_ids]
+            )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE resume_texts SET search_vector = to_tsvector('simple', text)")
+
+    def search(self, queryset, terms):
+        query = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.filter(
+            RawSQL(
+                '"applications"."resume" IN (SELECT name FROM resume_texts '
+                "WHERE search_vector @@ to_tsquery('simple', %s))",
+                [query], output_field=BooleanField()
+            )
+        )
+
+
+class SQLiteResumeIndex:
+    def install(self, schema_editor):
+        schema_editor.execute('CREATE VIRTUAL TABLE resume_texts_fts USING fts5(text)')
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute('DROP TABLE IF EXISTS resume_texts_fts')
+
+    def index(self, text_ids):
+        """(Re)index rows ``text_ids``; ids whose row was deleted are dropped from the index."""
+        text_ids = list(text_ids)
+        with connection.cursor() as cursor:
+            for start in range(0, len(text_ids), INDEX_CHUNK_SIZE):
+                chunk = text_ids[start:start + INDEX_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f'DELETE FROM resume_texts_fts WHERE rowid IN ({placeholders})', chunk
+                )
+                cursor.execute(
+                    'INSERT INTO resume_texts_fts (rowid, text) '
+                    f'SELECT id, text FROM resume_texts WHERE id IN ({placeholders})', chunk
+                )
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM resume_texts_fts')
+            cursor.execute('INSERT INTO resume_texts_fts (rowid, text) SELECT id, text FROM resume_texts')
+
+    def search(self, queryset, terms):
+        query = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(
+            RawSQL(
+                '"applications"."resume" IN (SELECT name FROM resume_texts WHERE id IN '
+                '(SELECT rowid FROM resume_texts_fts WHERE resume_texts_fts MATCH %s))',
+                [query], output_field=BooleanField()
+            )
+        )
+
+
+RESUME_INDEXES = {
+    'postgresql': PostgresResumeIndex,
+    'sqlite': SQLiteResumeIndex,
+}
+
+
+def get_resume_index(vendor=None):
+    """Return the resume text index for the default (or given) database vendor."""
+    vendor = vendor or connection.vendor
+    return RESUME_INDEXES.get(vendor, FallbackResumeIndex)()
@@ -1,13 +1,31 @@
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Application, StatusHistory, Department, Position, Activity
-from users.serializers import UserSerializer
+from .models import Application, StatusHistory, Department, Position, Activity, ResumeUpload
+from .resumes import attach_resume
+from .uploads import take_upload
+from users.models import User
+from users.serializers import UserSerializer, UserSummarySerializer
 
 
 class ApplicationSerializer(serializers.ModelSerializer):
+    """
+    Full application representation.
+
+    Passing ``fields`` (and optionally ``expand``) returns a sparse
+    representation: only the listed fields are rendered, ``applicant`` is
+    reduced to a summary unless expanded, and ``status_history`` is only
+    rendered when listed or expanded.
+    """
     applicant = UserSerializer(read_only=True)
     resume_url = serializers.SerializerMethodField()
     status_history = serializers.SerializerMethodField()
 
+    # Columns shown by the dashboard table, selectable with ?fields=summary
+    SUMMARY_FIELDS = ['id', 'applicant', 'position', 'department', 'status',
+                      'applied_date', 'interview_date']
+    EXPANDABLE_FIELDS = ['applicant', 'status_history']
+
     class Meta:
         model = Application
         fields = ['id', 'applicant', 'position', 'department', 'experience',
@@ -19,29 +37,118 @@ class ApplicationSerializer(serializers.ModelSerializer):
                   'status_history']
         read_only_fields = ['id', 'applied_date', 'last_updated']
 
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is None:
+            return
+        expand = set(expand or ())
+        selected = set(fields) | expand
+        unknown = selected - set(self.fields) | expand - set(self.EXPANDABLE_FIELDS)
+        if unknown:
+            raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}')
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+        if 'applicant' in self.fields and 'applicant' not in expand:
+            self.fields['applicant'] = UserSummarySerializer(read_only=True)
+
+    @classmethod
+    def parse_field_selection(cls, fields_param, expand_param):
+        """
+        Parse ?fields= / ?expand= values into ``(fields, expand)``; fields is None
+        when not sparse. Unknown names raise a ValidationError listing the valid ones.
+        """
+        expand = [name for name in (expand_param or '').split(',') if name]
+        unknown = [name for name in expand if name not in cls.EXPANDABLE_FIELDS]
+        if unknown:
+            raise serializers.ValidationError({'expand': [
+                f'Unknown field(s): {", ".join(unknown)}. Valid fields: {", ".join(cls.EXPANDABLE_FIELDS)}'
+            ]})
+        if not fields_param:
+            return None, expand
+        fields = []
+        for name in fields_param.split(','):
+            if name == 'summary':
+                fields.extend(cls.SUMMARY_FIELDS)
+            elif name:
+                fields.append(name)
+        unknown = [name for name in fields if name not in cls.Meta.fields]
+        if unknown:
+            raise serializers.ValidationError({'fields': [
+                f'Unknown field(s): {", ".join(unknown)}. '
+                f'Valid fields: summary, {", ".join(cls.Meta.fields)}'
+            ]})
+        return fields, expand
+
+    @classmethod
+    def get_sparse_columns(cls, fields, expand):
+        """
+        Return ``(application_columns, applicant_columns)`` to load for a sparse
+        selection. ``applicant_columns`` is None when the applicant is not rendered.
+        """
+        model_fields = {f.name for f in Application._meta.concrete_fields}
+        # id and applied_date are always loaded, keyset pagination reads them
+        columns = {'id', 'applied_date'}
+        columns.update(name for name in fields if name in model_fields)
+        if 'resume_url' in fields:
+            columns.add('resume')
+        applicant_columns = None
+        if 'applicant' in fields or 'applicant' in expand:
+            serializer = UserSerializer if 'applicant' in expand else UserSummarySerializer
+            applicant_columns = [
+                name for name in serializer.Meta.fields
+                if name in {f.name for f in User._meta.concrete_fields}
+            ]
+            if 'profile_picture_srcset' in serializer.Meta.fields:
+                applicant_columns += ['profile_picture_sizes']
+        return sorted(columns), applicant_columns
+
+    def update(self, instance, validated_data):
+        attach_resume(validated_data, instance)
+        return super().update(instance, validated_data)
+
     def get_resume_url(self, obj):
+        # Authorized download view; browsers get a signed link from application-resume-link
         if obj.resume:
+            url = reverse('application-resume', args=[obj.pk])
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(obj.resume.url)
-            return obj.resume.url
+                return request.build_absolute_uri(url)
+            return url
         return None
 
     def get_status_history(self, obj):
-        history = obj.status_history.all()[:10]  # Last 10 status changes
+        # Last 10 status changes; served from the prefetch cache when the
+        # viewset's planned queryset was used
+        history = obj.status_history.all()[:10]
         return StatusHistorySerializer(history, many=True).data
 
 
 class ApplicationCreateSerializer(serializers.ModelSerializer):
+    # A finalized chunked upload, sent instead of a multipart ``resume``
+    resume_upload = serializers.PrimaryKeyRelatedField(
+        queryset=ResumeUpload.objects.filter(status='complete'), required=False, write_only=True
+    )
+
     class Meta:
         model = Application
         fields = ['position', 'department', 'experience', 'current_company',
                   'current_salary', 'expected_salary', 'notice_period',
                   'availability', 'education', 'university', 'graduation_year',
                   'skills', 'linkedin_url', 'portfolio_url', 'cover_letter',
-                  'referral', 'resume']
-    
+                  'referral', 'resume', 'resume_upload']
+        extra_kwargs = {'resume': {'required': False}}
+
+    def validate_resume_upload(self, value):
+        request = self.context.get('request')
+        if request is None or value.user_id != request.user.id or value.expires_at <= timezone.now():
+            raise serializers.ValidationError('Upload not found.')
+        return value
+
     def validate(self, data):
+        if ('resume' in data) == ('resume_upload' in data):
+            raise serializers.ValidationError({'resume': 'Provide either resume or resume_upload.'})
+
         # Convert empty strings to None for optional fields
         optional_fields = ['current_company', 'current_salary', 'expected_salary', 
                           'notice_period', 'availability', 'education', 'university',
@@ -54,6 +161,53 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         
         return data
 
+    def create(self, validated_data):
+        upload = validated_data.pop('resume_upload', None)
+        if upload is not None:
+            blob = take_upload(upload)
+            if blob is None:
+                raise serializers.ValidationError({'resume_upload': 'Upload was already used.'})
+            validated_data['resume'] = blob.file.name
+            validated_data['resume_blob'] = blob
+        else:
+            attach_resume(validated_data)
+        return super().create(validated_data)
+
+
+class ResumeUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ResumeUpload
+        fields = ['id', 'filename', 'size', 'received', 'status', 'expires_at']
+        read_only_fields = ['id', 'received', 'status', 'expires_at']
+
+
+class BulkStatusUpdateSerializer(serializers.Serializer):
+    MAX_APPLICATIONS = 5000
+    FILTER_FIELDS = ['status', 'department', 'position']
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False,
+        max_length=MAX_APPLICATIONS
+    )
+    filter = serializers.DictField(child=serializers.CharField(), required=False)
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+    comment = serializers.CharField(required=False, allow_blank=True, default='')
+    interview_date = serializers.DateTimeField(required=False, allow_null=True)
+    notify = serializers.BooleanField(required=False, default=True)
+
+    def validate_filter(self, value):
+        unknown = set(value) - set(self.FILTER_FIELDS)
+        if unknown:
+            raise serializers.ValidationError(f"Unsupported filter field(s): {', '.join(sorted(unknown))}")
+        if not value:
+            raise serializers.ValidationError('Filter must not be empty')
+        return value
+
+    def validate(self, data):
+        if ('ids' in data) == ('filter' in data):
+            raise serializers.ValidationError('Provide either ids or filter')
+        return data
+
 
 class StatusHistorySerializer(serializers.ModelSerializer):
     changed_by_name = serializers.SerializerMethodField()
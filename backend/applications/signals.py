@@ -0,0 +1,92 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from users.models import User
+from . import counters
+from .catalog import invalidate_catalog
+from .models import Application, Department, Position
+from .resumes import release_resume
+from .search import get_search_backend
+from .skills import index_application_skills
+
+# Application and user fields that are part of the application search document
+SEARCHABLE_APPLICATION_FIELDS = {'position', 'skills', 'cover_letter', 'applicant', 'applicant_id'}
+SEARCHABLE_USER_FIELDS = {'first_name', 'last_name', 'email'}
+
+
+@receiver(post_save, sender=Application)
+def index_application(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not SEARCHABLE_APPLICATION_FIELDS.intersection(update_fields):
+        return
+    get_search_backend().index([instance.pk])
+
+
+@receiver(post_save, sender=Application)
+def index_skills(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and 'skills' not in update_fields:
+        return
+    index_application_skills([(instance.pk, instance.skills)])
+
+
+@receiver(post_delete, sender=Application)
+def unindex_application(sender, instance, **kwargs):
+    get_search_backend().remove([instance.pk])
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    # Sent inside the deletion transaction, including cascades from User
+    counters.application_removed(instance)
+
+
+@receiver(post_delete, sender=Application)
+def release_application_resume(sender, instance, **kwargs):
+    release_resume(instance.resume_blob_id)
+
+
+@receiver(pre_save, sender=User)
+def remember_user_type(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._stored_user_type = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and 'user_type' not in update_fields:
+        return
+    instance._stored_user_type = User.objects.filter(pk=instance.pk).values_list('user_type', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def count_user(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.users_added([instance])
+    elif instance._stored_user_type is not None:
+        counters.user_changed(instance._stored_user_type, instance.user_type)
+
+
+@receiver(post_delete, sender=User)
+def uncount_user(sender, instance, **kwargs):
+    counters.user_removed(instance)
+
+
+@receiver(post_save, sender=User)
+def reindex_applicant_applications(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    if update_fields is not None and not SEARCHABLE_USER_FIELDS.intersection(update_fields):
+        return
+    application_ids = list(instance.applications.values_list('id', flat=True))
+    if application_ids:
+        get_search_backend().index(application_ids)
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+def invalidate_catalog_cache(sender, **kwargs):
+    invalidate_catalog()
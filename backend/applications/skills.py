@@ -0,0 +1,100 @@
+"""
+Normalized skill index.
+
+``Application.skills`` is free text ("Python, Kubernetes; AWS"). It is parsed
+into ``Skill`` rows and ``ApplicationSkill`` postings so skill filters are
+answered from the (skill, application) index instead of substring scans.
+"""
+import re
+
+from django.db.models import Count
+
+from .models import ApplicationSkill, Skill
+
+# Not '/': it is part of skills such as CI/CD, TCP/IP and PL/SQL
+SKILL_SEPARATORS_RE = re.compile(r'[,;|\n]+')
+WHITESPACE_RE = re.compile(r'\s+')
+MAX_SKILL_LENGTH = Skill._meta.get_field('name').max_length
+
+
+def normalize_skill(name):
+    """Lowercase, trim and collapse whitespace in a skill name."""
+    name = WHITESPACE_RE.sub(' ', name).strip(' .').lower()
+    return name[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(text):
+    """Return the set of normalized skill names in a free-text skills field."""
+    if not text:
+        return set()
+    names = (normalize_skill(part) for part in SKILL_SEPARATORS_RE.split(text))
+    return {name for name in names if name}
+
+
+def get_skill_ids(names):
+    """Return ``{name: id}`` for ``names``, creating the skills that don't exist yet."""
+    names = set(names)
+    if not names:
+        return {}
+    skill_ids = dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = names - skill_ids.keys()
+    if missing:
+        Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+        skill_ids.update(Skill.objects.filter(name__in=missing).values_list('name', 'id'))
+    return skill_ids
+
+
+def index_application_skills(applications):
+    """
+    Bring the postings of ``applications`` in line with their ``skills`` text.
+
+    ``applications`` is an iterable of ``(application_id, skills_text)`` pairs.
+    """
+    wanted = {app_id: parse_skills(text) for app_id, text in applications}
+    if not wanted:
+        return
+    skill_ids = get_skill_ids(set().union(*wanted.values()))
+    wanted_pairs = {
+        (skill_ids[name], app_id)
+        for app_id, names in wanted.items()
+        for name in names
+    }
+    existing = {
+        (skill_id, app_id): posting_id
+        for posting_id, skill_id, app_id in ApplicationSkill.objects.filter(
+            application_id__in=wanted.keys()
+        ).values_list('id', 'skill_id', 'application_id')
+    }
+
+    stale_ids = [posting_id for pair, posting_id in existing.items() if pair not in wanted_pairs]
+    if stale_ids:
+        ApplicationSkill.objects.filter(id__in=stale_ids).delete()
+    new = wanted_pairs - existing.keys()
+    if new:
+        ApplicationSkill.objects.bulk_create(
+            [ApplicationSkill(skill_id=skill_id, application_id=app_id) for skill_id, app_id in new],
+            ignore_conflicts=True
+        )
+
+
+def filter_by_skills(queryset, names):
+    """
+    Restrict ``queryset`` to applications that have every skill in ``names``.
+
+    The postings of each skill are intersected with a GROUP BY over the
+    (skill, application) index; unknown skills short-circuit to no results.
+    """
+    names = {normalize_skill(name) for name in names} - {''}
+    if not names:
+        return queryset
+    skill_ids = list(Skill.objects.filter(name__in=names).values_list('id', flat=True))
+    if len(skill_ids) < len(names):
+        return queryset.none()
+    matching = (
+        ApplicationSkill.objects.filter(skill_id__in=skill_ids)
+        .values('application_id')
+        .annotate(matched=Count('skill_id'))
+        .filter(matched=len(skill_ids))
+        .values('application_id')
+    )
+    return queryset.filter(id__in=matching)
@@ -0,0 +1,29 @@
+import logging
+
+from celery import shared_task
+
+from veridia.processes import map_in_processes
+from .extraction import extract_text
+from .models import ResumeText
+from .resume_text import extraction_source, store_results
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, ignore_result=True)
+def extract_resume_texts(self, names):
+    """Extract and index the text of stored resumes ``names`` not extracted yet"""
+    if self.request.is_eager:
+        # Without a broker this would run in, and hold up, the request that stored the
+        # resume; the file is left without text for ``backfill_resume_text`` instead
+        logger.info('No Celery worker: leaving text extraction of %s to backfill_resume_text', names)
+        return 0
+    # Failed extractions are retried: the failure may have been transient
+    done = set(
+        ResumeText.objects.filter(name__in=names).exclude(status='failed').values_list('name', flat=True)
+    )
+    names = [name for name in names if name not in done]
+    if not names:
+        return 0
+    results = map_in_processes(extract_text, names, [extraction_source(name) for name in names])
+    return store_results(results)
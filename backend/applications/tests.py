@@ -0,0 +1,795 @@
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+from users.serializers import UserSummarySerializer
+from . import counters
+from .catalog import etag_matches
+from .importer import CSVImporter
+from .models import (
+    Application, ApplicationSkill, DailyApplicationRollup, Department, ResumeBlob, ResumeUpload, StatusCounter
+)
+from .pagination import ApplicationPagination
+from .search import get_search_backend
+from .serializers import ApplicationSerializer
+from .skills import parse_skills
+from .uploads import take_upload
+
+
+def create_applicants(count, prefix='applicant'):
+    applicants = User.objects.bulk_create([
+        User(email=f'{prefix}{i}@example.com', first_name='Applicant', last_name=str(i), phone='0')
+        for i in range(count)
+    ])
+    counters.users_added(applicants)
+    return applicants
+
+
+def create_admin():
+    return User.objects.create_user(
+        'admin@example.com', None, first_name='Admin', last_name='User', phone='0', user_type='admin'
+    )
+
+
+class BulkStatusUpdateCountersTests(TestCase):
+    APPLICATIONS = 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        applicants = create_applicants(cls.APPLICATIONS)
+        now = timezone.now()
+        # Distinct applicants, days and positions: every application has counter keys of its own
+        Application.objects.bulk_create([
+            Application(
+                applicant=applicant,
+                position=f'Position {i % 50}',
+                department=('Engineering', 'Sales', 'Design')[i % 3],
+                resume='resumes/test.pdf',
+                applied_date=now - timedelta(days=i % 200),
+            )
+            for i, applicant in enumerate(applicants)
+        ])
+        counters.rebuild_counters(Application, StatusCounter)
+        counters.replace_rollups(DailyApplicationRollup, counters.compute_rollups(Application))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_counters_cost_a_few_queries_per_batch(self):
+        ids = list(Application.objects.values_list('id', flat=True))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/v1/admin/applications/bulk-status/', {
+                'ids': ids, 'status': 'accepted', 'notify': False,
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['updated'], self.APPLICATIONS)
+
+        counter_queries = [
+            query['sql'] for query in queries.captured_queries
+            if 'status_counters' in query['sql'] or 'daily_application_rollups' in query['sql']
+        ]
+        # Per model: a SELECT, a bulk INSERT of the new keys and a CASE UPDATE per 1000 keys.
+        # SQLite splits the INSERTs further, at 999 parameters per statement.
+        self.assertLessEqual(len(counter_queries), 16, [sql[:60] for sql in counter_queries])
+        self.assertLessEqual(len(queries), 40)
+
+        self.assertEqual(
+            {
+                (row.scope, row.department, row.status): row.count
+                for row in StatusCounter.objects.exclude(count=0)
+            },
+            counters.compute_counters(Application),
+        )
+        self.assertEqual(
+            {
+                (row.day, row.department, row.position, row.status): row.count
+                for row in DailyApplicationRollup.objects.exclude(count=0)
+            },
+            counters.compute_rollups(Application),
+        )
+
+
+class CursorPaginationTests(TestCase):
+    URL = '/api/v1/admin/applications/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        cls.page_size = ApplicationPagination().get_page_size(None) or 10
+        applicants = create_applicants(3)
+        now = timezone.now().replace(microsecond=0)
+        # Pairs share an applied_date, so pages have to break ties on id
+        Application.objects.bulk_create([
+            Application(
+                applicant=applicants[i % 3], position='Developer', department='Engineering',
+                resume='resumes/test.pdf', applied_date=now - timedelta(hours=i // 2),
+            )
+            for i in range(2 * cls.page_size + 3)
+        ])
+        cls.expected = list(Application.objects.order_by('-applied_date', '-id').values_list('id', flat=True))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def ids(self, page):
+        return [row['id'] for row in page['results']]
+
+    def test_walks_every_row_once_in_keyset_order(self):
+        seen, pages, url = [], 0, self.URL + '?cursor='
+        while url:
+            page = self.get(url)
+            self.assertLessEqual(len(page['results']), self.page_size)
+            seen.extend(self.ids(page))
+            url = page['next']
+            pages += 1
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(pages, 3)
+
+    def test_previous_link_returns_the_page_before(self):
+        first = self.get(self.URL + '?cursor=')
+        self.assertIsNone(first['previous'])
+        second = self.get(first['next'])
+        self.assertEqual(self.ids(second), self.expected[self.page_size:2 * self.page_size])
+        self.assertEqual(self.ids(self.get(second['previous'])), self.ids(first))
+
+    def test_extra_row_only_decides_whether_there_is_a_next_page(self):
+        Application.objects.filter(id__in=self.expected[self.page_size + 1:]).delete()
+        page = self.get(self.URL + '?cursor=')
+        self.assertEqual(self.ids(page), self.expected[:self.page_size])
+        self.assertIsNotNone(page['next'])
+        last = self.get(page['next'])
+        self.assertEqual(self.ids(last), self.expected[self.page_size:self.page_size + 1])
+        self.assertIsNone(last['next'])
+
+        Application.objects.filter(id=self.expected[self.page_size]).delete()
+        self.assertIsNone(self.get(self.URL + '?cursor=')['next'])
+
+    def test_count_only_on_request(self):
+        self.assertIsNone(self.get(self.URL + '?cursor=')['count'])
+        self.assertEqual(self.get(self.URL + '?cursor=&include_count=true')['count'], len(self.expected))
+
+    def test_ordering_is_rejected(self):
+        response = self.client.get(self.URL + '?cursor=&ordering=status')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.json())
+        # Page numbers still honour it
+        self.assertEqual(self.client.get(self.URL + '?ordering=status').status_code, 200)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(self.URL + '?cursor=not-a-cursor').status_code, 404)
+
+
+class SparseFieldsetTests(TestCase):
+    URL = '/api/v1/admin/applications/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        applicants = create_applicants(5)
+        Application.objects.bulk_create([
+            Application(
+                applicant=applicant, position='Developer', department='Engineering',
+                resume='resumes/test.pdf', cover_letter='A long letter', notes='Private notes',
+            )
+            for applicant in applicants
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_renders_only_the_selected_fields(self):
+        response = self.client.get(self.URL + '?fields=id,position,applicant')
+        self.assertEqual(response.status_code, 200)
+        row = response.json()['results'][0]
+        self.assertEqual(set(row), {'id', 'position', 'applicant'})
+        self.assertEqual(list(row['applicant']), UserSummarySerializer.Meta.fields)
+
+    def test_summary_and_expand(self):
+        row = self.client.get(self.URL + '?fields=summary&expand=status_history').json()['results'][0]
+        self.assertEqual(set(row), set(ApplicationSerializer.SUMMARY_FIELDS) | {'status_history'})
+        row = self.client.get(self.URL + '?fields=id,applicant&expand=applicant').json()['results'][0]
+        self.assertIn('phone', row['applicant'])
+
+    def test_only_selected_columns_are_loaded(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.URL + '?fields=id,status')
+        self.assertEqual(response.status_code, 200)
+        application_queries = [q['sql'] for q in queries.captured_queries if 'FROM "applications"' in q['sql']]
+        self.assertTrue(application_queries)
+        for sql in application_queries:
+            self.assertNotIn('cover_letter', sql)
+            self.assertNotIn('"users"', sql)
+        self.assertFalse(any('status_history' in q['sql'] for q in queries.captured_queries))
+
+    def test_column_planning(self):
+        columns, applicant_columns = ApplicationSerializer.get_sparse_columns(['status', 'resume_url'], [])
+        self.assertEqual(columns, ['applied_date', 'id', 'resume', 'status'])
+        self.assertIsNone(applicant_columns)
+        _, summary_columns = ApplicationSerializer.get_sparse_columns(['applicant'], [])
+        _, full_columns = ApplicationSerializer.get_sparse_columns(['applicant'], ['applicant'])
+        self.assertLess(set(summary_columns), set(full_columns))
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(self.URL + '?fields=id,postion')
+        self.assertEqual(response.status_code, 400)
+        message = response.json()['fields'][0]
+        self.assertIn('postion', message)
+        self.assertIn('position', message)
+        self.assertEqual(self.client.get(self.URL + '?fields=id&expand=notes').status_code, 400)
+
+
+class SearchTests(TestCase):
+    URL = '/api/v1/admin/applications/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        ada, grace, linus = create_applicants(3)
+        User.objects.filter(pk=ada.pk).update(first_name='Ada', last_name='Lovelace')
+        cls.ada = Application.objects.create(
+            applicant=ada, position='Python Developer', department='Engineering', resume='resumes/a.pdf',
+        )
+        cls.grace = Application.objects.create(
+            applicant=grace, position='Data Analyst', department='Engineering', resume='resumes/b.pdf',
+            skills='SQL, Python',
+        )
+        cls.linus = Application.objects.create(
+            applicant=linus, position='Kernel Engineer', department='Engineering', resume='resumes/c.pdf',
+            cover_letter='I also write some python scripts',
+        )
+        get_search_backend().rebuild()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def search(self, query, extra=''):
+        response = self.client.get(f'{self.URL}?search={query}{extra}')
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.json()['results']]
+
+    def test_ranks_by_field_weight(self):
+        self.assertEqual(self.search('python'), [self.ada.id, self.grace.id, self.linus.id])
+
+    def test_terms_are_prefixes_and_all_required(self):
+        self.assertEqual(self.search('pyth'), [self.ada.id, self.grace.id, self.linus.id])
+        self.assertEqual(self.search('python sql'), [self.grace.id])
+        self.assertEqual(self.search('lovelace'), [self.ada.id])
+        self.assertEqual(self.search('cobol'), [])
+
+    def test_explicit_ordering_wins_over_relevance(self):
+        self.assertEqual(self.search('python', '&ordering=applied_date'), [self.ada.id, self.grace.id, self.linus.id])
+        self.assertEqual(self.search('python', '&ordering=-applied_date'), [self.linus.id, self.grace.id, self.ada.id])
+
+    def test_matches_the_index_once_per_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.search('python')
+        for query in queries.captured_queries:
+            self.assertLessEqual(query['sql'].count('MATCH'), 1, query['sql'])
+
+    def test_edits_are_reindexed(self):
+        self.linus.position = 'Rust Engineer'
+        self.linus.save()
+        self.assertEqual(self.search('rust'), [self.linus.id])
+        applicant = self.ada.applicant
+        applicant.last_name = 'Byron'
+        applicant.save()
+        self.assertEqual(self.search('byron'), [self.ada.id])
+        self.assertEqual(self.search('lovelace'), [])
+
+    def test_status_changes_leave_the_index_alone(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                f'{self.URL}{self.ada.id}/status/', {'status': 'accepted', 'notes': 'Great'}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q['sql'] for q in queries.captured_queries if 'applications_fts' in q['sql']])
+        self.ada.refresh_from_db()
+        self.assertEqual((self.ada.status, self.ada.notes), ('accepted', 'Great'))
+
+
+class SkillIndexTests(TestCase):
+    URL = '/api/v1/admin/applications/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        first, second, third = create_applicants(3)
+        cls.devops = Application.objects.create(
+            applicant=first, position='DevOps', department='Engineering', resume='resumes/a.pdf',
+            skills='Python, Kubernetes; CI/CD',
+        )
+        cls.backend = Application.objects.create(
+            applicant=second, position='Backend', department='Engineering', resume='resumes/b.pdf',
+            skills='python | PL/SQL\nkubernetes',
+        )
+        cls.frontend = Application.objects.create(
+            applicant=third, position='Frontend', department='Engineering', resume='resumes/c.pdf',
+            skills='TypeScript',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def filter(self, skills):
+        response = self.client.get(self.URL, {'skills': skills})
+        self.assertEqual(response.status_code, 200)
+        return sorted(row['id'] for row in response.json()['results'])
+
+    def test_parse_skills(self):
+        self.assertEqual(
+            parse_skills(' Python,  Machine   Learning; CI/CD | TCP/IP\nPL/SQL. ,,'),
+            {'python', 'machine learning', 'ci/cd', 'tcp/ip', 'pl/sql'},
+        )
+        self.assertEqual(parse_skills(''), set())
+
+    def test_every_listed_skill_is_required(self):
+        self.assertEqual(self.filter('python'), sorted([self.devops.id, self.backend.id]))
+        self.assertEqual(self.filter('PYTHON, kubernetes'), sorted([self.devops.id, self.backend.id]))
+        self.assertEqual(self.filter('python,ci/cd'), [self.devops.id])
+        self.assertEqual(self.filter('pl/sql'), [self.backend.id])
+        self.assertEqual(self.filter('python,typescript'), [])
+
+    def test_unknown_skill_short_circuits(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.filter('cobol,python'), [])
+        self.assertFalse([q['sql'] for q in queries.captured_queries if 'application_skills' in q['sql']])
+
+    def test_postings_follow_edits(self):
+        self.frontend.skills = 'TypeScript, Python'
+        self.frontend.save(update_fields=['skills'])
+        self.assertEqual(self.filter('python'), sorted([self.devops.id, self.backend.id, self.frontend.id]))
+        self.devops.skills = 'Go'
+        self.devops.save()
+        self.assertEqual(self.filter('kubernetes'), [self.backend.id])
+        self.assertEqual(
+            set(ApplicationSkill.objects.filter(application=self.devops).values_list('skill__name', flat=True)),
+            {'go'},
+        )
+
+
+class CounterMaintenanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.applicants = create_applicants(2)
+
+    def assertCountersMatch(self):
+        self.assertEqual(
+            {
+                (row.scope, row.department, row.status): row.count
+                for row in StatusCounter.objects.exclude(count=0)
+            },
+            counters.compute_counters(Application),
+        )
+        self.assertEqual(
+            {
+                (row.day, row.department, row.position, row.status): row.count
+                for row in DailyApplicationRollup.objects.exclude(count=0)
+            },
+            counters.compute_rollups(Application),
+        )
+
+    def create(self, **kwargs):
+        values = {'applicant': self.applicants[0], 'position': 'Developer', 'department': 'Engineering',
+                  'resume': 'resumes/test.pdf'}
+        return Application.objects.create(**{**values, **kwargs})
+
+    def test_save_counts_every_change(self):
+        application = self.create()
+        self.assertCountersMatch()
+        application.status = 'accepted'
+        application.department = 'Sales'
+        application.save()
+        self.assertCountersMatch()
+        application.applicant = self.applicants[1]
+        application.applied_date -= timedelta(days=3)
+        application.save(update_fields=['applicant', 'applied_date'])
+        self.assertCountersMatch()
+        # A stale copy still moves the counters from the stored values
+        stale = Application.objects.get(pk=application.pk)
+        application.status = 'rejected'
+        application.save()
+        stale.position = 'Designer'
+        stale.save(update_fields=['position'])
+        self.assertCountersMatch()
+
+    def test_unrelated_saves_leave_the_counters_alone(self):
+        application = self.create()
+        application.notes = 'Called back'
+        with CaptureQueriesContext(connection) as queries:
+            application.save(update_fields=['notes'])
+            Application.objects.filter(pk=application.pk).update(notes='Again')
+        self.assertFalse([q['sql'] for q in queries.captured_queries if 'status_counters' in q['sql']])
+
+    def test_queryset_update_counts_every_row(self):
+        for i in range(5):
+            self.create(applicant=self.applicants[i % 2], status=('under-review', 'rejected')[i % 2])
+        Application.objects.filter(status='under-review').update(status='interview-scheduled', department='Sales')
+        self.assertCountersMatch()
+        Application.objects.filter(applicant=self.applicants[0]).update(applicant=self.applicants[1])
+        self.assertCountersMatch()
+
+    def test_deletes_are_uncounted(self):
+        for i in range(4):
+            self.create(applicant=self.applicants[i % 2])
+        Application.objects.first().delete()
+        self.assertCountersMatch()
+        Application.objects.filter(applicant=self.applicants[0]).delete()
+        self.assertCountersMatch()
+        self.applicants[1].delete()
+        self.assertCountersMatch()
+        self.assertFalse(StatusCounter.objects.filter(scope=counters.GLOBAL_SCOPE).exclude(count=0).exists())
+
+    def test_users_are_counted_per_type(self):
+        self.assertEqual(counters.count_users('applicant'), 2)
+        admin = create_admin()
+        self.assertEqual(counters.count_users('admin'), 1)
+        admin.user_type = 'applicant'
+        admin.save()
+        admin.first_name = 'Renamed'
+        admin.save(update_fields=['first_name'])
+        self.assertEqual((counters.count_users('applicant'), counters.count_users('admin')), (3, 0))
+        self.applicants[0].delete()
+        self.assertEqual(counters.count_users('applicant'), 2)
+        self.assertCountersMatch()
+
+
+class AnalyticsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        applicants = create_applicants(4)
+        for i, applicant in enumerate(applicants):
+            Application.objects.create(
+                applicant=applicant, position=('Developer', 'Designer')[i % 2],
+                department=('Engineering', 'Design')[i % 2], resume='resumes/test.pdf',
+                status=('accepted', 'rejected', 'under-review', 'accepted')[i],
+            )
+
+    def test_figures_come_from_the_derived_tables(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/admin/analytics/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['overview']['total_applications'], 4)
+        self.assertEqual(data['overview']['total_applicants'], 4)
+        self.assertEqual(data['overview']['acceptance_rate'], 50.0)
+        self.assertEqual(data['applications_by_status'], {'accepted': 2, 'rejected': 1, 'under-review': 1})
+        self.assertEqual(data['applications_by_department'], {'Design': 2, 'Engineering': 2})
+        tables = {'"applications"', '"users"'}
+        self.assertFalse([q['sql'] for q in queries.captured_queries if any(t in q['sql'] for t in tables)])
+
+
+class CatalogCacheTests(TestCase):
+    URL = '/api/v1/departments/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.engineering = Department.objects.create(name='Engineering')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_cached_until_a_change_commits(self):
+        first = self.client.get(self.URL)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([d['name'] for d in first.json()['data']], ['Engineering'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.URL)['ETag'], first['ETag'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Department.objects.create(name='Sales')
+        second = self.client.get(self.URL)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertEqual({d['name'] for d in second.json()['data']}, {'Engineering', 'Sales'})
+
+    def test_conditional_requests(self):
+        etag = self.client.get(self.URL)['ETag']
+        for if_none_match in (etag, f'W/{etag}', f'"other", W/{etag}', '*'):
+            with self.subTest(if_none_match=if_none_match), self.assertNumQueries(0):
+                response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=if_none_match)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get(self.URL, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.engineering.description = 'Builds things'
+            self.engineering.save()
+        self.assertEqual(self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"a"', 'W/"a"'))
+        self.assertFalse(etag_matches('"a"', '"b", W/"c"'))
+        self.assertFalse(etag_matches('"a"', None))
+
+
+class ImporterTests(TestCase):
+    def write_csv(self, text):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_imported_applications_skip_the_hr_digest(self):
+        create_applicants(1)
+        path = self.write_csv(
+            'applicant_email,position,department,applied_date\n'
+            'applicant0@example.com,Developer,Engineering,2024-03-01T09:00:00+00:00\n'
+        )
+        result = CSVImporter().import_applications(path)
+
+        self.assertEqual(result['created'], 1)
+        application = Application.objects.get()
+        self.assertEqual(application.hr_digested_at, application.applied_date)
+        self.assertFalse(Application.objects.filter(hr_digested_at__isnull=True).exists())
+
+
+class RequestMetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        Application.objects.bulk_create([
+            Application(applicant=applicant, position='Developer', department='Engineering', resume='resumes/x.pdf')
+            for applicant in create_applicants(3)
+        ])
+
+    def test_admins_get_serialization_time(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        for url in ['/api/v1/admin/applications/', f'/api/v1/admin/applications/{Application.objects.first().id}/']:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('serialize;dur=', response['Server-Timing'])
+
+
+class ExportTests(TestCase):
+    URL = '/api/v1/admin/applications/export/'
+    FORMULAS = ['=HYPERLINK("http://evil.example","x")', '+1+1', '-2', '@SUM(A1)', '\tcmd', '\rcmd']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        applicants = create_applicants(len(cls.FORMULAS))
+        Application.objects.bulk_create([
+            Application(applicant=applicant, position='Developer', department='Engineering',
+                        resume='resumes/x.pdf', skills=formula, referral='Jane Doe')
+            for applicant, formula in zip(applicants, cls.FORMULAS)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, **params):
+        response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_csv_neutralises_formulas(self):
+        rows = list(csv.DictReader(io.StringIO(self.export(format='csv').decode('utf-8'))))
+
+        self.assertCountEqual([row['skills'] for row in rows], ["'" + formula for formula in self.FORMULAS])
+        self.assertEqual({row['referral'] for row in rows}, {'Jane Doe'})
+        self.assertEqual({row['position'] for row in rows}, {'Developer'})
+
+    def test_ndjson_keeps_values_as_they_are(self):
+        rows = [json.loads(line) for line in self.export(format='ndjson').decode('utf-8').splitlines()]
+
+        self.assertCountEqual([row['skills'] for row in rows], self.FORMULAS)
+
+    def test_gzip_wraps_the_same_csv(self):
+        self.assertEqual(gzip.decompress(self.export(format='csv', compress='gzip')), self.export(format='csv'))
+
+
+class ResumeUploadTests(TestCase):
+    URL = '/api/v1/applicant/uploads/'
+    CONTENT = b'%PDF-1.4 resume'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.applicant, = create_applicants(1)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root, RESUME_UPLOAD_DIR=os.path.join(media_root, 'partial_uploads'),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.applicant)
+
+    def start(self):
+        response = self.client.post(self.URL, {'filename': 'cv.pdf', 'size': len(self.CONTENT)}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['data']['id']
+
+    def put_chunk(self, upload_id, first, data, **headers):
+        last = first + len(data) - 1
+        return self.client.generic(
+            'PUT', f'{self.URL}{upload_id}/', data, content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {first}-{last}/{len(self.CONTENT)}', **headers
+        )
+
+    def test_chunks_are_appended_in_order(self):
+        upload_id = self.start()
+        response = self.put_chunk(upload_id, 0, self.CONTENT[:5])
+        self.assertEqual(response.data['data']['received'], 5)
+
+        # Out of order: the error says where to resume from
+        response = self.put_chunk(upload_id, 10, self.CONTENT[10:])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['error']['code'], 'OFFSET_MISMATCH')
+        self.assertEqual(response.data['error']['details'], {'received': 5})
+
+        response = self.put_chunk(upload_id, 5, self.CONTENT[5:])
+        self.assertEqual(response.data['data']['received'], len(self.CONTENT))
+
+    def test_malformed_headers_are_rejected(self):
+        upload_id = self.start()
+        response = self.put_chunk(upload_id, 0, self.CONTENT[:5], CONTENT_LENGTH='five')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.generic('PUT', f'{self.URL}{upload_id}/', self.CONTENT[:5],
+                                       content_type='application/octet-stream', HTTP_CONTENT_RANGE='bytes 0-4')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ResumeUpload.objects.get(pk=upload_id).received, 0)
+
+    def test_finalize_stores_the_blob_once(self):
+        upload_id = self.start()
+        response = self.client.post(f'{self.URL}{upload_id}/finalize/')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['error']['code'], 'UPLOAD_INCOMPLETE')
+
+        self.put_chunk(upload_id, 0, self.CONTENT)
+        for _ in range(2):
+            response = self.client.post(f'{self.URL}{upload_id}/finalize/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['data']['status'], 'complete')
+
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.refcount, 1)
+        with blob.file.open('rb') as f:
+            self.assertEqual(f.read(), self.CONTENT)
+
+    def test_finalized_upload_is_taken_once(self):
+        upload_id = self.start()
+        self.put_chunk(upload_id, 0, self.CONTENT)
+        self.client.post(f'{self.URL}{upload_id}/finalize/')
+        upload = ResumeUpload.objects.get(pk=upload_id)
+
+        self.assertEqual(take_upload(upload), ResumeBlob.objects.get())
+        self.assertIsNone(take_upload(upload))
+        self.assertFalse(ResumeUpload.objects.filter(pk=upload_id).exists())
+
+
+class ResumeDownloadTests(TestCase):
+    CONTENT = b'%PDF-1.4 ' + bytes(range(256))
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_admin()
+        cls.owner, cls.other = create_applicants(2)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        name = default_storage.save('resumes/cv.pdf', ContentFile(self.CONTENT))
+        self.application = Application.objects.create(
+            applicant=self.owner, position='Developer', department='Engineering', resume=name
+        )
+        self.url = f'/api/v1/applicant/applications/{self.application.id}/resume/'
+
+    def client_for(self, user=None):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        return client
+
+    def download(self, client, url=None, **headers):
+        response = client.get(url or self.url, **headers)
+        if response.status_code in (200, 206):
+            response.body = b''.join(response.streaming_content)
+        return response
+
+    def link(self, user):
+        response = self.client_for(user).post(f'{self.url}link/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']['url']
+
+    def test_access(self):
+        self.assertEqual(self.download(self.client_for(self.owner)).body, self.CONTENT)
+        self.assertEqual(self.download(self.client_for(self.admin)).status_code, 200)
+        self.assertEqual(self.download(self.client_for(self.other)).status_code, 404)
+        self.assertEqual(self.download(self.client_for()).status_code, 401)
+        self.assertEqual(self.client_for(self.other).post(f'{self.url}link/').status_code, 404)
+
+    def test_byte_ranges(self):
+        client = self.client_for(self.owner)
+        response = self.download(client, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.CONTENT)}')
+        self.assertEqual(response.body, self.CONTENT[10:20])
+
+        response = self.download(client, HTTP_RANGE='bytes=-5')
+        self.assertEqual(response.body, self.CONTENT[-5:])
+
+        response = self.download(client, HTTP_RANGE=f'bytes={len(self.CONTENT)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.CONTENT)}')
+
+        # A range against another version of the file gets the whole file
+        response = self.download(client, HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='Wed, 21 Oct 2015 07:28:00 GMT')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, self.CONTENT)
+
+        last_modified = response['Last-Modified']
+        response = self.download(client, HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE=last_modified)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.download(client, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_serialized_urls_carry_no_token(self):
+        response = self.client_for(self.admin).get('/api/v1/admin/applications/', {'fields': 'id,resume_url'})
+
+        self.assertTrue(response.data['results'][0]['resume_url'].endswith(self.url))
+
+    def test_link_works_without_authentication(self):
+        url = self.link(self.admin)
+
+        self.assertEqual(self.download(self.client_for(), url).body, self.CONTENT)
+        other = Application.objects.create(applicant=self.other, position='Developer', department='Sales',
+                                           resume=self.application.resume.name)
+        other_url = url.replace(f'/applications/{self.application.id}/', f'/applications/{other.id}/')
+        self.assertEqual(self.download(self.client_for(), other_url).status_code, 403)
+        self.assertEqual(self.download(self.client_for(), f'{self.url}?token=forged').status_code, 403)
+
+    def test_link_expires(self):
+        url = self.link(self.owner)
+        later = time.time() + settings.RESUME_DOWNLOAD_URL_MAX_AGE + 1
+        with mock.patch('django.core.signing.time.time', return_value=later):
+            self.assertEqual(self.download(self.client_for(), url).status_code, 403)
+
+    def test_link_follows_the_users_access(self):
+        url = self.link(self.admin)
+        User.objects.filter(pk=self.admin.pk).update(user_type='applicant')
+        self.assertEqual(self.download(self.client_for(), url).status_code, 404)
+
+        url = self.link(self.owner)
+        User.objects.filter(pk=self.owner.pk).update(is_active=False)
+        self.assertEqual(self.download(self.client_for(), url).status_code, 403)
@@ -0,0 +1,168 @@
+"""
+Chunked, resumable resume uploads.
+
+A client starts a session with the file's name and size, PUTs the bytes in
+chunks, each with a ``Content-Range: bytes <first>-<last>/<size>`` header,
+then finalizes it and creates the application with ``resume_upload`` set to
+the session id instead of a multipart ``resume``. Every chunk is a short
+request, so a slow connection no longer holds a worker for the whole
+transfer, and after a dropped connection the client reads ``received`` and
+continues from there.
+
+Chunks are copied from the request stream straight into a partial file under
+``RESUME_UPLOAD_DIR``, which all workers must share. An exclusive ``flock``
+on that file keeps two requests from writing the same session at once.
+"""
+import fcntl
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ResumeUpload
+from .resumes import acquire_resume, release_resume
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    def __init__(self, code, message, status=409, upload=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = status
+        self.upload = upload
+
+
+class PartialFile(File):
+    # Lets FileSystemStorage move the finished file into place instead of copying it
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def partial_path(upload):
+    return os.path.join(settings.RESUME_UPLOAD_DIR, f'{upload.pk}.part')
+
+
+def _remove_partial(upload):
+    try:
+        os.remove(partial_path(upload))
+    except FileNotFoundError:
+        pass
+
+
+def parse_content_range(header):
+    """Return ``(first, length, total)`` from a ``Content-Range`` header, or None."""
+    match = CONTENT_RANGE.match(header or '')
+    if not match:
+        return None
+    first, last, total = (int(value) for value in match.groups())
+    if last < first:
+        return None
+    return first, last - first + 1, total
+
+
+def parse_content_length(header):
+    """Return the ``Content-Length`` header as an int, or None if it is missing or malformed."""
+    if not (header or '').isdigit():
+        return None
+    return int(header)
+
+
+def start_upload(user, filename, size):
+    if size <= 0 or size > settings.RESUME_UPLOAD_MAX_SIZE:
+        raise UploadError(
+            'VALIDATION_ERROR',
+            f'size must be between 1 and {settings.RESUME_UPLOAD_MAX_SIZE} bytes',
+            status=400,
+        )
+    upload = ResumeUpload.objects.create(
+        user=user,
+        filename=os.path.basename(filename)[:255],
+        size=size,
+        expires_at=timezone.now() + timedelta(hours=settings.RESUME_UPLOAD_EXPIRY_HOURS),
+    )
+    os.makedirs(settings.RESUME_UPLOAD_DIR, exist_ok=True)
+    open(partial_path(upload), 'wb').close()
+    return upload
+
+
+def write_chunk(upload, stream, first, length):
+    """Append ``length`` bytes read from ``stream`` at offset ``first`` of ``upload``."""
+    try:
+        part = open(partial_path(upload), 'r+b')
+    except FileNotFoundError:
+        raise UploadError('UPLOAD_NOT_WRITABLE', 'Upload is no longer accepting chunks', upload=upload)
+    with part:
+        try:
+            fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadError('UPLOAD_BUSY', 'Another chunk of this upload is being written', upload=upload)
+
+        upload.refresh_from_db(fields=['received', 'status'])
+        if upload.status != 'uploading':
+            raise UploadError('UPLOAD_NOT_WRITABLE', 'Upload is already finalized', upload=upload)
+        if first != upload.received:
+            raise UploadError('OFFSET_MISMATCH', f'Expected a chunk starting at {upload.received}', upload=upload)
+
+        # Drops the tail of a chunk whose request died mid-write
+        part.truncate(first)
+        part.seek(first)
+        remaining = length
+        while remaining:
+            data = stream.read(min(COPY_BUFFER_SIZE, remaining))
+            if not data:
+                break
+            part.write(data)
+            remaining -= len(data)
+        if remaining:
+            part.truncate(first)
+            raise UploadError('INCOMPLETE_CHUNK', 'Chunk body was shorter than its range', 400, upload)
+        part.flush()
+
+        upload.received = first + length
+        ResumeUpload.objects.filter(pk=upload.pk).update(received=upload.received)
+    return upload
+
+
+def finalize_upload(upload):
+    """Store a fully received upload as a ``ResumeBlob``; finalizing twice is harmless."""
+    with transaction.atomic():
+        upload = ResumeUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status == 'complete':
+            return upload
+        if upload.received != upload.size:
+            raise UploadError('UPLOAD_INCOMPLETE', f'Received {upload.received} of {upload.size} bytes', upload=upload)
+        with open(partial_path(upload), 'rb') as part:
+            blob = acquire_resume(PartialFile(part, name=upload.filename))
+        upload.status = 'complete'
+        upload.blob = blob
+        upload.save(update_fields=['status', 'blob'])
+    _remove_partial(upload)
+    return upload
+
+
+def take_upload(upload):
+    """
+    Hand the blob reference of a finalized ``upload`` over to the caller,
+    which must store it on an application in the same transaction.
+    """
+    # Deleting first makes sure two applications can't both take the reference
+    taken, _ = ResumeUpload.objects.filter(pk=upload.pk, status='complete').delete()
+    if not taken:
+        return None
+    return upload.blob
+
+
+def discard_upload(upload):
+    """Abort or expire ``upload``, dropping its partial file or blob reference."""
+    with transaction.atomic():
+        deleted, _ = ResumeUpload.objects.filter(pk=upload.pk).delete()
+        if deleted:
+            release_resume(upload.blob_id)
+    _remove_partial(upload)
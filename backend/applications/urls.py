@@ -6,7 +6,12 @@ router = DefaultRouter()
 router.register(r'applications', views.ApplicationViewSet, basename='application')
 
 urlpatterns = [
+    path('applications/<int:pk>/resume/', views.resume_download, name='application-resume'),
+    path('applications/<int:pk>/resume/link/', views.resume_download_link, name='application-resume-link'),
     path('', include(router.urls)),
     path('dashboard/stats/', views.applicant_dashboard_stats, name='applicant-dashboard-stats'),
+    path('uploads/', views.resume_upload_start, name='resume-upload-start'),
+    path('uploads/<uuid:upload_id>/', views.resume_upload_detail, name='resume-upload-detail'),
+    path('uploads/<uuid:upload_id>/finalize/', views.resume_upload_finalize, name='resume-upload-finalize'),
 ]
 
@@ -1,45 +1,109 @@
 from rest_framework import status, viewsets, filters
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q, Count
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Prefetch, Sum
+from django.db.models.functions import TruncMonth
+from django.urls import reverse
 from django.utils import timezone
 from datetime import timedelta
 
-from .models import Application, StatusHistory, Department, Position, Activity
+from . import counters
+from .catalog import catalog_response
+from .downloads import download_token, read_download_token, resume_response
+from .export import EXPORT_FORMATS, export_response
+from .models import (
+    Application, StatusHistory, Department, Position, Activity, DailyApplicationRollup, ResumeUpload
+)
+from .filters import ApplicationResumeTextFilter, ApplicationSearchFilter, ApplicationSkillFilter
+from .pagination import ApplicationPagination
 from .serializers import (
-    ApplicationSerializer, ApplicationCreateSerializer,
+    ApplicationSerializer, ApplicationCreateSerializer, BulkStatusUpdateSerializer,
     StatusHistorySerializer, DepartmentSerializer, PositionSerializer,
-    ActivitySerializer
+    ActivitySerializer, ResumeUploadSerializer
+)
+from .uploads import (
+    UploadError, discard_upload, finalize_upload, parse_content_length, parse_content_range, start_upload,
+    write_chunk
+)
+from notifications import outbox
+from notifications.tasks import (
+    send_application_confirmation, send_status_update_email, send_status_update_emails
 )
 from users.models import User
-from notifications.tasks import send_application_confirmation, send_status_update_email
+from veridia.instrumentation import timed
 
 
 class ApplicationViewSet(viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = ApplicationPagination
+    filter_backends = [DjangoFilterBackend, ApplicationSkillFilter, ApplicationResumeTextFilter,
+                       filters.OrderingFilter, ApplicationSearchFilter]
     filterset_fields = ['status', 'department', 'position']
-    search_fields = ['applicant__first_name', 'applicant__last_name', 'applicant__email']
     ordering_fields = ['applied_date', 'last_updated', 'status']
     ordering = ['-applied_date']
 
     def get_queryset(self):
         user = self.request.user
+        fields, expand = self.get_field_selection()
+        if fields is None:
+            queryset = Application.objects.select_related('applicant')
+            with_history = True
+        else:
+            # Sparse fieldset: only load the columns that will be rendered so
+            # large TextFields (cover_letter, notes, skills) stay in the database
+            columns, applicant_columns = ApplicationSerializer.get_sparse_columns(fields, expand)
+            if applicant_columns is not None:
+                columns += ['applicant'] + [f'applicant__{name}' for name in applicant_columns]
+                queryset = Application.objects.select_related('applicant').only(*columns)
+            else:
+                queryset = Application.objects.only(*columns)
+            with_history = 'status_history' in fields or 'status_history' in expand
+
+        if with_history:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'status_history',
+                    queryset=StatusHistory.objects.select_related('changed_by')
+                )
+            )
         if user.user_type == 'admin':
-            return Application.objects.all()
-        return Application.objects.filter(applicant=user)
+            return queryset
+        return queryset.filter(applicant=user)
+
+    def get_field_selection(self):
+        """Return the ``(fields, expand)`` requested with ?fields= / ?expand= on reads."""
+        if self.action not in ('list', 'retrieve'):
+            return None, []
+        return ApplicationSerializer.parse_field_selection(
+            self.request.query_params.get('fields'),
+            self.request.query_params.get('expand'),
+        )
 
     def get_serializer_class(self):
         if self.action == 'create':
             return ApplicationCreateSerializer
         return ApplicationSerializer
 
+    def get_serializer(self, *args, **kwargs):
+        fields, expand = self.get_field_selection()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+            kwargs.setdefault('expand', expand)
+        return super().get_serializer(*args, **kwargs)
+
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(page, many=True)
+        with timed('serialize'):
+            data = serializer.data
+        response = self.get_paginated_response(data)
         return Response({
             'success': True,
             'results': response.data.get('results', response.data),
@@ -49,36 +113,37 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         })
 
     def retrieve(self, request, *args, **kwargs):
-        response = super().retrieve(request, *args, **kwargs)
+        serializer = self.get_serializer(self.get_object())
+        with timed('serialize'):
+            data = serializer.data
         return Response({
             'success': True,
-            'data': response.data
+            'data': data
         })
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            application = serializer.save(applicant=request.user)
-            # Create status history
-            StatusHistory.objects.create(
-                application=application,
-                status=application.status,
-                changed_by=None,
-                comment="Application submitted"
-            )
-            # Create activity
-            Activity.objects.create(
-                action='application_submitted',
-                description=f'New application received for {application.position}',
-                applicant=request.user,
-                application=application
-            )
-            # Send emails
-            try:
-                send_application_confirmation(application.id)
-            except:
-                pass
-            
+            # The submission and all of its side effects commit together
+            with transaction.atomic():
+                application = serializer.save(applicant=request.user)
+                # Create status history
+                StatusHistory.objects.create(
+                    application=application,
+                    status=application.status,
+                    changed_by=None,
+                    comment="Application submitted"
+                )
+                # Create activity
+                Activity.objects.create(
+                    action='application_submitted',
+                    description=f'New application received for {application.position}',
+                    applicant=request.user,
+                    application=application
+                )
+                # Send emails, relayed from the outbox after commit
+                outbox.enqueue(send_application_confirmation, application.id)
+
             return Response({
                 'success': True,
                 'message': 'Application submitted successfully',
@@ -99,22 +164,20 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         pass
 
     def perform_update(self, serializer):
-        old_status = self.get_object().status
-        application = serializer.save()
-        new_status = application.status
-
-        if old_status != new_status:
-            StatusHistory.objects.create(
-                application=application,
-                status=new_status,
-                changed_by=self.request.user,
-                comment=serializer.validated_data.get('notes', '')
-            )
-            # Send status update email
-            try:
-                send_status_update_email(application.id, new_status)
-            except:
-                pass
+        old_status = serializer.instance.status
+        with transaction.atomic():
+            application = serializer.save()
+            new_status = application.status
+
+            if old_status != new_status:
+                StatusHistory.objects.create(
+                    application=application,
+                    status=new_status,
+                    changed_by=self.request.user,
+                    comment=serializer.validated_data.get('notes', '')
+                )
+                # Send status update email
+                outbox.enqueue(send_status_update_email, application.id, new_status)
 
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
@@ -125,26 +188,24 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         comment = request.data.get('comment', '')
 
         if new_status:
-            old_status = application.status
             application.status = new_status
             if interview_date:
                 application.interview_date = interview_date
             if notes:
                 application.notes = notes
-            application.save()
+            with transaction.atomic():
+                # Only the status columns: the search document stays as it is
+                application.save(update_fields=['status', 'interview_date', 'notes', 'last_updated'])
 
-            StatusHistory.objects.create(
-                application=application,
-                status=new_status,
-                changed_by=request.user,
-                comment=comment or notes
-            )
+                StatusHistory.objects.create(
+                    application=application,
+                    status=new_status,
+                    changed_by=request.user,
+                    comment=comment or notes
+                )
 
-            # Send email
-            try:
-                send_status_update_email(application.id, new_status)
-            except:
-                pass
+                # Send email
+                outbox.enqueue(send_status_update_email, application.id, new_status)
 
             return Response({
                 'success': True,
@@ -158,18 +219,146 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_400_BAD_REQUEST)
 
 
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_update_status(self, request):
+        if request.user.user_type != 'admin':
+            return Response({
+                'success': False,
+                'error': {'code': 'FORBIDDEN', 'message': 'Admin access required'}
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = BulkStatusUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': 'Invalid input data',
+                    'details': serializer.errors
+                }
+            }, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        new_status = data['status']
+        comment = data['comment']
+        interview_date = data.get('interview_date')
+
+        applications = Application.objects.order_by('id').only(
+            'id', 'applicant_id', 'position', 'department', 'status', 'applied_date'
+        )
+        if 'ids' in data:
+            applications = applications.filter(id__in=data['ids'])
+        else:
+            applications = applications.filter(**data['filter'])
+        applications = list(applications[:BulkStatusUpdateSerializer.MAX_APPLICATIONS + 1])
+        if len(applications) > BulkStatusUpdateSerializer.MAX_APPLICATIONS:
+            return Response({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f'At most {BulkStatusUpdateSerializer.MAX_APPLICATIONS} '
+                               'applications can be updated at once'
+                }
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        changed = [application for application in applications if application.status != new_status]
+        changed_ids = [application.id for application in changed]
+        not_found = sorted(set(data.get('ids', [])) - {application.id for application in applications})
+
+        if changed:
+            now = timezone.now()
+            with transaction.atomic():
+                updates = {'status': new_status, 'last_updated': now}
+                if interview_date:
+                    updates['interview_date'] = interview_date
+                # Every row gets the same values, so one UPDATE covers the whole batch,
+                # and the counters follow with a few set-based statements
+                Application.objects.filter(id__in=changed_ids).update(**updates)
+                for application in changed:
+                    application.status = new_status
+
+                StatusHistory.objects.bulk_create([
+                    StatusHistory(
+                        application=application,
+                        status=new_status,
+                        changed_by=request.user,
+                        changed_at=now,
+                        comment=comment
+                    )
+                    for application in changed
+                ], batch_size=500)
+                Activity.objects.bulk_create([
+                    Activity(
+                        action='status_updated',
+                        description=f'Application status changed to {new_status} for {application.position}',
+                        applicant_id=application.applicant_id,
+                        application=application,
+                        changed_by=request.user,
+                        timestamp=now,
+                        metadata={'status': new_status, 'bulk': True}
+                    )
+                    for application in changed
+                ], batch_size=500)
+
+                if data['notify']:
+                    # One outbox row and one SMTP connection for the whole batch
+                    outbox.enqueue(send_status_update_emails, changed_ids, new_status)
+
+        return Response({
+            'success': True,
+            'message': f'{len(changed)} application(s) updated successfully',
+            'data': {
+                'updated': len(changed),
+                'unchanged': len(applications) - len(changed),
+                'not_found': not_found,
+            }
+        })
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        if request.user.user_type != 'admin':
+            return Response({
+                'success': False,
+                'error': {'code': 'FORBIDDEN', 'message': 'Admin access required'}
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        export_format = request.query_params.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': f'format must be one of: {", ".join(EXPORT_FORMATS)}'
+                }
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # Same filters, search and ordering as the list, without its prefetches
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        return export_response(
+            queryset, export_format, compress=request.query_params.get('compress') == 'gzip'
+        )
+
+    def perform_content_negotiation(self, request, force=False):
+        # On export ``?format=`` names the file format rather than a renderer
+        if self.action == 'export':
+            renderer = JSONRenderer()
+            return renderer, renderer.media_type
+        return super().perform_content_negotiation(request, force)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def applicant_dashboard_stats(request):
     user = request.user
-    applications = Application.objects.filter(applicant=user)
-    
-    total = applications.count()
-    pending = applications.filter(status='under-review').count()
-    interviews = applications.filter(status='interview-scheduled').count()
-    rejected = applications.filter(status='rejected').count()
-    accepted = applications.filter(status='accepted').count()
-    
+    by_status = {
+        status_: count
+        for (_, status_), count in counters.read_counters(counters.applicant_scope(user.id)).items()
+    }
+
+    total = sum(by_status.values())
+    pending = by_status.get('under-review', 0)
+    interviews = by_status.get('interview-scheduled', 0)
+    rejected = by_status.get('rejected', 0)
+    accepted = by_status.get('accepted', 0)
+
     response_rate = (total - pending) / total * 100 if total > 0 else 0
 
     return Response({
@@ -185,6 +374,178 @@ def applicant_dashboard_stats(request):
     })
 
 
+def _upload_error_response(error):
+    body = {'success': False, 'error': {'code': error.code, 'message': error.message}}
+    if error.upload is not None:
+        # Where the client should resume from
+        body['error']['details'] = {'received': error.upload.received}
+    return Response(body, status=error.status)
+
+
+def _get_upload(request, upload_id):
+    return ResumeUpload.objects.filter(
+        pk=upload_id, user=request.user, expires_at__gt=timezone.now()
+    ).first()
+
+
+def _upload_not_found():
+    return Response({
+        'success': False,
+        'error': {'code': 'NOT_FOUND', 'message': 'Upload not found'}
+    }, status=status.HTTP_404_NOT_FOUND)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def resume_upload_start(request):
+    serializer = ResumeUploadSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response({
+            'success': False,
+            'error': {
+                'code': 'VALIDATION_ERROR',
+                'message': 'Invalid input data',
+                'details': serializer.errors
+            }
+        }, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        upload = start_upload(
+            request.user, serializer.validated_data['filename'], serializer.validated_data['size']
+        )
+    except UploadError as error:
+        return _upload_error_response(error)
+
+    return Response({
+        'success': True,
+        'data': {**ResumeUploadSerializer(upload).data, 'chunk_size': settings.RESUME_UPLOAD_CHUNK_SIZE}
+    }, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def resume_upload_detail(request, upload_id):
+    upload = _get_upload(request, upload_id)
+    if upload is None:
+        return _upload_not_found()
+
+    if request.method == 'DELETE':
+        discard_upload(upload)
+        return Response({'success': True, 'message': 'Upload discarded'})
+
+    if request.method == 'PUT':
+        content_range = parse_content_range(request.headers.get('Content-Range'))
+        if content_range is None:
+            return Response({
+                'success': False,
+                'error': {
+                    'code': 'VALIDATION_ERROR',
+                    'message': 'Content-Range: bytes <first>-<last>/<size> header required'
+                }
+            }, status=status.HTTP_400_BAD_REQUEST)
+        first, length, total = content_range
+        if total != upload.size or first + length > upload.size:
+            return Response({
+                'success': False,
+                'error': {'code': 'VALIDATION_ERROR', 'message': f'Range must lie within the {upload.size} byte upload'}
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if length > settings.RESUME_UPLOAD_CHUNK_SIZE:
+            return Response({
+                'success': False,
+                'error': {
+                    'code': 'CHUNK_TOO_LARGE',
+                    'message': f'Chunks may be at most {settings.RESUME_UPLOAD_CHUNK_SIZE} bytes'
+                }
+            }, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        if parse_content_length(request.headers.get('Content-Length')) != length:
+            return Response({
+                'success': False,
+                'error': {'code': 'VALIDATION_ERROR', 'message': 'Content-Length does not match Content-Range'}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # The body is read from the stream by write_chunk, never parsed into request.data
+        try:
+            upload = write_chunk(upload, request.stream, first, length)
+        except UploadError as error:
+            return _upload_error_response(error)
+
+    return Response({'success': True, 'data': ResumeUploadSerializer(upload).data})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def resume_upload_finalize(request, upload_id):
+    upload = _get_upload(request, upload_id)
+    if upload is None:
+        return _upload_not_found()
+    try:
+        upload = finalize_upload(upload)
+    except UploadError as error:
+        return _upload_error_response(error)
+    return Response({'success': True, 'data': ResumeUploadSerializer(upload).data})
+
+
+def _resume_queryset(user):
+    """Applications whose resume ``user`` may download."""
+    queryset = Application.objects.exclude(resume='')
+    if user.user_type != 'admin':
+        queryset = queryset.filter(applicant=user)
+    return queryset
+
+
+def _resume_not_found():
+    return Response({
+        'success': False,
+        'error': {'code': 'NOT_FOUND', 'message': 'Resume not found'}
+    }, status=status.HTTP_404_NOT_FOUND)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def resume_download_link(request, pk):
+    """Issue a short-lived download link, for opening the resume where the JWT can't be sent."""
+    application = _resume_queryset(request.user).filter(pk=pk).first()
+    if application is None:
+        return _resume_not_found()
+    url = reverse('application-resume', args=[pk])
+    return Response({
+        'success': True,
+        'data': {
+            'url': request.build_absolute_uri(f'{url}?token={download_token(application, request.user)}'),
+            'expires_in': settings.RESUME_DOWNLOAD_URL_MAX_AGE,
+        }
+    })
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def resume_download(request, pk):
+    """Serve an application's resume to its applicant, to admins, or to a link they requested."""
+    token = request.query_params.get('token')
+    if token:
+        signed = read_download_token(token)
+        # The link only works for the user it was issued to, while they still have access
+        user = None
+        if signed is not None and signed[0] == pk:
+            user = User.objects.filter(pk=signed[1], is_active=True).first()
+        if user is None:
+            return Response({
+                'success': False,
+                'error': {'code': 'FORBIDDEN', 'message': 'Download link is invalid or has expired'}
+            }, status=status.HTTP_403_FORBIDDEN)
+    elif request.user.is_authenticated:
+        user = request.user
+    else:
+        return Response({
+            'success': False,
+            'error': {'code': 'UNAUTHORIZED', 'message': 'Authentication required'}
+        }, status=status.HTTP_401_UNAUTHORIZED)
+
+    application = _resume_queryset(user).select_related('applicant').filter(pk=pk).first()
+    if application is None:
+        return _resume_not_found()
+    return resume_response(request, application)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def admin_dashboard_stats(request):
@@ -194,27 +555,27 @@ def admin_dashboard_stats(request):
             'error': {'code': 'FORBIDDEN', 'message': 'Admin access required'}
         }, status=status.HTTP_403_FORBIDDEN)
 
-    applications = Application.objects.all()
-    
-    total = applications.count()
-    pending = applications.filter(status='under-review').count()
-    interviews = applications.filter(status='interview-scheduled').count()
-    accepted = applications.filter(status='accepted').count()
-    rejected = applications.filter(status='rejected').count()
+    by_status = {}
+    by_department = {}
+    for (department, status_), count in counters.read_counters(counters.GLOBAL_SCOPE).items():
+        by_status[status_] = by_status.get(status_, 0) + count
+        by_department[department] = by_department.get(department, 0) + count
 
-    # Department stats
-    dept_stats = applications.values('department').annotate(
-        count=Count('id')
-    ).order_by('-count')
+    total = sum(by_status.values())
+    pending = by_status.get('under-review', 0)
+    interviews = by_status.get('interview-scheduled', 0)
+    accepted = by_status.get('accepted', 0)
+    rejected = by_status.get('rejected', 0)
 
-    total_dept = sum(d['count'] for d in dept_stats)
+    # Department stats
     dept_data = [
         {
-            'department': d['department'],
-            'count': d['count'],
-            'percentage': round(d['count'] / total * 100, 2) if total > 0 else 0
+            'department': department,
+            'count': count,
+            'percentage': round(count / total * 100, 2) if total > 0 else 0
         }
-        for d in dept_stats
+        for department, count in sorted(by_department.items(), key=lambda d: -d[1])
+        if count > 0
     ]
 
     return Response({
@@ -243,39 +604,42 @@ def admin_analytics(request):
             'error': {'code': 'FORBIDDEN', 'message': 'Admin access required'}
         }, status=status.HTTP_403_FORBIDDEN)
 
-    applications = Application.objects.all()
-    
     # Monthly applications
-    monthly = applications.extra(
-        select={'month': "strftime('%%Y-%%m', applied_date)"}
-    ).values('month').annotate(count=Count('id')).order_by('month')
-
-    # Status distribution
-    status_dist = applications.values('status').annotate(count=Count('id'))
-    status_data = {s['status']: s['count'] for s in status_dist}
-
-    # Department distribution
-    dept_dist = applications.values('department').annotate(count=Count('id'))
-    dept_data = {d['department']: d['count'] for d in dept_dist}
+    monthly = DailyApplicationRollup.objects.annotate(
+        month=TruncMonth('day')
+    ).values('month').annotate(count=Sum('count')).filter(count__gt=0).order_by('month')
+
+    # Status and department distribution, from the same rollups as the other figures
+    status_data = {
+        row['status']: row['count']
+        for row in DailyApplicationRollup.objects.values('status').annotate(count=Sum('count'))
+        .filter(count__gt=0).order_by('status')
+    }
+    dept_data = {
+        row['department']: row['count']
+        for row in DailyApplicationRollup.objects.values('department').annotate(count=Sum('count'))
+        .filter(count__gt=0).order_by('department')
+    }
+    total = sum(status_data.values())
 
     # Top positions
-    top_positions = applications.values('position').annotate(
-        count=Count('id')
-    ).order_by('-count')[:5]
+    top_positions = DailyApplicationRollup.objects.values('position').annotate(
+        count=Sum('count')
+    ).filter(count__gt=0).order_by('-count')[:5]
 
     return Response({
         'success': True,
         'data': {
             'overview': {
-                'total_applications': applications.count(),
-                'total_applicants': User.objects.filter(user_type='applicant').count(),
+                'total_applications': total,
+                'total_applicants': counters.count_users('applicant'),
                 'acceptance_rate': round(
-                    applications.filter(status='accepted').count() / applications.count() * 100, 2
-                ) if applications.count() > 0 else 0,
+                    status_data.get('accepted', 0) / total * 100, 2
+                ) if total > 0 else 0,
                 'avg_time_to_hire': 21
             },
             'applications_by_month': [
-                {'month': m['month'], 'count': m['count']} for m in monthly
+                {'month': m['month'].strftime('%Y-%m'), 'count': m['count']} for m in monthly
             ],
             'applications_by_status': status_data,
             'applications_by_department': dept_data,
@@ -348,19 +712,22 @@ def upcoming_interviews(request):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_departments(request):
-    departments = Department.objects.all()
-    return Response({
-        'success': True,
-        'data': DepartmentSerializer(departments, many=True).data
-    })
+    def build_data():
+        departments = Department.objects.all()
+        return {
+            'success': True,
+            'data': DepartmentSerializer(departments, many=True).data
+        }
+    return catalog_response(request, 'departments', build_data)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_positions(request):
-    positions = Position.objects.filter(is_active=True)
-    return Response({
-        'success': True,
-        'data': PositionSerializer(positions, many=True).data
-    })
-
+    def build_data():
+        positions = Position.objects.filter(is_active=True).select_related('department')
+        return {
+            'success': True,
+            'data': PositionSerializer(positions, many=True).data
+        }
+    return catalog_response(request, 'positions', build_data)
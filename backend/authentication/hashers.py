@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+from veridia.instrumentation import timed
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2 hasher with the iteration count set by
+    ``PASSWORD_PBKDF2_ITERATIONS``; size it with ``benchmark_password_hashers``.
+
+    Hashes are stored in the same format, and rehashed at the configured
+    count on the next successful login. Time spent hashing is reported to
+    the request metrics.
+    """
+
+    iterations = settings.PASSWORD_PBKDF2_ITERATIONS or hashers.PBKDF2PasswordHasher.iterations
+
+    def encode(self, password, salt, iterations=None):
+        with timed('hash'):
+            return super().encode(password, salt, iterations)
+
+    def verify(self, password, encoded):
+        with timed('hash'):
+            return super().verify(password, encoded)
+
+    def harden_runtime(self, password, encoded):
+        with timed('hash'):
+            return super().harden_runtime(password, encoded)
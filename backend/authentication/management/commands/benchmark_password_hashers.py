@@ -0,0 +1,78 @@
+import os
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand, CommandError
+
+from applications.management.commands.benchmark_endpoints import percentile
+
+# OWASP's floor for PBKDF2-HMAC-SHA256 (Password Storage Cheat Sheet, 2023)
+PBKDF2_SHA256_MINIMUM_ITERATIONS = 600_000
+SAMPLE_PASSWORD = 'correct horse battery staple'
+
+
+class Command(BaseCommand):
+    help = (
+        'Time one password verification with each of the configured PASSWORD_HASHERS on this '
+        'machine, i.e. the CPU cost of a login attempt, and suggest the PBKDF2 iteration count '
+        '(PASSWORD_PBKDF2_ITERATIONS) for a target time'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10, help='Timed verifications per hasher (default: 10)')
+        parser.add_argument(
+            '--target-ms',
+            type=float,
+            default=250,
+            help='Verification time to size the PBKDF2 iteration count for (default: 250)',
+        )
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        cpus = os.cpu_count() or 1
+        self.stdout.write(f'{cpus} CPUs, {options["iterations"]} verifications per hasher')
+        self.stdout.write(
+            f'{"hasher":<24}{"parameters":<48}{"p50_ms":>10}{"max_ms":>10}{"per_cpu/s":>12}{"per_host/s":>12}'
+        )
+
+        suggestions = []
+        for index, hasher in enumerate(get_hashers()):
+            name = hasher.algorithm + (' (default)' if index == 0 else '')
+            try:
+                encoded = hasher.encode(SAMPLE_PASSWORD, hasher.salt())
+            except ValueError as e:
+                # Argon2 and bcrypt need optional libraries
+                self.stdout.write(f'{name:<24}{e}')
+                continue
+
+            latencies = []
+            for _ in range(options['iterations']):
+                started = time.perf_counter()
+                if not hasher.verify(SAMPLE_PASSWORD, encoded):
+                    raise CommandError(f'{hasher.algorithm} did not verify its own hash')
+                latencies.append(time.perf_counter() - started)
+
+            p50 = percentile(latencies, 50)
+            summary = hasher.safe_summary(encoded)
+            parameters = ', '.join(
+                f'{key}={value}' for key, value in summary.items() if key not in ('algorithm', 'salt', 'hash')
+            )
+            self.stdout.write(
+                f'{name:<24}{parameters:<48}{p50 * 1000:>10.1f}{max(latencies) * 1000:>10.1f}'
+                f'{1 / p50:>12.1f}{cpus / p50:>12.1f}'
+            )
+            # PBKDF2's cost is linear in its iteration count
+            if index == 0 and hasattr(hasher, 'iterations') and hasher.algorithm.startswith('pbkdf2'):
+                suggestions.append((hasher, round(hasher.iterations * options['target_ms'] / (p50 * 1000), -4)))
+
+        for hasher, iterations in suggestions:
+            self.stdout.write(
+                f'\nFor {options["target_ms"]:g} ms per login attempt on this machine: '
+                f'PASSWORD_PBKDF2_ITERATIONS={iterations:.0f} (currently {hasher.iterations})'
+            )
+            if hasher.algorithm == 'pbkdf2_sha256' and iterations < PBKDF2_SHA256_MINIMUM_ITERATIONS:
+                self.stdout.write(self.style.WARNING(
+                    f'That is below the recommended minimum of {PBKDF2_SHA256_MINIMUM_ITERATIONS} '
+                    'iterations; consider more CPU for logins, or a higher target'
+                ))
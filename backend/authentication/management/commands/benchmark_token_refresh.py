@@ -0,0 +1,127 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from applications.management.commands.benchmark_endpoints import percentile
+from authentication import revocation
+from users.models import User
+
+REFRESH_PATH = '/api/v1/auth/token/refresh/'
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark token refresh with each token revocation store against a store already '
+        'holding many revoked tokens, reporting refresh throughput and latency and the rate of '
+        'revocation checks made by authenticated requests'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500, help='Timed refreshes per store (default: 500)')
+        parser.add_argument('--warmup', type=int, default=20, help='Untimed refreshes per store first (default: 20)')
+        parser.add_argument(
+            '--revoked',
+            type=int,
+            default=10000,
+            help='Tokens revoked in the store before measuring (default: 10000)',
+        )
+        parser.add_argument(
+            '--checks',
+            type=int,
+            default=10000,
+            help='Revocation checks of unrevoked tokens timed per store (default: 10000)',
+        )
+        parser.add_argument(
+            '--store',
+            action='append',
+            choices=['cache', 'bloom'],
+            help='Only benchmark this store (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        stores = options['store'] or ['cache', 'bloom']
+        self.stdout.write(
+            f'Cache {settings.TOKEN_REVOCATION_CACHE!r} '
+            f'({caches[settings.TOKEN_REVOCATION_CACHE].__class__.__name__}), '
+            f'{options["revoked"]} revoked tokens, {options["iterations"]} refreshes per store'
+        )
+        if not (jwt_settings.ROTATE_REFRESH_TOKENS and jwt_settings.BLACKLIST_AFTER_ROTATION):
+            self.stdout.write(self.style.WARNING('Refresh rotation is off: refreshes only check the store'))
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        previous_store = revocation._store
+        try:
+            user = User.objects.create_user(
+                'benchmark@example.com', None, first_name='Token', last_name='Benchmark', phone='0'
+            )
+            for index, name in enumerate(stores):
+                revocation._store = self.make_store(name)
+                self.prepare_store(revocation._store, options['revoked'])
+                metrics = self.measure(user, options)
+                if index == 0:
+                    self.stdout.write(f'{"store":<10}' + ''.join(f'{column:>16}' for column in metrics))
+                self.stdout.write(f'{name:<10}' + ''.join(f'{value:>16,.1f}' for value in metrics.values()))
+        finally:
+            revocation._store = previous_store
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def make_store(self, name):
+        cache = caches.create_connection(settings.TOKEN_REVOCATION_CACHE)
+        # A run of its own, apart from the tokens revoked by the application
+        cache.key_prefix = f'benchmark-{uuid.uuid4().hex}'
+        if name == 'bloom':
+            return revocation.BloomRevocationStore(
+                cache,
+                settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+                settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+                settings.TOKEN_REVOCATION_BLOOM_SYNC_INTERVAL,
+            )
+        return revocation.CacheRevocationStore(cache)
+
+    def prepare_store(self, store, count):
+        # Expire soon after the run
+        expires_at = time.time() + 600
+        for _ in range(count):
+            store.revoke(uuid.uuid4().hex, expires_at)
+
+    def measure(self, user, options):
+        client = Client()
+        refresh_token = str(RefreshToken.for_user(user))
+        latencies = []
+        for iteration in range(options['warmup'] + options['iterations']):
+            started = time.perf_counter()
+            response = client.post(REFRESH_PATH, {'refresh_token': refresh_token}, content_type='application/json')
+            elapsed = time.perf_counter() - started
+            if response.status_code != 200:
+                raise CommandError(f'{REFRESH_PATH} returned {response.status_code}')
+            refresh_token = response.json().get('refresh_token', refresh_token)
+            if iteration >= options['warmup']:
+                latencies.append(elapsed)
+
+        store = revocation._store
+        jtis = [uuid.uuid4().hex for _ in range(options['checks'])]
+        started = time.perf_counter()
+        revoked = sum(store.is_revoked(jti) for jti in jtis)
+        check_seconds = time.perf_counter() - started
+        if revoked:
+            raise CommandError(f'{revoked} unrevoked tokens were reported revoked')
+
+        return {
+            'refreshes_per_s': len(latencies) / sum(latencies),
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'checks_per_s': len(jtis) / check_seconds,
+        }
+
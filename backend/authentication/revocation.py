@@ -0,0 +1,199 @@
+"""
+Revocation of JWTs before they expire: logout, and refresh token rotation.
+
+Revoked ``jti`` claims are kept in the ``TOKEN_REVOCATION_CACHE`` cache
+until the token would have expired anyway, so the store holds only tokens
+that could still be presented and never needs pruning, unlike simplejwt's
+``token_blacklist`` tables. ``revoke`` uses ``cache.add``, so of two
+requests revoking the same token exactly one succeeds; refresh rotation
+relies on that to let a refresh token be used only once.
+
+Every authenticated request checks its access token, which costs a round
+trip to the shared cache. With ``TOKEN_REVOCATION_BLOOM`` each process also
+keeps a Bloom filter of the revoked ``jti``s and only asks the cache about
+tokens the filter may contain; that is, almost never. Processes learn about
+revocations made elsewhere from a log kept in the cache, read at most every
+``TOKEN_REVOCATION_BLOOM_SYNC_INTERVAL`` seconds, which is therefore how long
+another process may still accept a token revoked elsewhere.
+
+The shared cache must be one all processes see (Redis). The local-memory
+cache used without ``REDIS_URL`` makes revocations per process, which is
+enough for tests and ``runserver``.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.settings import api_settings
+
+LOG_COUNTER_KEY = 'jwt:revoked-log'
+LOG_FLOOR_KEY = 'jwt:revoked-log:floor'
+LOG_READ_BATCH = 1000
+# Seconds a missing log entry near the head is retried before it is taken as expired
+PENDING_TIMEOUT = 60
+
+
+def _revoked_key(jti):
+    return f'jwt:revoked:{jti}'
+
+
+def _log_key(position):
+    return f'jwt:revoked-log:{position}'
+
+
+class BloomFilter:
+    """Set membership with false positives at about ``error_rate`` for up to ``capacity`` keys."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+        # Double hashing: k positions from two hashes
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class CacheRevocationStore:
+    def __init__(self, cache):
+        self.cache = cache
+
+    def revoke(self, jti, expires_at):
+        """Revoke ``jti`` until ``expires_at`` (a timestamp); False if it was revoked already."""
+        timeout = math.ceil(expires_at - time.time())
+        if timeout <= 0:
+            # Expired tokens are rejected anyway
+            return True
+        return self.cache.add(_revoked_key(jti), 1, timeout)
+
+    def is_revoked(self, jti):
+        return self.cache.get(_revoked_key(jti)) is not None
+
+
+class BloomRevocationStore(CacheRevocationStore):
+    """
+    ``CacheRevocationStore`` answering most lookups from a local Bloom filter.
+
+    Revocations are also appended to a log in the cache: a counter, and an
+    entry per position expiring with its token. Each process reads the log
+    from where it stopped; when its filter is full it starts a new one from
+    the oldest entry still alive, whose position is shared as the floor so
+    new processes don't read expired history.
+    """
+
+    def __init__(self, cache, capacity, error_rate, sync_interval):
+        super().__init__(cache)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.lock = threading.Lock()
+        self.filter = None
+        self.position = 0
+        self.pending = {}
+        self.synced_at = None
+
+    def revoke(self, jti, expires_at):
+        revoked = super().revoke(jti, expires_at)
+        timeout = math.ceil(expires_at - time.time())
+        if revoked and timeout > 0:
+            self.cache.add(LOG_COUNTER_KEY, 0, None)
+            position = self.cache.incr(LOG_COUNTER_KEY)
+            self.cache.set(_log_key(position), (jti, expires_at), timeout)
+            with self.lock:
+                if self.filter is not None:
+                    self.filter.add(jti)
+        return revoked
+
+    def is_revoked(self, jti):
+        self.sync()
+        if jti not in self.filter:
+            return False
+        return super().is_revoked(jti)
+
+    def sync(self):
+        now = time.monotonic()
+        if self.synced_at is not None and now - self.synced_at < self.sync_interval:
+            return
+        with self.lock:
+            if self.synced_at is not None and now - self.synced_at < self.sync_interval:
+                return
+            head = self.cache.get(LOG_COUNTER_KEY) or 0
+            rebuild = self.filter is None or head < self.position or self.filter.count >= self.capacity
+            if rebuild:
+                # First use, a lost log (cache restart), or a full filter
+                self.filter = BloomFilter(self.capacity, self.error_rate)
+                self.position = min(self.cache.get(LOG_FLOOR_KEY) or 0, head)
+                self.pending = {}
+            oldest = self.read_log(head)
+            if rebuild:
+                self.cache.set(LOG_FLOOR_KEY, head if oldest is None else oldest - 1, None)
+            self.synced_at = now
+
+    def read_log(self, head):
+        """Add the log entries up to ``head`` to the filter; return the oldest position still alive."""
+        now = time.time()
+        oldest = None
+        positions = sorted(self.pending) + list(range(self.position + 1, head + 1))
+        for start in range(0, len(positions), LOG_READ_BATCH):
+            batch = positions[start:start + LOG_READ_BATCH]
+            entries = self.cache.get_many([_log_key(position) for position in batch])
+            for position in batch:
+                entry = entries.get(_log_key(position))
+                if entry is None:
+                    # Expired, or counted by a revocation that hasn't written its entry yet
+                    if position > head - LOG_READ_BATCH:
+                        first_missed = self.pending.setdefault(position, now)
+                        if now - first_missed < PENDING_TIMEOUT:
+                            oldest = position if oldest is None else min(oldest, position)
+                            continue
+                    self.pending.pop(position, None)
+                    continue
+                self.pending.pop(position, None)
+                if entry[1] > now:
+                    self.filter.add(entry[0])
+                    oldest = position if oldest is None else min(oldest, position)
+        self.position = max(self.position, head)
+        return oldest
+
+
+_store = None
+
+
+def get_revocation_store():
+    global _store
+    if _store is None:
+        cache = caches[settings.TOKEN_REVOCATION_CACHE]
+        if settings.TOKEN_REVOCATION_BLOOM:
+            _store = BloomRevocationStore(
+                cache,
+                settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+                settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+                settings.TOKEN_REVOCATION_BLOOM_SYNC_INTERVAL,
+            )
+        else:
+            _store = CacheRevocationStore(cache)
+    return _store
+
+
+def revoke_token(token):
+    """Revoke a validated simplejwt ``token``; False if it was revoked already."""
+    return get_revocation_store().revoke(token[api_settings.JTI_CLAIM], token['exp'])
+
+
+def is_token_revoked(token):
+    return get_revocation_store().is_revoked(token[api_settings.JTI_CLAIM])
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import User
+from .user_cache import invalidate_user_on_commit
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, raw=False, **kwargs):
+    # Any saved change may matter: deactivation, user_type, a new password
+    if raw:
+        return
+    invalidate_user_on_commit(getattr(instance, api_settings.USER_ID_FIELD))
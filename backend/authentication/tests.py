@@ -0,0 +1,216 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import User
+from . import user_cache
+from .hashers import PBKDF2PasswordHasher
+from .revocation import BloomFilter, BloomRevocationStore
+
+LOGIN_URL = '/api/v1/auth/login/'
+LOGOUT_URL = '/api/v1/auth/logout/'
+REFRESH_URL = '/api/v1/auth/token/refresh/'
+
+
+def create_user(email='applicant@example.com', password='correct horse', **extra):
+    return User.objects.create_user(email, password, first_name='Applicant', last_name='User', phone='0', **extra)
+
+
+class PasswordHashTimingTests(TestCase):
+    def hash_observations(self):
+        labels = {'route': LOGIN_URL.lstrip('/'), 'method': 'POST'}
+        return REGISTRY.get_sample_value('http_request_password_hash_duration_seconds_count', labels) or 0
+
+    def test_login_reports_hashing_time(self):
+        create_user()
+        before = self.hash_observations()
+        response = APIClient().post(
+            LOGIN_URL, {'email': 'applicant@example.com', 'password': 'correct horse'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.hash_observations(), before + 1)
+
+
+class UserCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
+    def setUp(self):
+        cache.clear()
+        user_cache.local_users.clear()
+
+    def get_user(self, queries):
+        with self.assertNumQueries(queries):
+            return user_cache.get_user(self.user.id)
+
+    def test_users_are_read_once(self):
+        self.assertEqual(self.get_user(1), self.user)
+        self.get_user(0)
+        # Another process: only the shared cache
+        user_cache.local_users.clear()
+        self.get_user(0)
+
+    def test_password_is_not_cached(self):
+        user = self.get_user(1)
+        entry = cache.get(f'auth:user:{self.user.id}')
+        self.assertNotIn('password', entry[1])
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password('correct horse'))
+
+    def test_save_invalidates_on_commit(self):
+        self.get_user(1)
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.get(pk=self.user.pk)
+            user.is_active = False
+            user.save()
+
+        self.assertFalse(self.get_user(1).is_active)
+
+    def test_update_invalidates_on_commit(self):
+        self.get_user(1)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).update(user_type='admin')
+            user_cache.invalidate_user_on_commit(self.user.pk)
+
+        self.assertEqual(self.get_user(1).user_type, 'admin')
+
+    def test_entries_from_before_a_change_are_not_served(self):
+        self.get_user(1)
+        stale = cache.get(f'auth:user:{self.user.id}')
+        user_cache.invalidate_user(self.user.id)
+        # A request that read the user before the change stores it afterwards
+        cache.set(f'auth:user:{self.user.id}', stale)
+        user_cache.local_users.clear()
+
+        self.get_user(1)
+
+    def test_instances_are_not_shared(self):
+        first = self.get_user(1)
+        first.first_name = 'Changed'
+        self.assertEqual(self.get_user(0).first_name, 'Applicant')
+
+    def test_deactivated_users_are_rejected(self):
+        token = RefreshToken.for_user(self.user).access_token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(client.get('/api/v1/profile/').status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).update(is_active=False)
+            user_cache.invalidate_user_on_commit(self.user.pk)
+        self.assertEqual(client.get('/api/v1/profile/').status_code, 401)
+
+
+class TokenRevocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
+    def setUp(self):
+        cache.clear()
+
+    def refresh(self, refresh_token):
+        return APIClient().post(REFRESH_URL, {'refresh_token': refresh_token}, format='json')
+
+    def test_refresh_tokens_are_single_use(self):
+        refresh_token = str(RefreshToken.for_user(self.user))
+        response = self.refresh(refresh_token)
+        self.assertEqual(response.status_code, 200)
+        rotated = response.data['refresh_token']
+        self.assertNotEqual(rotated, refresh_token)
+
+        self.assertEqual(self.refresh(refresh_token).status_code, 401)
+        self.assertEqual(self.refresh(rotated).status_code, 200)
+
+    def test_logout_revokes_both_tokens(self):
+        refresh = RefreshToken.for_user(self.user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+        self.assertEqual(client.post(LOGOUT_URL, {'refresh_token': str(refresh)}, format='json').status_code, 200)
+
+        self.assertEqual(client.get('/api/v1/profile/').status_code, 401)
+        self.assertEqual(self.refresh(str(refresh)).status_code, 401)
+
+
+class BloomRevocationStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def store(self):
+        return BloomRevocationStore(cache, capacity=100, error_rate=0.01, sync_interval=0)
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        keys = [f'jti-{i}' for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f'other-{i}' in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_processes_learn_revocations_from_the_log(self):
+        first, second = self.store(), self.store()
+        self.assertFalse(second.is_revoked('a'))
+        expires_at = time.time() + 60
+        self.assertTrue(first.revoke('a', expires_at))
+        self.assertFalse(first.revoke('a', expires_at))
+
+        self.assertTrue(first.is_revoked('a'))
+        self.assertTrue(second.is_revoked('a'))
+        self.assertFalse(second.is_revoked('b'))
+        # A process started later reads the history too
+        self.assertTrue(self.store().is_revoked('a'))
+
+    def test_filter_is_rebuilt_when_the_log_is_lost(self):
+        store = self.store()
+        store.revoke('a', time.time() + 60)
+        self.assertTrue(store.is_revoked('a'))
+
+        cache.clear()
+        self.assertFalse(store.is_revoked('a'))
+        store.revoke('b', time.time() + 60)
+        self.assertTrue(self.store().is_revoked('b'))
+
+    def test_full_filter_starts_over_from_live_entries(self):
+        store = BloomRevocationStore(cache, capacity=3, error_rate=0.01, sync_interval=0)
+        store.sync()
+        for jti in ['a', 'b', 'c', 'd']:
+            store.revoke(jti, time.time() + 60)
+        # 'a' expired
+        cache.delete_many(['jwt:revoked:a', 'jwt:revoked-log:1'])
+
+        self.assertTrue(store.is_revoked('d'))
+        self.assertEqual(store.filter.count, 3)
+        self.assertTrue(all(jti in store.filter for jti in 'bcd'))
+
+
+class LoginHashingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_user()
+        create_user('inactive@example.com', is_active=False)
+
+    def login(self, email, password='correct horse'):
+        original = PBKDF2PasswordHasher.encode
+        with mock.patch.object(PBKDF2PasswordHasher, 'encode', autospec=True, side_effect=original) as encode:
+            response = APIClient().post(LOGIN_URL, {'email': email, 'password': password}, format='json')
+        return response, encode.call_count
+
+    def test_one_hash_per_attempt(self):
+        for email, password, status_code in [
+            ('applicant@example.com', 'correct horse', 200),
+            ('applicant@example.com', 'wrong', 401),
+            ('unknown@example.com', 'correct horse', 401),
+            ('inactive@example.com', 'correct horse', 401),
+        ]:
+            with self.subTest(email=email, password=password):
+                response, hashes = self.login(email, password)
+                self.assertEqual(response.status_code, status_code)
+                self.assertEqual(hashes, 1)
@@ -0,0 +1,151 @@
+"""
+Two-level cache of the users behind JWT-authenticated requests.
+
+Resolving ``request.user`` used to cost a ``SELECT`` on every API call,
+most of them dashboard polling by the same few users. Users are now looked
+up in a small per-process LRU (``USER_CACHE_LOCAL_TIMEOUT`` seconds), then
+in the shared cache (``USER_CACHE_TIMEOUT`` seconds), and only then in the
+database.
+
+The password hash is never cached: instances are rebuilt with ``password``
+deferred, so reading it loads it from the database, and ``save()`` only
+writes the fields that were loaded.
+
+Saving or deleting a user bumps their version in the shared cache once the
+transaction commits. Entries carry the version they were read under, so an
+entry from before the change is never served again, even when a concurrent
+request stores it after the bump. Other processes may keep serving their
+local copy for up to ``USER_CACHE_LOCAL_TIMEOUT`` seconds.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router, transaction
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import User
+
+LOCAL_CACHE_SIZE = 1024
+
+
+class LocalCache:
+    """Thread-safe LRU of at most ``size`` entries, each kept for ``timeout`` seconds."""
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_users = LocalCache(LOCAL_CACHE_SIZE)
+
+
+def _cached_fields():
+    return [field.attname for field in User._meta.concrete_fields if field.attname != 'password']
+
+
+def _entry_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def _version_key(user_id):
+    return f'auth:user:{user_id}:version'
+
+
+def _seed_version(user_id):
+    # Seeded from the clock so a lost version key never matches an old entry
+    cache.add(_version_key(user_id), time.time_ns(), settings.USER_CACHE_TIMEOUT)
+    return cache.get(_version_key(user_id))
+
+
+def _build_user(values):
+    names = [name for name in _cached_fields() if name in values]
+    # Copied so in-place changes to mutable values (JSON fields) stay with this instance
+    row = copy.deepcopy([values[name] for name in names])
+    return User.from_db(router.db_for_read(User), names, row)
+
+
+def get_user(user_id):
+    """
+    Return the user whose ``USER_ID_FIELD`` is ``user_id``, or None.
+
+    Every call returns a fresh instance, so changes a request makes to
+    ``request.user`` never leak into another.
+    """
+    values = local_users.get(user_id)
+    if values is not None:
+        return _build_user(values)
+
+    version = None
+    if settings.USER_CACHE_TIMEOUT:
+        found = cache.get_many([_entry_key(user_id), _version_key(user_id)])
+        version = found.get(_version_key(user_id))
+        if version is None:
+            version = _seed_version(user_id)
+        entry = found.get(_entry_key(user_id))
+        if entry is not None and entry[0] == version:
+            values = entry[1]
+
+    if values is None:
+        names = _cached_fields()
+        row = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values_list(*names).first()
+        if row is None:
+            return None
+        values = dict(zip(names, row))
+        if settings.USER_CACHE_TIMEOUT:
+            cache.set(_entry_key(user_id), (version, values), settings.USER_CACHE_TIMEOUT)
+
+    if settings.USER_CACHE_LOCAL_TIMEOUT:
+        local_users.set(user_id, values, settings.USER_CACHE_LOCAL_TIMEOUT)
+    return _build_user(values)
+
+
+def invalidate_user(user_id):
+    """Drop the cached copies of a user right away; see ``invalidate_user_on_commit``."""
+    local_users.delete(user_id)
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        _seed_version(user_id)
+    cache.delete(_entry_key(user_id))
+
+
+def invalidate_user_on_commit(user_id):
+    """
+    Drop the cached copies of a user once the current transaction commits.
+
+    Needed after changing users with ``QuerySet.update()``, which sends no
+    signals; saves and deletes are handled by ``authentication.signals``.
+    """
+    transaction.on_commit(lambda: invalidate_user(user_id))
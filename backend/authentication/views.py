@@ -2,11 +2,15 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
-from users.models import User
+from django.db import transaction
 from users.serializers import UserSerializer, UserRegistrationSerializer
+from notifications import outbox
 from notifications.tasks import send_verification_email
+from .revocation import is_token_revoked, revoke_token
 
 
 @api_view(['POST'])
@@ -14,13 +18,11 @@ from notifications.tasks import send_verification_email
 def register(request):
     serializer = UserRegistrationSerializer(data=request.data)
     if serializer.is_valid():
-        user = serializer.save()
-        # Send verification email (async in production)
-        try:
-            send_verification_email(user.id)
-        except:
-            pass  # Email sending can fail in development
-        
+        with transaction.atomic():
+            user = serializer.save()
+            # Send verification email, relayed from the outbox after commit
+            outbox.enqueue(send_verification_email, user.id)
+
         return Response({
             'success': True,
             'message': 'Registration successful. Please check your email for verification.',
@@ -52,17 +54,12 @@ def login(request):
             }
         }, status=status.HTTP_400_BAD_REQUEST)
 
+    # Exactly one password hash per attempt: ModelBackend verifies the stored hash,
+    # or hashes the password anyway for unknown emails so they take just as long.
+    # Inactive users are rejected after the check, for the same reason.
     user = authenticate(request, username=email, password=password)
-    
-    if user is None:
-        try:
-            user = User.objects.get(email=email)
-            if not user.check_password(password):
-                user = None
-        except User.DoesNotExist:
-            user = None
 
-    if user is None or not user.is_active:
+    if user is None:
         return Response({
             'success': False,
             'error': {
@@ -92,13 +89,15 @@ def login(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout(request):
-    try:
-        refresh_token = request.data.get('refresh_token')
-        if refresh_token:
-            token = RefreshToken(refresh_token)
-            token.blacklist()
-    except Exception as e:
-        pass  # Token might already be invalid
+    # Ends the session right away: the refresh token can't be used again, nor the access token
+    refresh_token = request.data.get('refresh_token')
+    if refresh_token:
+        try:
+            revoke_token(RefreshToken(refresh_token))
+        except TokenError:
+            pass  # Token might already be invalid
+    if request.auth is not None:
+        revoke_token(request.auth)
     
     return Response({
         'success': True,
@@ -109,8 +108,6 @@ def logout(request):
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def token_refresh(request):
-    from rest_framework_simplejwt.tokens import RefreshToken
-    
     refresh_token = request.data.get('refresh_token')
     if not refresh_token:
         return Response({
@@ -123,11 +120,22 @@ def token_refresh(request):
 
     try:
         token = RefreshToken(refresh_token)
-        return Response({
+        if is_token_revoked(token):
+            raise TokenError('Token has been revoked')
+        data = {
             'success': True,
             'access_token': str(token.access_token)
-        }, status=status.HTTP_200_OK)
-    except Exception as e:
+        }
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            # Claiming the old token fails for all but one of concurrent refreshes with it
+            if jwt_settings.BLACKLIST_AFTER_ROTATION and not revoke_token(token):
+                raise TokenError('Token has been revoked')
+            token.set_jti()
+            token.set_exp()
+            token.set_iat()
+            data['refresh_token'] = str(token)
+        return Response(data, status=status.HTTP_200_OK)
+    except TokenError:
         return Response({
             'success': False,
             'error': {
@@ -135,4 +143,3 @@ def token_refresh(request):
                 'message': 'Invalid or expired refresh token'
             }
         }, status=status.HTTP_401_UNAUTHORIZED)
-
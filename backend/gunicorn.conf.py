@@ -0,0 +1,10 @@
+"""Gunicorn settings used by docker-compose.prod.yml."""
+import os
+
+
+def child_exit(server, worker):
+    # Drop the live gauges of a worker that exited; its counters and histograms are kept
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
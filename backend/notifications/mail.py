@@ -0,0 +1,66 @@
+from smtplib import SMTPException
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+# Transient delivery failures worth retrying (socket errors are OSErrors)
+RETRYABLE_ERRORS = (SMTPException, OSError)
+
+
+class MailBatch:
+    """
+    Collects outgoing messages and delivers them over a single connection.
+
+    Usable as a context manager; the batch is sent on a clean exit::
+
+        with MailBatch() as batch:
+            batch.add(subject, body, [recipient])
+    """
+
+    def __init__(self, connection=None):
+        self.connection = connection
+        self.messages = []
+
+    def add(self, subject, body, to, from_email=None):
+        self.messages.append(EmailMessage(
+            subject, body, from_email or settings.DEFAULT_FROM_EMAIL, to
+        ))
+
+    def send(self):
+        """Send all queued messages with one ``send_messages`` call; returns the number sent."""
+        if not self.messages:
+            return 0
+        connection = self.connection or get_connection(fail_silently=False)
+        sent = connection.send_messages(self.messages)
+        self.messages = []
+        return sent or 0
+
+    def send_each(self):
+        """
+        Send the queued messages one at a time over a single connection and
+        return the indexes of those that failed with a retryable error, so a
+        retry can send just those. Failing to connect still raises.
+        """
+        if not self.messages:
+            return []
+        connection = self.connection or get_connection(fail_silently=False)
+        failed = []
+        opened = connection.open()
+        try:
+            for index, message in enumerate(self.messages):
+                try:
+                    connection.send_messages([message])
+                except RETRYABLE_ERRORS:
+                    failed.append(index)
+        finally:
+            if opened:
+                connection.close()
+        self.messages = []
+        return failed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.send()
@@ -0,0 +1,78 @@
+import socket
+import time
+
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand, CommandError
+
+from notifications.mail import MailBatch
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark mail throughput against a local aiosmtpd stand-in: one SMTP '
+        'connection per message versus one connection per batch. '
+        'Requires the aiosmtpd package (pip install aiosmtpd).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--messages',
+            type=int,
+            default=500,
+            help='Number of messages sent by each strategy (default: 500)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Messages sent per connection in batched mode (default: 100)',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from aiosmtpd.controller import Controller
+            from aiosmtpd.handlers import Sink
+        except ImportError:
+            raise CommandError('aiosmtpd is not installed (pip install aiosmtpd)')
+
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+
+        controller = Controller(Sink(), hostname='127.0.0.1', port=port)
+        controller.start()
+        try:
+            total = options['messages']
+            batch_size = options['batch_size']
+
+            def connection():
+                return get_connection(
+                    'django.core.mail.backends.smtp.EmailBackend',
+                    host='127.0.0.1', port=port, use_tls=False, use_ssl=False,
+                    username='', password='', fail_silently=False,
+                )
+
+            def message(i):
+                return EmailMessage(
+                    f'Benchmark message {i}', 'Benchmark body\n' * 20,
+                    'bench@veridia.local', [f'admin{i}@veridia.local'],
+                )
+
+            start = time.perf_counter()
+            for i in range(total):
+                connection().send_messages([message(i)])
+            per_message = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for offset in range(0, total, batch_size):
+                batch = MailBatch(connection=connection())
+                batch.messages = [message(i) for i in range(offset, min(offset + batch_size, total))]
+                batch.send()
+            batched = time.perf_counter() - start
+        finally:
+            controller.stop()
+
+        self.stdout.write(f'Messages: {total} (batch size {batch_size})')
+        self.stdout.write(f'  connection per message: {total / per_message:8.1f} msg/s ({per_message:.2f}s)')
+        self.stdout.write(f'  connection per batch:   {total / batched:8.1f} msg/s ({batched:.2f}s)')
+        self.stdout.write(self.style.SUCCESS(f'Speed-up: {per_message / batched:.1f}x'))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from notifications import outbox
+from notifications.models import OutboxMessage
+
+
+class Command(BaseCommand):
+    help = 'Dispatch pending notification outbox messages, optionally replaying or purging old ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Messages dispatched per batch (default: OUTBOX_RELAY_BATCH_SIZE)',
+        )
+        parser.add_argument(
+            '--replay-from',
+            type=int,
+            default=None,
+            help='Mark messages with id >= this value as pending again before relaying',
+        )
+        parser.add_argument(
+            '--replay-to',
+            type=int,
+            default=None,
+            help='Upper bound (inclusive) for --replay-from',
+        )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='Delete dispatched messages older than OUTBOX_RETENTION_DAYS',
+        )
+
+    def handle(self, *args, **options):
+        if options['replay_from'] is not None:
+            replayed = outbox.replay(options['replay_from'], options['replay_to'])
+            self.stdout.write(self.style.WARNING(f'Marked {replayed} message(s) for replay'))
+
+        dispatched = outbox.drain(options['batch_size'])
+        pending = OutboxMessage.objects.filter(dispatched_at__isnull=True).count()
+        self.stdout.write(self.style.SUCCESS(f'Dispatched {dispatched} message(s), {pending} pending'))
+
+        if options['purge']:
+            purged = outbox.purge_dispatched()
+            self.stdout.write(f'Purged {purged} dispatched message(s)')
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:24
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def start_digest_after_existing_applications(apps, schema_editor):
+    # Existing applications predate the digest and must not be re-announced
+    Application = apps.get_model('applications', 'Application')
+    DigestState = apps.get_model('notifications', 'DigestState')
+    last_id = Application.objects.aggregate(last=Max('id'))['last'] or 0
+    DigestState.objects.create(name='hr-applications', last_application_id=last_id)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('applications', '0006_daily_application_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DigestState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_application_id', models.BigIntegerField(default=0)),
+                ('last_sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'notification_digests',
+            },
+        ),
+        migrations.RunPython(start_digest_after_existing_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.9 on 2026-10-18 00:14
+
+from django.db import migrations
+from django.db.models import Max
+from django.utils import timezone
+
+
+def mark_digested_applications(apps, schema_editor):
+    # Everything up to the old high-water mark has been announced already
+    Application = apps.get_model('applications', 'Application')
+    DigestState = apps.get_model('notifications', 'DigestState')
+    for state in DigestState.objects.filter(name='hr-applications'):
+        Application.objects.filter(id__lte=state.last_application_id, hr_digested_at__isnull=True).update(
+            hr_digested_at=state.last_sent_at or timezone.now()
+        )
+
+
+def restore_high_water_mark(apps, schema_editor):
+    Application = apps.get_model('applications', 'Application')
+    DigestState = apps.get_model('notifications', 'DigestState')
+    last_id = Application.objects.filter(hr_digested_at__isnull=False).aggregate(last=Max('id'))['last'] or 0
+    DigestState.objects.filter(name='hr-applications').update(last_application_id=last_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0010_application_hr_digested_at'),
+        ('notifications', '0002_outbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_digested_applications, restore_high_water_mark),
+        migrations.RemoveField(
+            model_name='digeststate',
+            name='last_application_id',
+        ),
+    ]
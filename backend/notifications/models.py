@@ -0,0 +1,40 @@
+from django.db import models
+
+
+class DigestState(models.Model):
+    """
+    A periodic notification digest. Its row lock serializes the runs that claim
+    items; the items themselves carry their own marker (``hr_digested_at``).
+    """
+    name = models.CharField(max_length=100, unique=True)
+    last_sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} (last sent {self.last_sent_at or 'never'})"
+
+    class Meta:
+        db_table = 'notification_digests'
+
+
+class OutboxMessage(models.Model):
+    """
+    A side effect (Celery task call) recorded in the same transaction as the
+    change that caused it, and dispatched by the outbox relay after commit.
+    """
+    task_name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return f"{self.task_name}{tuple(self.args)}"
+
+    class Meta:
+        db_table = 'notification_outbox'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(dispatched_at__isnull=True),
+                         name='notification_outbox_pending'),
+        ]
@@ -0,0 +1,125 @@
+"""
+Transactional outbox for notification side effects.
+
+``enqueue`` records a task call as an ``OutboxMessage`` inside the caller's
+transaction, so it is committed (or rolled back) together with the data it
+is about. After commit the relay is nudged; a periodic relay run picks up
+anything the nudge missed (e.g. while the broker was down). Delivery is
+at-least-once, except with eager tasks: the relay then claims a batch before
+running it, and a process dying mid-batch loses the claimed messages.
+"""
+import logging
+from datetime import timedelta
+
+from celery import current_app
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from veridia.instrumentation import timed
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(task, *args):
+    """Record a call of Celery ``task`` with ``args`` in the current transaction."""
+    message = OutboxMessage.objects.create(task_name=task.name, args=list(args))
+    transaction.on_commit(_nudge_relay, robust=True)
+    return message
+
+
+def _nudge_relay():
+    from .tasks import relay_outbox
+
+    # Broker round trip, or the whole delivery when tasks run eagerly
+    with timed('notify'):
+        relay_outbox.delay()
+
+
+def relay_pending(batch_size=None):
+    """Dispatch up to ``batch_size`` pending outbox messages; returns the number dispatched."""
+    batch_size = batch_size or settings.OUTBOX_RELAY_BATCH_SIZE
+    if current_app.conf.task_always_eager:
+        return _relay_eager(batch_size)
+    with transaction.atomic():
+        messages = _lock_pending(batch_size)
+        dispatched, failed = _dispatch(messages)
+        OutboxMessage.objects.bulk_update(
+            dispatched + failed, ['dispatched_at', 'attempts', 'last_error']
+        )
+    return len(dispatched)
+
+
+def _relay_eager(batch_size):
+    # Eager tasks deliver (and retry) in this process, so dispatching can take
+    # as long as the SMTP round trips. Claim the batch and commit before
+    # sending rather than holding the row locks meanwhile.
+    with transaction.atomic():
+        messages = _lock_pending(batch_size)
+        claimed_at = timezone.now()
+        for message in messages:
+            message.dispatched_at = claimed_at
+        OutboxMessage.objects.bulk_update(messages, ['dispatched_at'])
+
+    dispatched, failed = _dispatch(messages)
+    if failed:
+        # Release what was not sent for the next run
+        for message in messages[len(dispatched):]:
+            message.dispatched_at = None
+    OutboxMessage.objects.bulk_update(messages, ['dispatched_at', 'attempts', 'last_error'])
+    return len(dispatched)
+
+
+def _lock_pending(batch_size):
+    pending = OutboxMessage.objects.filter(dispatched_at__isnull=True).order_by('id')
+    if connection.features.has_select_for_update_skip_locked:
+        # Concurrent relays each take a disjoint batch
+        pending = pending.select_for_update(skip_locked=True)
+    return list(pending[:batch_size])
+
+
+def _dispatch(messages):
+    """Send ``messages`` in order, stopping at the first failure; returns ``(dispatched, failed)``."""
+    dispatched = []
+    failed = []
+    for message in messages:
+        message.attempts += 1
+        try:
+            current_app.tasks[message.task_name].apply_async(args=message.args)
+        except Exception as e:
+            message.last_error = str(e)
+            failed.append(message)
+            logger.warning('Outbox message %s could not be dispatched: %s', message.id, e)
+            # The broker is most likely unavailable; leave the rest for the next run
+            break
+        message.dispatched_at = timezone.now()
+        dispatched.append(message)
+    return dispatched, failed
+
+
+def drain(batch_size=None):
+    """Relay batches until no pending message is left or a dispatch fails."""
+    batch_size = batch_size or settings.OUTBOX_RELAY_BATCH_SIZE
+    total = 0
+    while True:
+        dispatched = relay_pending(batch_size)
+        total += dispatched
+        if dispatched < batch_size:
+            return total
+
+
+def purge_dispatched(older_than_days=None):
+    """Delete dispatched messages older than the retention period; returns the number deleted."""
+    days = settings.OUTBOX_RETENTION_DAYS if older_than_days is None else older_than_days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = OutboxMessage.objects.filter(dispatched_at__lt=cutoff).delete()
+    return deleted
+
+
+def replay(from_id, to_id=None):
+    """Mark messages in ``[from_id, to_id]`` as pending again so the relay re-dispatches them."""
+    messages = OutboxMessage.objects.filter(id__gte=from_id)
+    if to_id is not None:
+        messages = messages.filter(id__lte=to_id)
+    return messages.update(dispatched_at=None)
@@ -1,146 +1,288 @@
+import logging
+
+from celery import shared_task
+from celery.utils.time import get_exponential_backoff_interval
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from applications.models import Application
 from users.models import User
+from . import outbox
+from .mail import RETRYABLE_ERRORS, MailBatch
+from .models import DigestState
+
+logger = logging.getLogger(__name__)
+
+HR_DIGEST_NAME = 'hr-applications'
+
+NOTIFICATION_TASK_OPTIONS = {
+    'autoretry_for': RETRYABLE_ERRORS,
+    'retry_backoff': True,
+    'retry_backoff_max': 600,
+    'retry_jitter': True,
+    'max_retries': settings.NOTIFICATION_MAX_RETRIES,
+}
+
+notification_task = shared_task(**NOTIFICATION_TASK_OPTIONS)
+
+
+@shared_task(ignore_result=True)
+def relay_outbox():
+    """Dispatch pending outbox messages in batches"""
+    return outbox.drain()
 
 
+@shared_task(ignore_result=True)
+def purge_outbox():
+    """Delete dispatched outbox messages past the retention period"""
+    return outbox.purge_dispatched()
+
+
+@notification_task
 def send_verification_email(user_id):
     """Send email verification to new user"""
     try:
         user = User.objects.get(id=user_id)
-        subject = 'Welcome to Veridia - Verify Your Email'
-        message = f"""
+    except User.DoesNotExist:
+        logger.warning('Verification email skipped, user %s no longer exists', user_id)
+        return
+
+    subject = 'Welcome to Veridia - Verify Your Email'
+    message = f"""
         Hello {user.first_name},
-        
+
         Thank you for registering with Veridia! Please verify your email address to complete your registration.
-        
+
         Best regards,
         Veridia Team
         """
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-            fail_silently=False,
-        )
-    except Exception as e:
-        print(f"Error sending verification email: {e}")
+    send_mail(
+        subject,
+        message,
+        settings.DEFAULT_FROM_EMAIL,
+        [user.email],
+        fail_silently=False,
+    )
 
 
+@notification_task
 def send_application_confirmation(application_id):
-    """Send confirmation email to applicant and notification to HR"""
+    """Send confirmation email to applicant and queue the notification to HR"""
     try:
-        application = Application.objects.get(id=application_id)
-        applicant = application.applicant
-        
-        # Email to applicant
-        subject = f'Application Received - {application.position}'
-        message = f"""
+        application = Application.objects.select_related('applicant').get(id=application_id)
+    except Application.DoesNotExist:
+        logger.warning('Application confirmation skipped, application %s no longer exists', application_id)
+        return
+    applicant = application.applicant
+
+    # Email to applicant
+    subject = f'Application Received - {application.position}'
+    message = f"""
         Hello {applicant.first_name},
-        
+
         Thank you for your interest in the {application.position} position at Veridia.
         We have received your application and will review it shortly.
-        
+
         Application Details:
         - Position: {application.position}
         - Department: {application.department}
         - Applied Date: {application.applied_date.strftime("%B %d, %Y")}
-        
+
         We will get back to you soon with an update.
-        
+
         Best regards,
         Veridia HR Team
         """
-        send_mail(
-            subject,
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [applicant.email],
-            fail_silently=False,
-        )
-        
-        # Email to HR team (if configured)
-        admin_users = User.objects.filter(user_type='admin', is_active=True)
-        if admin_users.exists():
-            hr_subject = f'New Application Received - {application.position}'
-            hr_message = f"""
+    send_mail(
+        subject,
+        message,
+        settings.DEFAULT_FROM_EMAIL,
+        [applicant.email],
+        fail_silently=False,
+    )
+
+    # Admins get the periodic digest; otherwise a separate task so a retry of
+    # the HR mail never re-sends the applicant's
+    if settings.HR_DIGEST_INTERVAL_MINUTES <= 0:
+        send_hr_application_notification.delay(application_id)
+
+
+@notification_task
+def send_hr_application_notification(application_id):
+    """Notify the HR team (active admins) about a new application"""
+    try:
+        application = Application.objects.select_related('applicant').get(id=application_id)
+    except Application.DoesNotExist:
+        logger.warning('HR notification skipped, application %s no longer exists', application_id)
+        return
+    applicant = application.applicant
+
+    admin_emails = list(
+        User.objects.filter(user_type='admin', is_active=True).values_list('email', flat=True)
+    )
+    if not admin_emails:
+        return
+
+    hr_subject = f'New Application Received - {application.position}'
+    hr_message = f"""
             A new application has been received:
-            
+
             Applicant: {applicant.full_name}
             Email: {applicant.email}
             Position: {application.position}
             Department: {application.department}
             Applied Date: {application.applied_date.strftime("%B %d, %Y")}
-            
+
             Please review the application in the admin dashboard.
             """
-            admin_emails = [admin.email for admin in admin_users]
-            send_mail(
-                hr_subject,
-                hr_message,
-                settings.DEFAULT_FROM_EMAIL,
-                admin_emails,
-                fail_silently=False,
-            )
-    except Exception as e:
-        print(f"Error sending application confirmation: {e}")
+    send_mail(
+        hr_subject,
+        hr_message,
+        settings.DEFAULT_FROM_EMAIL,
+        admin_emails,
+        fail_silently=False,
+    )
 
 
-def send_status_update_email(application_id, new_status):
-    """Send email when application status changes"""
+@notification_task
+def send_hr_digest():
+    """Send each active admin one mail listing the applications not announced yet"""
+    claimed_at = timezone.now()
+    # Claim a batch under the digest's lock, and commit before talking to SMTP.
+    # Applications are picked by their own marker, not by id, so one committed
+    # after a higher id was already announced still makes the next digest.
+    with transaction.atomic():
+        DigestState.objects.select_for_update().get_or_create(name=HR_DIGEST_NAME)
+        # Anything over the cap is reported by the next digest
+        ids = list(
+            Application.objects.filter(hr_digested_at__isnull=True)
+            .order_by('id').values_list('id', flat=True)[:settings.HR_DIGEST_MAX_ITEMS]
+        )
+        if not ids:
+            return 0
+        Application.objects.filter(id__in=ids).update(hr_digested_at=claimed_at)
+
+    applications = list(
+        Application.objects.filter(id__in=ids)
+        .select_related('applicant').order_by('id')
+        .only('id', 'position', 'department', 'applied_date',
+              'applicant__first_name', 'applicant__last_name', 'applicant__email')
+    )
+    admin_emails = list(
+        User.objects.filter(user_type='admin', is_active=True).values_list('email', flat=True)
+    )
+    lines = '\n'.join(
+        f'- {application.applicant.full_name} <{application.applicant.email}>: '
+        f'{application.position} ({application.department}), '
+        f'{application.applied_date.strftime("%B %d, %Y %H:%M")}'
+        for application in applications
+    )
+    subject = f'{len(applications)} New Application(s) Received'
+    message = (
+        f'The following applications have been received since the last update:\n\n'
+        f'{lines}\n\nPlease review them in the admin dashboard.'
+    )
+
+    # One message per admin, all delivered over a single SMTP connection
+    batch = MailBatch()
+    for email in admin_emails:
+        batch.add(subject, message, [email])
     try:
-        application = Application.objects.get(id=application_id)
-        applicant = application.applicant
-        
-        status_messages = {
-            'under-review': {
-                'subject': f'Application Update - {application.position}',
-                'message': f'Your application for {application.position} is currently under review.'
-            },
-            'interview-scheduled': {
-                'subject': f'Interview Invitation - {application.position}',
-                'message': f'Congratulations! We would like to invite you for an interview for the {application.position} position.'
-            },
-            'accepted': {
-                'subject': f'Congratulations! Offer Letter - {application.position}',
-                'message': f'We are pleased to inform you that you have been selected for the {application.position} position!'
-            },
-            'rejected': {
-                'subject': f'Application Update - {application.position}',
-                'message': f'Thank you for your interest. Unfortunately, we have decided to move forward with other candidates for the {application.position} position.'
-            }
-        }
-        
-        status_info = status_messages.get(new_status, {
+        sent = batch.send() if applications else 0
+    except Exception:
+        # Hand the claim back so the retry, or the next digest, announces them
+        Application.objects.filter(id__in=ids, hr_digested_at=claimed_at).update(hr_digested_at=None)
+        raise
+
+    DigestState.objects.filter(name=HR_DIGEST_NAME).update(last_sent_at=timezone.now())
+    return sent
+
+
+def _status_update_message(application, new_status):
+    """Return the ``(subject, body)`` of the status update mail for ``application``"""
+    applicant = application.applicant
+
+    status_messages = {
+        'under-review': {
+            'subject': f'Application Update - {application.position}',
+            'message': f'Your application for {application.position} is currently under review.'
+        },
+        'interview-scheduled': {
+            'subject': f'Interview Invitation - {application.position}',
+            'message': f'Congratulations! We would like to invite you for an interview for the {application.position} position.'
+        },
+        'accepted': {
+            'subject': f'Congratulations! Offer Letter - {application.position}',
+            'message': f'We are pleased to inform you that you have been selected for the {application.position} position!'
+        },
+        'rejected': {
             'subject': f'Application Update - {application.position}',
-            'message': f'Your application status has been updated to {new_status}.'
-        })
-        
-        message = f"""
+            'message': f'Thank you for your interest. Unfortunately, we have decided to move forward with other candidates for the {application.position} position.'
+        }
+    }
+
+    status_info = status_messages.get(new_status, {
+        'subject': f'Application Update - {application.position}',
+        'message': f'Your application status has been updated to {new_status}.'
+    })
+
+    message = f"""
         Hello {applicant.first_name},
-        
+
         {status_info['message']}
-        
+
         Application Details:
         - Position: {application.position}
         - Department: {application.department}
         - Status: {new_status.replace("-", " ").title()}
         """
-        
-        if new_status == 'interview-scheduled' and application.interview_date:
-            message += f"\n- Interview Date: {application.interview_date.strftime('%B %d, %Y at %I:%M %p')}"
-        
-        message += "\n\nBest regards,\nVeridia HR Team"
-        
-        send_mail(
-            status_info['subject'],
-            message,
-            settings.DEFAULT_FROM_EMAIL,
-            [applicant.email],
-            fail_silently=False,
-        )
-    except Exception as e:
-        print(f"Error sending status update email: {e}")
 
+    if new_status == 'interview-scheduled' and application.interview_date:
+        message += f"\n- Interview Date: {application.interview_date.strftime('%B %d, %Y at %I:%M %p')}"
+
+    message += "\n\nBest regards,\nVeridia HR Team"
+    return status_info['subject'], message
+
+
+@notification_task
+def send_status_update_email(application_id, new_status):
+    """Send email when application status changes"""
+    try:
+        application = Application.objects.select_related('applicant').get(id=application_id)
+    except Application.DoesNotExist:
+        logger.warning('Status update email skipped, application %s no longer exists', application_id)
+        return
+
+    subject, message = _status_update_message(application, new_status)
+    send_mail(
+        subject,
+        message,
+        settings.DEFAULT_FROM_EMAIL,
+        [application.applicant.email],
+        fail_silently=False,
+    )
+
+
+@shared_task(bind=True, **NOTIFICATION_TASK_OPTIONS)
+def send_status_update_emails(self, application_ids, new_status):
+    """
+    Send the status update mail for many applications over a single connection.
+    A retry only covers the applications whose mail failed.
+    """
+    applications = list(Application.objects.select_related('applicant').filter(id__in=application_ids))
+    batch = MailBatch()
+    for application in applications:
+        subject, message = _status_update_message(application, new_status)
+        batch.add(subject, message, [application.applicant.email])
+    failed = batch.send_each()
+    if failed:
+        failed_ids = [applications[index].id for index in failed]
+        logger.warning('Status update mail failed for %s of %s applications, retrying those',
+                       len(failed_ids), len(applications))
+        countdown = get_exponential_backoff_interval(
+            factor=1, retries=self.request.retries, maximum=self.retry_backoff_max, full_jitter=self.retry_jitter,
+        )
+        raise self.retry(args=(failed_ids, new_status), countdown=countdown)
+    return len(applications)
@@ -0,0 +1,151 @@
+from smtplib import SMTPRecipientsRefused
+from unittest import mock
+
+from celery import shared_task
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from applications.models import Application
+from users.models import User
+from . import outbox
+from .mail import MailBatch
+from .models import OutboxMessage
+from .tasks import send_status_update_emails
+
+# Outbox messages still pending while record_call ran, one list per call
+calls = []
+
+
+@shared_task
+def record_call(*args):
+    pending = OutboxMessage.objects.filter(dispatched_at__isnull=True).values_list('id', flat=True)
+    calls.append((args, list(pending)))
+
+
+class FlakyEmailBackend(EmailBackend):
+    """Locmem backend refusing the first message to each address in ``refuse_once``."""
+    refuse_once = set()
+
+    def send_messages(self, messages):
+        for message in messages:
+            refused = self.refuse_once.intersection(message.to)
+            if refused:
+                self.refuse_once.difference_update(refused)
+                raise SMTPRecipientsRefused({address: (550, b'Try again') for address in refused})
+        return super().send_messages(messages)
+
+
+def create_applications(count):
+    applicants = User.objects.bulk_create([
+        User(email=f'applicant{i}@example.com', first_name='Applicant', last_name=str(i), phone='0')
+        for i in range(count)
+    ])
+    return [
+        Application.objects.create(
+            applicant=applicant, position='Developer', department='Engineering', resume='resumes/test.pdf'
+        )
+        for applicant in applicants
+    ]
+
+
+@override_settings(EMAIL_BACKEND='notifications.tests.FlakyEmailBackend')
+class MailBatchTests(TestCase):
+    def test_send_each_returns_the_failed_indexes(self):
+        FlakyEmailBackend.refuse_once = {'b@example.com'}
+        batch = MailBatch()
+        for address in ['a@example.com', 'b@example.com', 'c@example.com']:
+            batch.add('Subject', 'Body', [address])
+
+        self.assertEqual(batch.send_each(), [1])
+        self.assertEqual([message.to for message in mail.outbox], [['a@example.com'], ['c@example.com']])
+        self.assertEqual(batch.messages, [])
+
+
+@override_settings(EMAIL_BACKEND='notifications.tests.FlakyEmailBackend')
+class StatusUpdateEmailsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.applications = create_applications(3)
+
+    def test_retry_only_resends_the_failures(self):
+        FlakyEmailBackend.refuse_once = {'applicant1@example.com'}
+        ids = [application.id for application in self.applications]
+        send_status_update_emails.apply(args=(ids, 'accepted'))
+
+        recipients = sorted(address for message in mail.outbox for address in message.to)
+        self.assertEqual(recipients, [f'applicant{i}@example.com' for i in range(3)])
+        self.assertTrue(all('Offer Letter' in message.subject for message in mail.outbox))
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_rolls_back_with_the_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    outbox.enqueue(record_call, 1)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(callbacks, [])
+        self.assertEqual(calls, [])
+
+    def test_commit_nudges_the_relay(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            message = outbox.enqueue(record_call, 1, 'two')
+
+        self.assertEqual([args for args, _ in calls], [(1, 'two')])
+        message.refresh_from_db()
+        self.assertIsNotNone(message.dispatched_at)
+        self.assertEqual(message.attempts, 1)
+
+    def test_eager_relay_claims_the_batch_before_running_it(self):
+        first = outbox.enqueue(record_call, 1)
+        second = outbox.enqueue(record_call, 2)
+        third = outbox.enqueue(record_call, 3)
+
+        self.assertEqual(outbox.relay_pending(batch_size=2), 2)
+        # Neither message of the batch was still pending while the tasks ran
+        self.assertEqual(calls, [((1,), [third.id]), ((2,), [third.id])])
+        self.assertEqual(
+            list(OutboxMessage.objects.filter(dispatched_at__isnull=True).values_list('id', flat=True)), [third.id]
+        )
+        self.assertEqual(outbox.drain(), 1)
+        self.assertEqual({first.id, second.id, third.id}, set(
+            OutboxMessage.objects.filter(dispatched_at__isnull=False).values_list('id', flat=True)
+        ))
+
+    def test_failed_dispatch_releases_the_rest_of_the_batch(self):
+        messages = [outbox.enqueue(record_call, i) for i in range(3)]
+        original = record_call.apply_async
+
+        def apply_async(args=None, **kwargs):
+            if args == [1]:
+                raise ConnectionError('broker down')
+            return original(args=args, **kwargs)
+
+        with mock.patch.object(record_call, 'apply_async', side_effect=apply_async):
+            self.assertEqual(outbox.relay_pending(), 1)
+
+        stored = {message.id: message for message in OutboxMessage.objects.all()}
+        self.assertIsNotNone(stored[messages[0].id].dispatched_at)
+        self.assertIsNone(stored[messages[1].id].dispatched_at)
+        self.assertEqual(stored[messages[1].id].attempts, 1)
+        self.assertEqual(stored[messages[1].id].last_error, 'broker down')
+        self.assertIsNone(stored[messages[2].id].dispatched_at)
+        self.assertEqual(stored[messages[2].id].attempts, 0)
+
+    def test_replay_redispatches_the_range(self):
+        messages = [outbox.enqueue(record_call, i) for i in range(3)]
+        outbox.drain()
+        calls.clear()
+
+        self.assertEqual(outbox.replay(messages[1].id, messages[2].id), 2)
+        self.assertEqual(outbox.drain(), 2)
+        self.assertEqual([args for args, _ in calls], [(1,), (2,)])
@@ -0,0 +1,50 @@
+"""
+Resized WebP variants of profile pictures.
+
+``render_variants`` runs in pool processes started with ``spawn`` (see
+``veridia.processes``), so this module must not need Django set up. Variants
+are stored next to the picture under names derived from its name (see
+``variant_name``); a new picture gets a new name, so the names double as
+cache busters.
+"""
+import io
+import os
+
+from PIL import Image, ImageOps
+
+VARIANT_SIZES = (64, 128, 512)
+WEBP_QUALITY = 80
+
+
+def variant_name(name, size):
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return f'{directory}/variants/{stem}_{size}.webp'
+
+
+def render_variants(source, sizes=VARIANT_SIZES):
+    """
+    Return ``{size: webp_bytes}`` of square, centre-cropped variants of the
+    image ``source`` (a path or bytes). Sizes larger than the picture are
+    skipped, except that the smallest is always rendered.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    with Image.open(source) as image:
+        side = min(image.size)
+        targets = [size for size in sizes if size <= side] or [min(sizes)]
+        # JPEG decodes at a fraction of full resolution when that still covers the largest variant
+        image.draft('RGB', (max(targets), max(targets)))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info or 'A' in image.getbands() else 'RGB')
+
+        variants = {}
+        for size in sorted(targets, reverse=True):
+            variant = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            variant.save(output, 'WEBP', quality=WEBP_QUALITY, method=4)
+            variants[size] = output.getvalue()
+            # Each smaller variant is cut from the previous one rather than the original
+            image = variant
+    return variants
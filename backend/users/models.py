@@ -45,6 +45,8 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     # Optional profile fields
     profile_picture = models.ImageField(upload_to='profiles/', null=True, blank=True)
+    # Sizes of the WebP variants generated for the current profile_picture
+    profile_picture_sizes = models.JSONField(default=list, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
     address = models.TextField(null=True, blank=True)
     linkedin_url = models.URLField(null=True, blank=True)
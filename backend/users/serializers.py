@@ -1,24 +1,63 @@
 from rest_framework import serializers
+from .avatars import variant_name
 from .models import User
 
 
+class ProfilePictureSrcsetField(serializers.Field):
+    """``srcset`` of the profile picture's WebP variants; None until they are generated."""
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, user):
+        if not user.profile_picture or not user.profile_picture_sizes:
+            return None
+        storage = user.profile_picture.storage
+        request = self.context.get('request')
+        entries = []
+        for size in user.profile_picture_sizes:
+            url = storage.url(variant_name(user.profile_picture.name, size))
+            if request:
+                url = request.build_absolute_uri(url)
+            entries.append(f'{url} {size}w')
+        return ', '.join(entries)
+
+
 class UserSerializer(serializers.ModelSerializer):
+    profile_picture_srcset = ProfilePictureSrcsetField()
+
     class Meta:
         model = User
         fields = ['id', 'email', 'first_name', 'last_name', 'phone', 'user_type', 
-                  'is_verified', 'profile_picture', 'date_of_birth', 'address', 
+                  'is_verified', 'profile_picture', 'profile_picture_srcset', 'date_of_birth', 'address', 
                   'linkedin_url', 'portfolio_url', 'bio', 'date_joined']
         read_only_fields = ['id', 'date_joined']
 
 
+class UserSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'email', 'first_name', 'last_name']
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
+    profile_picture_srcset = ProfilePictureSrcsetField()
+
     class Meta:
         model = User
         fields = ['id', 'email', 'first_name', 'last_name', 'phone', 
-                  'profile_picture', 'date_of_birth', 'address', 
+                  'profile_picture', 'profile_picture_srcset', 'date_of_birth', 'address', 
                   'linkedin_url', 'portfolio_url', 'bio']
         read_only_fields = ['id', 'email']
 
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        # Only the submitted columns: profile_picture_sizes is written concurrently by the variants task
+        instance.save(update_fields=list(validated_data))
+        return instance
+
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
@@ -0,0 +1,40 @@
+import logging
+
+from celery import shared_task
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from authentication.user_cache import invalidate_user_on_commit
+from veridia.processes import map_in_processes
+from .avatars import render_variants, variant_name
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def generate_profile_picture_variants(user_id, name):
+    """Render the WebP variants of profile picture ``name`` and record their sizes"""
+    # Skip pictures replaced since the task was queued
+    if not User.objects.filter(pk=user_id, profile_picture=name).exists():
+        return
+    try:
+        source = default_storage.path(name)
+    except NotImplementedError:
+        with default_storage.open(name, 'rb') as file:
+            source = file.read()
+
+    try:
+        # In eager (brokerless) mode this keeps the resizing out of the calling web process
+        [variants] = map_in_processes(render_variants, [source])
+    except (OSError, ValueError) as e:
+        logger.warning('Profile picture %s of user %s could not be resized: %s', name, user_id, e)
+        return
+
+    for size, data in variants.items():
+        target = variant_name(name, size)
+        # Deterministic names: replace rather than let storage pick a new one
+        default_storage.delete(target)
+        default_storage.save(target, ContentFile(data))
+    User.objects.filter(pk=user_id, profile_picture=name).update(profile_picture_sizes=sorted(variants))
+    invalidate_user_on_commit(user_id)
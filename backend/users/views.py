@@ -1,9 +1,12 @@
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from .models import User
 from .serializers import UserSerializer, UserProfileSerializer
+from .tasks import generate_profile_picture_variants
+from notifications import outbox
 
 
 @api_view(['GET', 'PUT', 'PATCH'])
@@ -21,7 +24,13 @@ def profile(request):
     elif request.method in ['PUT', 'PATCH']:
         serializer = UserProfileSerializer(user, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                if serializer.validated_data.get('profile_picture'):
+                    # Variants of the new picture are rendered in the background
+                    user = serializer.save(profile_picture_sizes=[])
+                    outbox.enqueue(generate_profile_picture_variants, user.pk, user.profile_picture.name)
+                else:
+                    serializer.save()
             return Response({
                 'success': True,
                 'message': 'Profile updated successfully',
@@ -0,0 +1,15 @@
+"""
+Celery application for veridia.
+
+Without a broker configured, tasks run eagerly in-process (see the
+CELERY_* settings), so local development and tests need no Redis.
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'veridia.settings')
+
+app = Celery('veridia')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
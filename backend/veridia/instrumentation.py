@@ -0,0 +1,204 @@
+"""
+Per-request performance instrumentation.
+
+``RequestMetricsMiddleware`` records, for every request, the SQL query count
+and time (through ``connection.execute_wrapper``), the time spent in the
+view, in serialization, in notification dispatch and in password hashing,
+and the response size. The code doing the work reports its time with
+``timed``: ``TimedJSONRenderer`` and the application views for
+serialization, ``authentication.hashers`` for hashing.
+Admins get the numbers back in a ``Server-Timing`` header; everything is
+aggregated into per-route Prometheus histograms served by ``metrics_view``.
+
+Under gunicorn each worker is a separate process. When
+``PROMETHEUS_MULTIPROC_DIR`` is set, ``prometheus_client`` writes the
+samples of every worker to that directory and ``metrics_view`` merges them,
+so a scrape sees the whole server rather than whichever worker answered.
+"""
+import ipaddress
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
+from rest_framework.renderers import JSONRenderer
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+QUERY_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUESTS = Counter(
+    'http_requests_total', 'Requests by route, method and status code',
+    ['route', 'method', 'status'],
+)
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Total time spent handling a request',
+    ['route', 'method'],
+)
+VIEW_DURATION = Histogram(
+    'http_request_view_duration_seconds', 'Time spent in the view, including rendering',
+    ['route', 'method'],
+)
+SERIALIZE_DURATION = Histogram(
+    'http_request_serialize_duration_seconds', 'Time spent building serializer data and rendering it',
+    ['route', 'method'],
+)
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', 'Time spent executing SQL queries',
+    ['route', 'method'],
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries', 'Number of SQL queries executed',
+    ['route', 'method'], buckets=QUERY_BUCKETS,
+)
+HASH_DURATION = Histogram(
+    'http_request_password_hash_duration_seconds',
+    'Time spent hashing and verifying passwords, in requests that did',
+    ['route', 'method'],
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Size of non-streaming response bodies',
+    ['route', 'method'], buckets=SIZE_BUCKETS,
+)
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class QueryTimer:
+    """``connection.execute_wrapper`` counting queries and their total time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = QueryTimer()
+        self.timings = {}
+        self.active = set()
+        self.view_started = None
+
+    def add(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to timing ``name`` of the current request, if any."""
+    metrics = _current.get()
+    # Nested blocks of the same name (e.g. a serializer inside a serializer) count once
+    if metrics is None or name in metrics.active:
+        yield
+        return
+    metrics.active.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.active.discard(name)
+        metrics.add(name, time.perf_counter() - started)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` adding the rendering time to the ``serialize`` timing."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('serialize'):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class RequestMetricsMiddleware:
+    """Place first in ``MIDDLEWARE`` so the total covers every other middleware."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics.queries):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        finished = time.perf_counter()
+        total = finished - started
+        if metrics.view_started is not None:
+            metrics.timings['view'] = finished - metrics.view_started
+
+        self.observe(request, response, metrics, total)
+        user = getattr(request, 'user', None)
+        if getattr(user, 'user_type', None) == 'admin':
+            response['Server-Timing'] = self.server_timing(metrics, total)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view_started = time.perf_counter()
+
+    def observe(self, request, response, metrics, total):
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match and match.route else UNMATCHED_ROUTE
+        labels = (route, request.method)
+        REQUESTS.labels(route, request.method, response.status_code).inc()
+        REQUEST_DURATION.labels(*labels).observe(total)
+        VIEW_DURATION.labels(*labels).observe(metrics.timings.get('view', 0.0))
+        SERIALIZE_DURATION.labels(*labels).observe(metrics.timings.get('serialize', 0.0))
+        DB_DURATION.labels(*labels).observe(metrics.queries.seconds)
+        DB_QUERIES.labels(*labels).observe(metrics.queries.count)
+        if 'hash' in metrics.timings:
+            HASH_DURATION.labels(*labels).observe(metrics.timings['hash'])
+        if not response.streaming:
+            RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+
+    def server_timing(self, metrics, total):
+        entries = [f'db;dur={metrics.queries.seconds * 1000:.1f};desc="{metrics.queries.count} queries"']
+        for name in ('view', 'serialize', 'notify', 'hash'):
+            if name in metrics.timings:
+                entries.append(f'{name};dur={metrics.timings[name] * 1000:.1f}')
+        entries.append(f'total;dur={total * 1000:.1f}')
+        return ', '.join(entries)
+
+
+def _metrics_allowed(request):
+    if settings.METRICS_TOKEN:
+        return request.headers.get('Authorization') == f'Bearer {settings.METRICS_TOKEN}'
+    # Behind Docker's NAT every client looks private, so the address check is
+    # only good enough for development; production needs the token
+    if not settings.DEBUG:
+        return False
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return address.is_loopback or address.is_private
+
+
+def metrics_view(request):
+    """Prometheus text exposition of the request metrics of all workers."""
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden()
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
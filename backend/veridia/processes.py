@@ -0,0 +1,27 @@
+"""
+Process pools for CPU-bound work (resume parsing, image resizing).
+
+Pools use the ``spawn`` start method: children start clean, importing only
+the module of the function they run, rather than a fork of a process
+holding database connections and threads. Such functions must therefore
+live in modules that don't need Django set up.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_pool(workers):
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def map_in_processes(func, *iterables, workers=1, chunksize=1):
+    """
+    Return ``list(map(func, *iterables))``, computed in a pool of ``workers`` processes.
+
+    Celery's prefork children are daemonic and may not start processes of
+    their own; being pool processes already, they run ``func`` inline.
+    """
+    if multiprocessing.current_process().daemon:
+        return list(map(func, *iterables))
+    with process_pool(workers) as pool:
+        return list(pool.map(func, *iterables, chunksize=chunksize))
@@ -55,6 +55,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'veridia.instrumentation.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For serving static files in production
@@ -121,6 +122,94 @@ else:
     }
 
 
+# Cache
+# A shared Redis cache is required when running several worker processes
+# (cache versions are bumped from signals); falls back to a local memory
+# cache for development and tests.
+REDIS_URL = os.environ.get('REDIS_URL', '').strip()
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Public catalog endpoints (departments, positions)
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', '3600'))
+CATALOG_CACHE_MAX_AGE = int(os.environ.get('CATALOG_CACHE_MAX_AGE', '60'))
+
+# Users resolved for JWT-authenticated requests (see authentication.user_cache).
+# The local timeout bounds how long other processes may miss a change; 0 disables a level.
+USER_CACHE_TIMEOUT = int(os.environ.get('USER_CACHE_TIMEOUT', '300'))
+USER_CACHE_LOCAL_TIMEOUT = int(os.environ.get('USER_CACHE_LOCAL_TIMEOUT', '5'))
+
+# Revoked JWTs, kept until they expire (see authentication.revocation). The cache
+# must be shared by all processes in production. The optional Bloom filter keeps
+# lookups of tokens that aren't revoked in process; a revocation reaches the other
+# processes within the sync interval.
+TOKEN_REVOCATION_CACHE = os.environ.get('TOKEN_REVOCATION_CACHE', 'default')
+TOKEN_REVOCATION_BLOOM = os.environ.get('TOKEN_REVOCATION_BLOOM', 'False') == 'True'
+TOKEN_REVOCATION_BLOOM_CAPACITY = int(os.environ.get('TOKEN_REVOCATION_BLOOM_CAPACITY', '100000'))
+TOKEN_REVOCATION_BLOOM_ERROR_RATE = float(os.environ.get('TOKEN_REVOCATION_BLOOM_ERROR_RATE', '0.001'))
+TOKEN_REVOCATION_BLOOM_SYNC_INTERVAL = float(os.environ.get('TOKEN_REVOCATION_BLOOM_SYNC_INTERVAL', '1'))
+
+# Request metrics (see veridia.instrumentation). /metrics requires this bearer
+# token; without one it is disabled, except with DEBUG, where it answers
+# loopback and private addresses.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+
+# Celery
+# With no broker configured, tasks run eagerly in-process using an in-memory
+# transport; set REDIS_URL (or CELERY_BROKER_URL) to use real workers.
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', '').strip() or REDIS_URL or 'memory://'
+CELERY_TASK_ALWAYS_EAGER = (
+    os.environ.get('CELERY_TASK_ALWAYS_EAGER', '').strip() or str(CELERY_BROKER_URL == 'memory://')
+) == 'True'
+CELERY_TASK_EAGER_PROPAGATES = False
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TIMEZONE = os.environ.get('TIME_ZONE', 'UTC')
+
+# Notification task retries on SMTP/network errors (exponential backoff)
+NOTIFICATION_MAX_RETRIES = int(os.environ.get('NOTIFICATION_MAX_RETRIES', '5'))
+
+# New applications are reported to admins in one digest mail per interval
+# (requires celery beat); set to 0 to notify admins for every application.
+HR_DIGEST_INTERVAL_MINUTES = int(os.environ.get('HR_DIGEST_INTERVAL_MINUTES', '15'))
+HR_DIGEST_MAX_ITEMS = int(os.environ.get('HR_DIGEST_MAX_ITEMS', '200'))
+
+# Transactional outbox relay (see notifications.outbox)
+OUTBOX_RELAY_BATCH_SIZE = int(os.environ.get('OUTBOX_RELAY_BATCH_SIZE', '100'))
+OUTBOX_RELAY_INTERVAL_SECONDS = int(os.environ.get('OUTBOX_RELAY_INTERVAL_SECONDS', '30'))
+OUTBOX_RETENTION_DAYS = int(os.environ.get('OUTBOX_RETENTION_DAYS', '7'))
+
+CELERY_BEAT_SCHEDULE = {
+    'relay-outbox': {
+        'task': 'notifications.tasks.relay_outbox',
+        'schedule': OUTBOX_RELAY_INTERVAL_SECONDS,
+    },
+    'purge-outbox': {
+        'task': 'notifications.tasks.purge_outbox',
+        'schedule': 24 * 60 * 60,
+    },
+}
+if HR_DIGEST_INTERVAL_MINUTES > 0:
+    CELERY_BEAT_SCHEDULE['hr-application-digest'] = {
+        'task': 'notifications.tasks.send_hr_digest',
+        'schedule': HR_DIGEST_INTERVAL_MINUTES * 60,
+    }
+
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
@@ -143,6 +232,17 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# The first hasher hashes new passwords; the others verify existing hashes.
+# PASSWORD_PBKDF2_ITERATIONS: 0 keeps Django's default; see benchmark_password_hashers
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', '0'))
+PASSWORD_HASHERS = [
+    'authentication.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -168,6 +268,26 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Hash uploads while they stream in, for content-addressed resume storage
+FILE_UPLOAD_HANDLERS = [
+    'applications.resumes.HashingMemoryFileUploadHandler',
+    'applications.resumes.HashingTemporaryFileUploadHandler',
+]
+
+# Chunked resume uploads; the partial files must be on storage all workers share
+RESUME_UPLOAD_DIR = os.environ.get('RESUME_UPLOAD_DIR', str(MEDIA_ROOT / 'partial_uploads'))
+RESUME_UPLOAD_MAX_SIZE = int(os.environ.get('RESUME_UPLOAD_MAX_SIZE', str(50 * 1024 * 1024)))
+RESUME_UPLOAD_CHUNK_SIZE = int(os.environ.get('RESUME_UPLOAD_CHUNK_SIZE', str(5 * 1024 * 1024)))
+RESUME_UPLOAD_EXPIRY_HOURS = int(os.environ.get('RESUME_UPLOAD_EXPIRY_HOURS', '24'))
+
+# Resume downloads: X-Accel-Redirect (nginx) or X-Sendfile hands the transfer
+# to the front proxy; empty streams from Django. Only set it when every request
+# reaches the backend through that proxy
+RESUME_DOWNLOAD_OFFLOAD = os.environ.get('RESUME_DOWNLOAD_OFFLOAD', '')
+RESUME_DOWNLOAD_ACCEL_PREFIX = os.environ.get('RESUME_DOWNLOAD_ACCEL_PREFIX', '/protected-media/')
+# Lifetime of the links issued by applications/<id>/resume/link/, which are opened right away
+RESUME_DOWNLOAD_URL_MAX_AGE = int(os.environ.get('RESUME_DOWNLOAD_URL_MAX_AGE', '300'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -189,11 +309,15 @@ else:
 # REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.jwt.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'veridia.instrumentation.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', '10')),
     'DEFAULT_FILTER_BACKENDS': [
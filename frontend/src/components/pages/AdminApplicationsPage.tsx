@@ -52,6 +52,7 @@ interface Application {
   skills?: string;
   education?: string;
   resume?: string;
+  resume_url?: string;
   interview_date?: string;
   notes?: string;
 }
@@ -363,9 +364,18 @@ export function AdminApplicationsPage() {
                 <div className="flex gap-2 pt-4">
                   <Button
                     variant="outline"
-                    onClick={() => {
-                      if (selectedApplication.resume) {
-                        window.open(selectedApplication.resume, '_blank');
+                    onClick={async () => {
+                      // Opened before the request so popup blockers allow it
+                      const tab = window.open('', '_blank');
+                      try {
+                        const response = await adminAPI.getResumeLink(selectedApplication.id);
+                        if (tab) {
+                          tab.location.href = response.data.url;
+                        }
+                      } catch (error) {
+                        console.error('Error fetching resume link:', error);
+                        tab?.close();
+                        toast.error('Failed to download resume');
                       }
                     }}
                   >
@@ -23,6 +23,29 @@ api.interceptors.request.use(
   }
 );
 
+// Refresh tokens are single-use (rotated on every refresh), so requests failing
+// together share one refresh instead of racing with the same token
+let refreshing: Promise<string> | null = null;
+
+const refreshAccessToken = (refreshToken: string) => {
+  if (!refreshing) {
+    refreshing = axios
+      .post(`${API_BASE_URL}/auth/token/refresh/`, { refresh_token: refreshToken })
+      .then((response) => {
+        const { access_token, refresh_token } = response.data;
+        localStorage.setItem('access_token', access_token);
+        if (refresh_token) {
+          localStorage.setItem('refresh_token', refresh_token);
+        }
+        return access_token as string;
+      })
+      .finally(() => {
+        refreshing = null;
+      });
+  }
+  return refreshing;
+};
+
 // Handle token refresh on 401
 api.interceptors.response.use(
   (response) => response,
@@ -35,12 +58,7 @@ api.interceptors.response.use(
       try {
         const refreshToken = localStorage.getItem('refresh_token');
         if (refreshToken) {
-          const response = await axios.post(`${API_BASE_URL}/auth/token/refresh/`, {
-            refresh_token: refreshToken,
-          });
-          
-          const { access_token } = response.data;
-          localStorage.setItem('access_token', access_token);
+          const access_token = await refreshAccessToken(refreshToken);
           originalRequest.headers.Authorization = `Bearer ${access_token}`;
           
           return api(originalRequest);
@@ -191,6 +209,11 @@ export const adminAPI = {
     const response = await api.get('/admin/interviews/upcoming/');
     return response.data;
   },
+
+  getResumeLink: async (id: number) => {
+    const response = await api.post(`/applicant/applications/${id}/resume/link/`);
+    return response.data;
+  },
 };
 
 // User API